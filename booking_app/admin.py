@@ -1,11 +1,32 @@
+from django import forms
 from django.contrib import admin
-from django.db import models
-from django.db.models import Count, Avg
-from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .models import User, Listing, Booking, Review
+from .choices import JobStatus
+from .models import User, Listing, Booking, BookingStatusHistory, Review, Job
+from .services.search import FULLTEXT_INDEXES, fulltext_q
+
+
+class FullTextSearchAdminMixin:
+    """
+    Use the full-text index for indexed search_fields,
+    icontains for the rest (e.g. city). Falls back to default admin search.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        index = FULLTEXT_INDEXES.get(queryset.model._meta.label_lower)
+        fts = fulltext_q(queryset.model, search_term, queryset.db) if search_term and index else None
+        if fts is None:
+            return super().get_search_results(request, queryset, search_term)
+
+        condition = fts
+        for field_name in self.get_search_fields(request):
+            if field_name not in index.columns:
+                condition |= Q(**{f"{field_name}__icontains": search_term})
+        return queryset.filter(condition), False
 
 
 
@@ -21,7 +42,7 @@ class UserAdmin(admin.ModelAdmin):
 
 
 @admin.register(Listing)
-class ListingAdmin(admin.ModelAdmin):
+class ListingAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for property listings.
     Displays owner, full address, city, type, average_rating, review_count, active status.
@@ -49,18 +70,6 @@ class ListingAdmin(admin.ModelAdmin):
 
     full_address.short_description = "Full address"
 
-    # Без него: админка покажет только поля модели → нет average_rating
-    def get_queryset(self, request):
-        """
-        Add rating and review count to all listings.
-        Runs one SQL query with JOINs.
-        """
-
-        return super().get_queryset(request).annotate(
-            average_rating=Coalesce(Avg("reviews__rating"), 0.0, output_field=models.FloatField()),
-            review_count=Count("reviews")
-        )
-
     def average_rating(self, obj):
         """
         Show rating with 1 decimal place. 0.0 if no reviews.
@@ -81,13 +90,58 @@ class ListingAdmin(admin.ModelAdmin):
 
 
 
+class BookingStatusHistoryInline(admin.TabularInline):
+    """
+    Read-only status history of a booking.
+    """
+
+    model = BookingStatusHistory
+    fk_name = "booking"
+    fields = ("from_status", "to_status", "changed_by", "created_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class BookingAdminForm(forms.ModelForm):
+    """
+    Form errors instead of a 500 from save_model(): own listing,
+    status change not allowed by BOOKING_STATUS_TRANSITIONS.
+    """
+
+    class Meta:
+        model = Booking
+        fields = "__all__"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        listing, guest = cleaned_data.get("listing"), cleaned_data.get("guest")
+        if listing and guest and listing.owner_id == guest.pk:
+            raise ValidationError(_("Owner cannot book their own listing."))
+
+        new_status = cleaned_data.get("status")
+        if self.instance.pk and "status" in self.changed_data and new_status:
+            old_status = self.instance._stored_status
+            if not Booking.can_transition(old_status, new_status):
+                self.add_error("status", _("Cannot change booking status from '%(old)s' to '%(new)s'.") % {
+                    "old": old_status, "new": new_status,
+                })
+        return cleaned_data
+
+
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     """
     Admin configuration for bookings.
-    Prevents owners from booking their own listings.
+    Prevents owners from booking their own listings; status changes follow
+    BOOKING_STATUS_TRANSITIONS and are written to the status history.
     """
 
+    form = BookingAdminForm
+
     list_display = (
         "id",
         "listing_id_col",  # ID объявления
@@ -99,6 +153,7 @@ class BookingAdmin(admin.ModelAdmin):
         "total_price",
     )
     list_filter = ("status",)
+    inlines = [BookingStatusHistoryInline]
 
     def listing_id_col(self, obj):
         """
@@ -120,15 +175,23 @@ class BookingAdmin(admin.ModelAdmin):
 
     def save_model(self, request, obj, form, change):
         """
-        Validate that owner cannot book their own listing.
+        A changed status goes through transition_to() (checked by BookingAdminForm):
+        the other changed fields are saved first, with the stored status.
         """
-        if obj.listing and obj.guest and obj.listing.owner == obj.guest:
-            raise ValidationError(_("Owner cannot book their own listing."))
-        super().save_model(request, obj, form, change)
+        if not change or "status" not in form.changed_data:
+            super().save_model(request, obj, form, change)
+            return
+
+        new_status = obj.status
+        if form.changed_data != ["status"]:
+            obj.status = obj._stored_status
+            super().save_model(request, obj, form, change)
+        # переход по таблице, с записью в историю (changeform_view — в одной транзакции)
+        obj.transition_to(new_status, changed_by=request.user)
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for reviews with listing details.
     """
@@ -182,3 +245,24 @@ class ReviewAdmin(admin.ModelAdmin):
         return obj.comment[:20] + "..." if obj.comment else "-"
 
     comment_preview.short_description = "Comment"
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Background jobs (manage.py run_worker): state, attempts, last error.
+    Failed jobs can be queued again.
+    """
+
+    list_display = ("id", "name", "status", "attempts", "max_attempts", "run_at", "locked_by", "finished_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("attempts", "locked_by", "locked_at", "last_error", "created_at", "finished_at")
+    actions = ["retry_jobs"]
+
+    @admin.action(description=_("Retry selected failed jobs now"))
+    def retry_jobs(self, request, queryset):
+        # новые попытки с нуля; выполняющиеся/выполненные не трогаем
+        count = queryset.filter(status=JobStatus.FAILED).update(
+            status=JobStatus.PENDING, attempts=0, run_at=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f"{count} job(s) queued again.")
@@ -1,5 +1,25 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BookingAppConfig(AppConfig):
     name = 'booking_app'
+
+    def ready(self):
+        # регистрация обработчиков сигналов (агрегаты рейтинга и т.п.)
+        from . import signals
+
+        post_migrate.connect(signals.repair_fulltext_index, sender=self)
+
+        from django.db.backends.signals import connection_created
+
+        from .metrics import install_query_recording, install_serializer_timing, metrics_enabled
+
+        if metrics_enabled():
+            install_serializer_timing()
+            connection_created.connect(install_query_recording)
+
+        from .db.replicas import install_write_tracking, replica_aliases
+
+        if replica_aliases():
+            connection_created.connect(install_write_tracking)
@@ -0,0 +1,189 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+
+class TokenCache:
+    """
+    token key -> user, in-process LRU with TTL,
+    optionally backed by a shared Django cache (CACHES alias).
+
+    Invalidation (booking_app/signals.py): token delete (logout, password
+    change, user delete) and user save. Other workers' local entries expire
+    after TTL, so keep TTL short when running several processes.
+    """
+
+    def __init__(self, max_size=10000, ttl=60, shared_alias="", shared_ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared_alias = shared_alias
+        self.shared_ttl = shared_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, user)
+        self._user_keys = {}  # user_id -> {key, ...}
+        self._lock = threading.Lock()
+        self._generation = 0  # растёт при каждой инвалидации
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, "AUTH_TOKEN_CACHE", {})
+        return cls(
+            max_size=options.get("MAX_SIZE", 10000),
+            ttl=options.get("TTL", 60),
+            shared_alias=options.get("SHARED_CACHE", ""),
+            shared_ttl=options.get("SHARED_TTL", 300),
+        )
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    @staticmethod
+    def shared_key(key) -> str:
+        # сам токен в ключах общего кэша не храним
+        return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, user = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return copy.copy(user)
+                self._forget(key)
+
+        if self.shared is not None:
+            user = self.shared.get(self.shared_key(key))
+            if user is not None:
+                self._remember(key, user)
+                return copy.copy(user)
+        return None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key, user, generation=None):
+        """
+        Cache user for key. If `generation` is given and an invalidation happened
+        since it was read, skip: the DB row read before may already be stale.
+        """
+        if generation is not None and generation != self._generation:
+            return
+        # копия: объект запроса может меняться во view
+        user = copy.copy(user)
+        self._remember(key, user)
+        if self.shared is not None:
+            self.shared.set(self.shared_key(key), user, self.shared_ttl)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._forget(key)
+        if self.shared is not None and keys:
+            self.shared.delete_many([self.shared_key(key) for key in keys])
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            self._generation += 1
+            keys = set(self._user_keys.get(user_id, ()))
+            for key in keys:
+                self._forget(key)
+        if self.shared is not None:
+            from rest_framework.authtoken.models import Token
+
+            keys |= set(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+            if keys:
+                self.shared.delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def _remember(self, key, user):
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+            self._user_keys.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._forget(oldest)
+
+    def _forget(self, key):
+        # вызывается под self._lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._user_keys.get(entry[1].pk)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._user_keys[entry[1].pk]
+
+
+token_cache = TokenCache.from_settings()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication with cached token -> user lookups.
+    A cache hit authenticates without touching the database.
+    """
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is None:
+            generation = token_cache.generation
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, generation)
+            return user, token
+
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        # несохранённый Token: request.auth без запроса к БД
+        return user, self.get_model()(key=key, user=user)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views: same header rules, token lookup with
+        the async ORM on a cache miss. Returns (user, token) or None.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        # сообщения — как в TokenAuthentication.authenticate()
+        if len(auth) == 1:
+            raise AuthenticationFailed(_("Invalid token header. No credentials provided."))
+        if len(auth) > 2:
+            raise AuthenticationFailed(_("Invalid token header. Token string should not contain spaces."))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed(
+                _("Invalid token header. Token string should not contain invalid characters.")
+            )
+
+        user = token_cache.get(key)
+        if user is None:
+            generation = token_cache.generation
+            token = await self.get_model().objects.select_related("user").filter(key=key).afirst()
+            if token is None:
+                raise AuthenticationFailed(_("Invalid token."))
+            if not token.user.is_active:
+                raise AuthenticationFailed(_("User inactive or deleted."))
+            token_cache.set(key, token.user, generation)
+            return token.user, token
+
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return user, self.get_model()(key=key, user=user)
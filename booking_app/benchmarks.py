@@ -0,0 +1,637 @@
+"""
+Endpoint benchmark: seeded dataset + scenarios driven through the test client.
+Used by manage.py bench.
+"""
+import asyncio
+import gc
+import json
+import math
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
+
+import factory
+import factory.random
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from asgiref.sync import ThreadSensitiveContext
+from django.db import connection, connections
+from django.db.backends.utils import CursorWrapper
+from django.test import AsyncClient, Client, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from booking_app.authentication import token_cache
+from booking_app.choices import BookingStatus, Role
+from booking_app.factories import BookingFactory, ListingFactory, ReviewFactory, UserFactory
+from booking_app.models import Booking, Listing, Review
+from booking_app.services.owner_stats import rebuild_listing_stats
+
+User = get_user_model()
+
+BENCH_PASSWORD = "bench-password-123"
+BENCH_OWNER_EMAIL = "bench-owner@example.com"
+BENCH_GUEST_EMAIL = "bench-guest@example.com"
+
+# доля статусов в сгенерированных бронях
+BOOKING_STATUS_WEIGHTS = {
+    BookingStatus.PENDING: 20,
+    BookingStatus.CONFIRMED: 50,
+    BookingStatus.REJECTED: 10,
+    BookingStatus.CANCELLED: 15,
+    BookingStatus.CANCELLED_BY_OWNER: 5,
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+# ---------------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Dataset:
+    """
+    What the scenarios need to know about the seeded data.
+    """
+
+    counts: dict
+    owner_token: str
+    guest_token: str
+    listing_ids: list
+    reviewed_listing_ids: list
+    search_word: str
+    city: str
+    near: str  # "lat,lon" of a seeded listing (listings.near)
+    free_from: object  # date: after it every listing is free (bookings.create)
+
+
+def _bulk_insert(model, objs, batch_size):
+    """
+    bulk_create() and make sure every object has its pk
+    (MySQL does not return ids from bulk inserts; the tables are empty before seeding).
+    """
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    if objs and objs[0].pk is None:
+        pks = list(model.objects.order_by("-pk").values_list("pk", flat=True)[:len(objs)])
+        for obj, pk in zip(objs, reversed(pks)):
+            obj.pk = pk
+    return objs
+
+
+def seed_dataset(users=200, listings=1000, bookings=5000, reviews=3000, seed=42,
+                 batch_size=1000, log=None) -> Dataset:
+    """
+    Fill an empty database with a reproducible dataset (same seed -> same rows).
+
+    Bulk inserts skip model save() and signals, so rating aggregates and the
+    owner stats rollup are rebuilt at the end; booking dates are generated
+    without overlaps.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    factory.random.reseed_random(seed)
+
+    # один хэш на всех: хэширование пароля — самая дорогая часть создания пользователя
+    password = make_password(BENCH_PASSWORD)
+
+    owners_count = max(1, users // 5)
+    customers_count = max(1, users - owners_count)
+    user_objs = UserFactory.build_batch(
+        owners_count + customers_count, password=factory.Transformer.Force(password),
+    )
+    for index, user in enumerate(user_objs):
+        user.role = Role.OWNER if index < owners_count else Role.CUSTOMER
+    user_objs[0].email = BENCH_OWNER_EMAIL
+    user_objs[owners_count].email = BENCH_GUEST_EMAIL
+    _bulk_insert(User, user_objs, batch_size)
+    owners, customers = user_objs[:owners_count], user_objs[owners_count:]
+    log(f"users: {len(user_objs)}")
+
+    listing_objs = [
+        ListingFactory.build(owner=owners[index % owners_count], is_active=rng.random() > 0.05)
+        for index in range(listings)
+    ]
+    _bulk_insert(Listing, listing_objs, batch_size)
+    log(f"listings: {len(listing_objs)}")
+
+    # брони одного объявления идут подряд без пересечений, начиная с полугода назад
+    today = timezone.localdate()
+    next_free = {listing.pk: today - timedelta(days=180) for listing in listing_objs}
+    statuses, weights = zip(*BOOKING_STATUS_WEIGHTS.items())
+    booking_objs = []
+    for _ in range(bookings if listing_objs else 0):
+        listing = listing_objs[rng.randrange(len(listing_objs))]
+        check_in = next_free[listing.pk] + timedelta(days=rng.randint(0, 10))
+        check_out = check_in + timedelta(days=rng.randint(1, 7))
+        next_free[listing.pk] = check_out
+        booking_objs.append(BookingFactory.build(
+            listing=listing,
+            guest=customers[rng.randrange(len(customers))],
+            check_in=check_in,
+            check_out=check_out,
+            guests_count=rng.randint(1, listing.max_guests),
+            status=rng.choices(statuses, weights)[0],
+        ))
+    _bulk_insert(Booking, booking_objs, batch_size)
+    log(f"bookings: {len(booking_objs)}")
+
+    # уникальные пары (listing, author)
+    reviews = min(reviews, len(listing_objs) * len(customers))
+    pairs = set()
+    while len(pairs) < reviews:
+        pairs.add((rng.randrange(len(listing_objs)), rng.randrange(len(customers))))
+    review_objs = [
+        ReviewFactory.build(listing=listing_objs[listing_index], author=customers[author_index])
+        for listing_index, author_index in sorted(pairs)
+    ]
+    _bulk_insert(Review, review_objs, batch_size)
+    Listing.objects.rebuild_ratings()
+    rebuild_listing_stats()
+    log(f"reviews: {len(review_objs)}")
+
+    owner_token = Token.objects.create(user=owners[0]).key
+    guest_token = Token.objects.create(user=customers[0]).key
+
+    active = [listing for listing in listing_objs if listing.is_active] or listing_objs
+    reviewed = sorted({review.listing_id for review in review_objs if review.listing.is_active})
+    first_title = active[0].title if active else "wohnung"
+    located = next((listing for listing in active if listing.latitude is not None), None)
+    return Dataset(
+        counts={
+            "users": len(user_objs),
+            "listings": len(listing_objs),
+            "bookings": len(booking_objs),
+            "reviews": len(review_objs),
+        },
+        owner_token=owner_token,
+        guest_token=guest_token,
+        listing_ids=[listing.pk for listing in active],
+        reviewed_listing_ids=reviewed or [listing.pk for listing in active],
+        search_word=first_title.split()[0].strip(".").lower(),
+        city=active[0].city if active else "",
+        near=f"{located.latitude},{located.longitude}" if located else "52.52,13.405",
+        free_from=max([today, *next_free.values()]) + timedelta(days=30),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class _CountingCursor:
+    """
+    Cursor proxy counting rows fetched by the application.
+    """
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._cursor.__exit__(*exc_info)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._counter.rows += 1
+            yield row
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._counter.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._counter.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._counter.rows += len(rows)
+        return rows
+
+
+class QueryCounter:
+    """
+    Counts SQL statements and fetched rows on a connection.
+
+        with QueryCounter() as counter:
+            ...
+        counter.queries, counter.rows
+
+    Cheaper than CaptureQueriesContext (no SQL strings are kept),
+    so the latency numbers stay close to production.
+    """
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        make_cursor = self.connection.make_cursor
+        make_debug_cursor = self.connection.make_debug_cursor
+        self.connection.make_cursor = lambda cursor: _CountingCursor(make_cursor(cursor), self)
+        self.connection.make_debug_cursor = lambda cursor: _CountingCursor(make_debug_cursor(cursor), self)
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        del self.connection.make_cursor
+        del self.connection.make_debug_cursor
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Scenario:
+    """
+    One endpoint call. `request(i)` returns (path, data) for iteration i,
+    so scenarios can rotate ids or book fresh dates.
+    """
+
+    name: str
+    method: str
+    request: object
+    auth: str = "anon"  # anon / guest / owner
+    expected: tuple = (200,)
+    settings: dict = field(default_factory=dict)  # override_settings() for this scenario
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    method: str
+    path: str
+    latencies: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    rows: list = field(default_factory=list)
+    errors: int = 0
+    first_error: str = ""
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "first_error": self.first_error or None,
+            "latency_ms": {
+                **{f"p{pct}": round(percentile(latencies, pct), 3) for pct in PERCENTILES},
+                "mean": round(statistics.fmean(latencies), 3),
+                "max": round(latencies[-1], 3),
+            } if latencies else {},
+            "queries": {
+                "median": statistics.median(self.queries),
+                "max": max(self.queries),
+            } if self.queries else {},
+            "rows_read": {
+                "median": statistics.median(self.rows),
+                "max": max(self.rows),
+            } if self.rows else {},
+        }
+
+
+def build_scenarios(dataset: Dataset):
+    listings = dataset.listing_ids
+    reviewed = dataset.reviewed_listing_ids
+    check_in = timezone.localdate() + timedelta(days=14)
+    check_out = check_in + timedelta(days=3)
+
+    def fixed(path, data=None):
+        return lambda i: (path, data)
+
+    def new_booking(i):
+        # каждая итерация — свободные даты после всех сгенерированных броней
+        start = dataset.free_from + timedelta(days=4 * i)
+        return "/api/v1/bookings/", {
+            "listing": listings[i % len(listings)],
+            "check_in": start.isoformat(),
+            "check_out": (start + timedelta(days=2)).isoformat(),
+            "guests_count": 1,
+        }
+
+    def quote(i):
+        # пачка из 50 проживаний по разным объявлениям и датам
+        return "/api/v1/bookings/quote/", {"items": [
+            {
+                "listing": listings[(i + n) % len(listings)],
+                "check_in": (check_in + timedelta(days=n % 30)).isoformat(),
+                "check_out": (check_out + timedelta(days=n % 30)).isoformat(),
+                "guests_count": 1,
+            }
+            for n in range(50)
+        ]}
+
+    return [
+        Scenario("auth.login", "post", fixed(
+            "/api/v1/auth/token/", {"email": BENCH_GUEST_EMAIL, "password": BENCH_PASSWORD},
+        )),
+        Scenario("users.me", "get", fixed("/api/v1/users/me/"), auth="guest"),
+        Scenario("listings.list", "get", fixed("/api/v1/listings/")),
+        Scenario("listings.list_cached", "get", fixed("/api/v1/listings/"),
+                 settings={"LISTING_SEARCH_CACHE_TIMEOUT": 300}),
+        Scenario("listings.list_cursor", "get", fixed("/api/v1/listings/?pagination=cursor")),
+        Scenario("listings.search", "get", fixed(
+            "/api/v1/listings/?" + urlencode({"search": dataset.search_word})
+        )),
+        Scenario("listings.filter", "get", fixed("/api/v1/listings/?" + urlencode({
+            "city": dataset.city, "price_per_night__lte": 200, "rooms__gte": 2,
+        }))),
+        Scenario("listings.near", "get", fixed("/api/v1/listings/?" + urlencode({
+            "near": dataset.near, "radius_km": 25, "ordering": "distance",
+        }))),
+        Scenario("listings.available", "get", fixed("/api/v1/listings/?" + urlencode({
+            "check_in": check_in, "check_out": check_out, "guests": 2,
+        }))),
+        Scenario("listings.retrieve", "get",
+                 lambda i: (f"/api/v1/listings/{listings[i % len(listings)]}/", None)),
+        Scenario("listings.reviews", "get",
+                 lambda i: (f"/api/v1/listings/{reviewed[i % len(reviewed)]}/reviews/", None),
+                 auth="guest"),
+        Scenario("listings.calendar", "get",
+                 lambda i: (f"/api/v1/listings/{listings[i % len(listings)]}/calendar/", None)),
+        Scenario("listings.my_stats", "get", fixed("/api/v1/listings/my/stats/"), auth="owner"),
+        Scenario("bookings.create", "post", new_booking, auth="guest", expected=(201,)),
+        Scenario("bookings.quote", "post", quote),
+        Scenario("bookings.list", "get", fixed("/api/v1/bookings/"), auth="guest"),
+        Scenario("bookings.owner", "get", fixed("/api/v1/bookings/owner/"), auth="owner"),
+        Scenario("reviews.list", "get", fixed("/api/v1/reviews/"), auth="guest"),
+        Scenario("reviews.search", "get", fixed(
+            "/api/v1/reviews/?" + urlencode({"search": dataset.search_word})
+        ), auth="guest"),
+    ]
+
+
+def run_scenario(scenario: Scenario, dataset: Dataset, iterations=50, warmup=5) -> ScenarioResult:
+    """
+    Run `warmup` unmeasured + `iterations` measured requests of one scenario.
+    """
+    client = Client()
+    headers = {}
+    if scenario.auth != "anon":
+        token = dataset.owner_token if scenario.auth == "owner" else dataset.guest_token
+        headers["HTTP_AUTHORIZATION"] = f"Token {token}"
+
+    call = getattr(client, scenario.method)
+    result = ScenarioResult(scenario.name, scenario.method.upper(), scenario.request(0)[0])
+
+    # как timeit: сборка мусора во время замеров даёт случайные выбросы в p95/p99
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with override_settings(**scenario.settings):
+            _run_iterations(scenario, call, headers, result, iterations, warmup)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return result
+
+
+def _run_iterations(scenario, call, headers, result, iterations, warmup):
+    for i in range(warmup + iterations):
+        path, data = scenario.request(i)
+        kwargs = dict(headers)
+        if data is not None:
+            kwargs.update(data=json.dumps(data), content_type="application/json")
+
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            response = call(path, **kwargs)
+            elapsed = (time.perf_counter() - started) * 1000
+
+        if response.status_code not in scenario.expected:
+            result.errors += 1
+            if not result.first_error:
+                result.first_error = f"{response.status_code}: {response.content[:200].decode(errors='replace')}"
+        if i >= warmup:
+            result.latencies.append(elapsed)
+            result.queries.append(counter.queries)
+            result.rows.append(counter.rows)
+
+
+def run_benchmark(dataset: Dataset, iterations=50, warmup=5, only=None, log=None) -> dict:
+    log = log or (lambda message: None)
+    token_cache.clear()
+
+    endpoints = {}
+    for scenario in build_scenarios(dataset):
+        if only and not any(scenario.name.startswith(prefix) for prefix in only):
+            continue
+        # замеры идут мимо кэша поиска, кроме сценариев, которые включают его сами
+        with override_settings(LISTING_SEARCH_CACHE_TIMEOUT=0):
+            result = run_scenario(scenario, dataset, iterations, warmup).as_dict()
+        endpoints[scenario.name] = result
+        log(
+            f"{scenario.name:<24} p50 {result['latency_ms'].get('p50', 0):8.2f} ms"
+            f"  p95 {result['latency_ms'].get('p95', 0):8.2f} ms"
+            f"  queries {result['queries'].get('median', 0):>5}"
+            f"  rows {result['rows_read'].get('median', 0):>6}"
+            + (f"  errors {result['errors']}" if result["errors"] else "")
+        )
+    return endpoints
+
+
+def compare_reports(baseline: dict, current: dict, threshold=0.25, min_delta_ms=0.5):
+    """
+    Endpoint-by-endpoint diff against a previous report.
+
+    A regression is a p95 latency growth above `threshold` (relative) and
+    `min_delta_ms` (absolute, filters out timer noise on fast endpoints),
+    or more queries per request than before.
+    """
+    diff, regressions = {}, []
+    for name, now in current.get("endpoints", {}).items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before.get("latency_ms") or not now.get("latency_ms"):
+            continue
+        p95_before, p95_now = before["latency_ms"]["p95"], now["latency_ms"]["p95"]
+        queries_before, queries_now = before["queries"]["median"], now["queries"]["median"]
+        entry = {
+            "p95_ms": [p95_before, p95_now],
+            "p95_change": round(p95_now / p95_before - 1, 3) if p95_before else None,
+            "queries": [queries_before, queries_now],
+            "rows_read": [before["rows_read"]["median"], now["rows_read"]["median"]],
+        }
+        reasons = []
+        if p95_now > p95_before * (1 + threshold) and p95_now - p95_before > min_delta_ms:
+            reasons.append("latency")
+        if queries_now > queries_before:
+            reasons.append("queries")
+        if reasons:
+            entry["regression"] = reasons
+            regressions.append(name)
+        diff[name] = entry
+    return diff, regressions
+
+
+# ---------------------------------------------------------------------------
+# Throughput: sync API under WSGI threads vs async read path (/api/v1/async/)
+# ---------------------------------------------------------------------------
+
+def throughput_paths(dataset: Dataset):
+    """
+    Read endpoints that exist on both paths, rotated per request.
+    """
+    listings = dataset.listing_ids
+    reviewed = dataset.reviewed_listing_ids
+    return [
+        lambda i: "/api/v1/listings/",
+        lambda i: f"/api/v1/listings/{listings[i % len(listings)]}/",
+        lambda i: f"/api/v1/listings/{reviewed[i % len(reviewed)]}/reviews/",
+    ]
+
+
+@contextmanager
+def db_latency(milliseconds):
+    """
+    Add a fixed delay to every SQL statement (all threads), like a database
+    on another host: the bench database is local and answers in microseconds.
+    """
+    if not milliseconds:
+        yield
+        return
+    execute = CursorWrapper._execute_with_wrappers
+
+    def delayed(self, *args, **kwargs):
+        time.sleep(milliseconds / 1000)
+        return execute(self, *args, **kwargs)
+
+    with mock.patch.object(CursorWrapper, "_execute_with_wrappers", delayed):
+        yield
+
+
+def _throughput_result(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            f"p{pct}": round(percentile(latencies, pct), 3) for pct in PERCENTILES
+        } if latencies else {},
+    }
+
+
+def run_wsgi_throughput(paths, requests, threads):
+    """
+    Sync views under a WSGI worker with `threads` threads: at most that many
+    requests are in flight, each holding its thread while queries run.
+    """
+    local = threading.local()
+
+    def call(i):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        started = time.perf_counter()
+        response = local.client.get(paths[i % len(paths)](i))
+        return (time.perf_counter() - started) * 1000, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = list(pool.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+    # потоки пула открыли свои соединения
+    connections.close_all()
+    return _throughput_result(
+        [latency for latency, status in outcomes],
+        sum(status != 200 for latency, status in outcomes),
+        elapsed,
+    )
+
+
+def run_asgi_throughput(paths, requests, concurrency):
+    """
+    Async views (/api/v1/async/...) in one event loop with up to `concurrency`
+    requests in flight. Each request gets its own ThreadSensitiveContext,
+    as under ASGIHandler, so the async ORM of different requests runs in parallel.
+    """
+    client = AsyncClient()
+
+    async def call(i, semaphore):
+        async with semaphore:
+            async with ThreadSensitiveContext():
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)](i).replace("/api/v1/", "/api/v1/async/", 1))
+                return (time.perf_counter() - started) * 1000, response.status_code
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(call(i, semaphore) for i in range(requests)))
+
+    started = time.perf_counter()
+    outcomes = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    connections.close_all()
+    return _throughput_result(
+        [latency for latency, status in outcomes],
+        sum(status != 200 for latency, status in outcomes),
+        elapsed,
+    )
+
+
+def run_throughput(dataset: Dataset, requests=300, concurrency=50, threads=4, latency_ms=20,
+                   log=None) -> dict:
+    """
+    Requests per second of one process on the read endpoints: sync API with
+    `threads` WSGI threads vs the async path with `concurrency` requests in flight.
+    """
+    log = log or (lambda message: None)
+    token_cache.clear()
+    paths = throughput_paths(dataset)
+
+    results = {}
+    with override_settings(LISTING_SEARCH_CACHE_TIMEOUT=0), db_latency(latency_ms):
+        # прогрев: интроспекция FTS, кэши сериализаторов и URL-резолвера
+        run_wsgi_throughput(paths, len(paths), 1)
+        run_asgi_throughput(paths, len(paths), 1)
+
+        results["wsgi"] = run_wsgi_throughput(paths, requests, threads)
+        results["asgi"] = run_asgi_throughput(paths, requests, concurrency)
+
+    for name, result in results.items():
+        log(
+            f"{name:<6} {result['requests_per_second']:8.1f} req/s"
+            f"  p50 {result['latency_ms'].get('p50', 0):8.2f} ms"
+            f"  p95 {result['latency_ms'].get('p95', 0):8.2f} ms"
+            + (f"  errors {result['errors']}" if result["errors"] else "")
+        )
+    return {
+        "requests": requests,
+        "wsgi_threads": threads,
+        "asgi_concurrency": concurrency,
+        "db_latency_ms": latency_ms,
+        **results,
+    }
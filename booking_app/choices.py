@@ -24,3 +24,28 @@ class BookingStatus(models.TextChoices):
     REJECTED = "rejected", _("Rejected")    # владелец отклонил до подтверждения
     CANCELLED = "cancelled", _("Cancelled")  # гость отменил бронь
     CANCELLED_BY_OWNER = "cancelled_by_owner", _("Cancelled by owner") # владелец отменил бронь
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", _("Pending")  # ждёт воркера (в т.ч. повтор после ошибки)
+    RUNNING = "running", _("Running")  # взята воркером
+    DONE = "done", _("Done")
+    FAILED = "failed", _("Failed")     # попытки исчерпаны
+
+
+# Допустимые переходы статуса брони: текущий -> {новые}.
+# REJECTED / CANCELLED / CANCELLED_BY_OWNER — конечные статусы.
+BOOKING_STATUS_TRANSITIONS = {
+    BookingStatus.PENDING: {
+        BookingStatus.CONFIRMED,    # владелец подтвердил
+        BookingStatus.REJECTED,     # владелец отклонил (или объявление выключено)
+        BookingStatus.CANCELLED,    # гость отменил
+    },
+    BookingStatus.CONFIRMED: {
+        BookingStatus.CANCELLED_BY_OWNER,
+        BookingStatus.CANCELLED,
+    },
+    BookingStatus.REJECTED: set(),
+    BookingStatus.CANCELLED: set(),
+    BookingStatus.CANCELLED_BY_OWNER: set(),
+}
@@ -0,0 +1,109 @@
+"""
+MySQL backend with a per-process connection pool (booking_app/db/pool.py).
+
+ENGINE 'booking_app.db.backends.mysql_pooled'; pool settings in the
+database's POOL dict (not OPTIONS: those go to MySQLdb.connect()):
+
+    'POOL': {'MIN_SIZE': 2, 'MAX_SIZE': 10, 'TIMEOUT': 5, 'MAX_IDLE': 300,
+             'MAX_LIFETIME': 3600, 'CHECK_AFTER': 1}
+
+Opening a connection checks one out of the pool, closing it (end of request
+with CONN_MAX_AGE=0) rolls back an unfinished transaction and gives it back.
+Without POOL (or POOL=None) it is the stock MySQL backend.
+"""
+from django.db.backends.mysql.base import Database
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+from django.utils.asyncio import async_unsafe
+
+from booking_app.db.backends.mysql_pooled.creation import DatabaseCreation
+from booking_app.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+POOL_DEFAULTS = {
+    "MIN_SIZE": 0,
+    "MAX_SIZE": 10,
+    "TIMEOUT": 5.0,
+    "MAX_IDLE": 300.0,
+    "MAX_LIFETIME": 3600.0,
+    "CHECK_AFTER": 1.0,
+}
+
+
+def _connect(conn_params):
+    # как MySQLDatabaseWrapper.get_new_connection(), без ссылки на wrapper потока
+    connection = Database.connect(**conn_params)
+    if connection.encoders.get(bytes) is bytes:
+        connection.encoders.pop(bytes)
+    return connection
+
+
+def _ping(connection):
+    connection.ping()
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    creation_class = DatabaseCreation
+    _pool = None  # пул, из которого взято текущее соединение
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return None
+        return {**POOL_DEFAULTS, **options}
+
+    def get_pool(self, conn_params):
+        """
+        The process-wide pool for these connection parameters (a test
+        database or a replica host gets its own pool).
+        """
+        options = self.pool_options
+        key = (self.alias, repr(sorted((name, value) for name, value in conn_params.items() if name != "conv")))
+        return get_pool(key, lambda: ConnectionPool(
+            self.alias,
+            lambda: _connect(conn_params),
+            _ping,
+            min_size=options["MIN_SIZE"],
+            max_size=options["MAX_SIZE"],
+            timeout=options["TIMEOUT"],
+            max_idle=options["MAX_IDLE"],
+            max_lifetime=options["MAX_LIFETIME"],
+            check_after=options["CHECK_AFTER"],
+        ))
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        if self.pool_options is None:
+            return super().get_new_connection(conn_params)
+        pool = self.get_pool(conn_params)
+        try:
+            connection = pool.acquire()
+        except PoolTimeout as exc:
+            # как ошибка подключения: ensure_connection() превратит в django.db.OperationalError
+            raise Database.OperationalError(str(exc)) from exc
+        self._pool = pool
+        return connection
+
+    def _close(self):
+        if self.connection is None or self._pool is None:
+            return super()._close()
+
+        connection, pool = self.connection, self._pool
+        # соединение вернулось в пул — этот wrapper больше не должен его трогать
+        self.connection = self._pool = None
+        reusable = True
+        try:
+            if not self.autocommit:
+                connection.rollback()  # незавершённая транзакция (close() внутри atomic)
+            elif self.errors_occurred:
+                connection.ping()
+        except Database.Error:
+            reusable = False
+        pool.release(connection, reusable=reusable)
+
+    def close_pool(self):
+        """
+        Close the idle connections of this alias's current pool
+        (DatabaseCreation, before the test database is dropped).
+        """
+        if self.pool_options is not None:
+            self.get_pool(self.get_connection_params()).close_idle()
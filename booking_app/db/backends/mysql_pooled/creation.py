@@ -0,0 +1,8 @@
+from django.db.backends.mysql.creation import DatabaseCreation as MySQLDatabaseCreation
+
+
+class DatabaseCreation(MySQLDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # простаивающие соединения пула открыты на тестовую БД: закрыть до DROP DATABASE
+        self.connection.close_pool()
+        super()._destroy_test_db(test_database_name, verbosity)
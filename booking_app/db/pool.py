@@ -0,0 +1,241 @@
+"""
+Process-wide database connection pool (used by the mysql_pooled backend).
+
+Django opens a connection per thread and closes it at the end of every
+request (CONN_MAX_AGE=0); with the pool "open" checks a connection out and
+"close" gives it back, so requests skip the TCP connect, auth handshake and
+session setup. Limits are per worker process: with W workers the database
+sees at most W x MAX_SIZE connections from the app.
+
+The pool knows nothing about the driver: `connect()` opens a connection,
+`check(connection)` raises if it is dead (MySQLdb: connection.ping()).
+"""
+import threading
+import time
+
+from booking_app.metrics import registry
+
+WAIT_HISTOGRAM = "db_pool_wait_seconds"
+CREATED_COUNTER = "db_pool_connections_created_total"
+CLOSED_COUNTER = "db_pool_connections_closed_total"
+TIMEOUTS_COUNTER = "db_pool_timeouts_total"
+IN_USE_GAUGE = "db_pool_connections_in_use"
+IDLE_GAUGE = "db_pool_connections_idle"
+
+
+class PoolTimeout(Exception):
+    """
+    No connection became free within the pool timeout (MAX_SIZE reached).
+    """
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of driver connections.
+
+    - min_size: idle connections kept open even when unused (opened on first use)
+    - max_size: open connections (idle + checked out) per process
+    - timeout: seconds acquire() waits for a free connection, then PoolTimeout
+    - max_idle: idle connections above min_size are closed after this many seconds
+    - max_lifetime: connections are replaced after this many seconds
+      (keep it below the server's wait_timeout)
+    - check_after: connections idle longer than this are checked (check())
+      before being handed out; 0 = check on every checkout
+    """
+
+    def __init__(self, name, connect, check=None, *, min_size=0, max_size=10, timeout=5.0,
+                 max_idle=300.0, max_lifetime=3600.0, check_after=1.0):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size, max_size >= 1.")
+        self.name = name
+        self.connect = connect
+        self.check = check
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+
+        self._condition = threading.Condition()
+        self._idle = []  # [(connection, created, released)], последний — самый «тёплый»
+        self._created = {}  # id(connection) -> monotonic time of creation
+        self._size = 0  # открытые соединения: idle + выданные
+        self._warmed = False
+
+    # -- checkout / checkin ---------------------------------------------------
+
+    def acquire(self):
+        """
+        An open connection: a healthy idle one, a new one while below
+        max_size, or the first one returned within `timeout` seconds.
+        """
+        started = time.monotonic()
+        if not self._warmed:
+            self.warm()
+        while True:
+            connection, created, released = self._reserve(started + self.timeout)
+            if connection is None:
+                connection = self._open()
+                break
+            if self._usable(connection, created, released):
+                break
+            self._discard(connection)
+        registry.observe(self.name, {WAIT_HISTOGRAM: time.monotonic() - started})
+        return connection
+
+    def release(self, connection, reusable=True):
+        """
+        Give a connection back; reusable=False closes it (e.g. after a failed reset).
+        """
+        now = time.monotonic()
+        created = self._created.get(id(connection))
+        if created is None:
+            raise ValueError(f"Connection does not belong to pool '{self.name}'.")
+        if not reusable or now - created >= self.max_lifetime:
+            self._discard(connection)
+            return
+
+        expired = []
+        with self._condition:
+            self._idle.append((connection, created, now))
+            # лишние простаивающие соединения (сверх min_size) закрываем
+            while len(self._idle) > self.min_size and now - self._idle[0][2] >= self.max_idle:
+                expired.append(self._idle.pop(0)[0])
+            self._condition.notify()
+        for stale in expired:
+            self._discard(stale)
+
+    def warm(self):
+        """
+        Open min_size connections (once, on first use).
+        """
+        self._warmed = True
+        opened = []
+        try:
+            while True:
+                with self._condition:
+                    if self._size >= self.min_size:
+                        break
+                    self._size += 1
+                opened.append(self._open())
+        finally:
+            for connection in opened:
+                self.release(connection)
+
+    def close_idle(self):
+        """
+        Close all idle connections (e.g. before dropping a test database).
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _created, _released in idle:
+            self._discard(connection)
+
+    # -- stats ----------------------------------------------------------------
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    @property
+    def in_use(self):
+        with self._condition:
+            return self._size - len(self._idle)
+
+    # -- internals ------------------------------------------------------------
+
+    def _reserve(self, deadline):
+        """
+        Under the lock: an idle connection, or (None, ...) = a slot reserved
+        for a new connection; waits for a release while the pool is full.
+        """
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    registry.increment(TIMEOUTS_COUNTER, self.name)
+                    raise PoolTimeout(
+                        f"No free connection in pool '{self.name}' after {self.timeout}s "
+                        f"({self.max_size} in use)."
+                    )
+                self._condition.wait(remaining)
+
+    def _open(self):
+        # слот в _size уже занят (_reserve / warm)
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self._created[id(connection)] = time.monotonic()
+        registry.increment(CREATED_COUNTER, self.name)
+        return connection
+
+    def _usable(self, connection, created, released):
+        now = time.monotonic()
+        if now - created >= self.max_lifetime:
+            return False
+        if self.check is not None and now - released >= self.check_after:
+            try:
+                self.check(connection)
+            except Exception:
+                return False
+        return True
+
+    def _discard(self, connection):
+        self._created.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass  # соединение уже мёртвое
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        registry.increment(CLOSED_COUNTER, self.name)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory):
+    """
+    The process-wide pool for `key`, created with factory() on first use.
+    """
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = factory()
+    return pool
+
+
+def all_pools():
+    return list(_pools.values())
+
+
+def pool_gauges():
+    """
+    Gauge source for the metrics registry: in-use / idle connections per pool.
+    """
+    values = {}
+    for pool in all_pools():
+        for name, value in ((IN_USE_GAUGE, pool.in_use), (IDLE_GAUGE, pool.idle)):
+            values[(name, pool.name)] = values.get((name, pool.name), 0) + value
+    return values
+
+
+registry.add_gauge_source(pool_gauges)
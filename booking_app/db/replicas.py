@@ -0,0 +1,162 @@
+"""
+Read replicas with read-your-writes.
+
+settings.DATABASE_REPLICAS lists replica aliases of DATABASES. During a
+GET/HEAD/OPTIONS request (ReplicaRoutingMiddleware) reads of booking_app
+models go to one replica, chosen per request; everything else uses the
+primary ("default"):
+
+- writes, and any read after the first write of the request
+  (INSERT/UPDATE/DELETE seen on the primary, track_writes())
+- unsafe methods, management commands, signals outside requests
+- reads inside a transaction on the primary
+- the user model, tokens, sessions (auth must see a just-created token)
+- code that fills a version-keyed cache (use_primary()): a lagging replica
+  must not re-cache old data under the new version
+
+A request that wrote pins its client (Authorization header / session
+cookie, or the address for anonymous clients) to the primary for
+DATABASE_PIN_SECONDS, so e.g. a new booking shows up in the next GET.
+Pins live in the default cache: use a shared one with several workers.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY_PREFIX = "db-pin:"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+@dataclass
+class ReadRouting:
+    """
+    Routing state of one request.
+    """
+
+    replica: str = None  # alias for reads, None = primary
+    wrote: bool = False
+
+
+_routing = ContextVar("booking_db_routing", default=None)
+
+
+def replica_aliases() -> list:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def pin_seconds() -> int:
+    return getattr(settings, "DATABASE_PIN_SECONDS", 5)
+
+
+def pin_key(request) -> str:
+    credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if credential:
+        # ключ — хэш токена/сессии: сами учётные данные в кэш не пишем
+        return PIN_KEY_PREFIX + hashlib.sha1(credential.encode()).hexdigest()
+    return PIN_KEY_PREFIX + "addr:" + request.META.get("REMOTE_ADDR", "")
+
+
+def choose_replica(request):
+    """
+    Replica alias for this request's reads, or None (primary).
+    """
+    replicas = replica_aliases()
+    if not replicas or request.method not in SAFE_METHODS:
+        return None
+    if cache.get(pin_key(request)) is not None:
+        return None
+    return random.choice(replicas)
+
+
+def pin_to_primary(request):
+    cache.set(pin_key(request), 1, pin_seconds())
+
+
+@contextmanager
+def read_routing(replica):
+    """
+    Route reads of the enclosed code (one request) to `replica`; yields the state.
+    """
+    state = ReadRouting(replica)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Reads inside go to the primary, e.g. when the result is cached.
+    """
+    state = _routing.get()
+    if state is None or state.replica is None:
+        yield
+        return
+    replica, state.replica = state.replica, None
+    try:
+        yield
+    finally:
+        state.replica = replica
+
+
+def track_writes(execute, sql, params, many, context):
+    """
+    Execute wrapper of the primary: a data-changing statement switches the
+    rest of the request to the primary and pins the client afterwards.
+    (Not db_for_write(): Django also asks it when an FK is assigned to an
+    unsaved instance, e.g. the Token built by the cached token auth.)
+    """
+    state = _routing.get()
+    if state is not None and not state.wrote and sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+        state.wrote = True
+    return execute(sql, params, many, context)
+
+
+def install_write_tracking(sender, connection, **kwargs):
+    """
+    connection_created receiver (BookingAppConfig.ready() when replicas are configured).
+    """
+    if connection.alias == DEFAULT_DB_ALIAS and track_writes not in connection.execute_wrappers:
+        # в начало: соединение часто открывается внутри execute_wrapper() бюджета запросов,
+        # который при выходе снимает последний элемент списка
+        connection.execute_wrappers.insert(0, track_writes)
+
+
+class PrimaryReplicaRouter:
+    """
+    DATABASE_ROUTERS entry (see the module docstring).
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        if model._meta.app_label != "booking_app" or model._meta.label == settings.AUTH_USER_MODEL:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # реплики получают схему через репликацию
+        if db in replica_aliases():
+            return False
+        return None
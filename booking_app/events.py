@@ -0,0 +1,6 @@
+# Собственные сигналы приложения (без импорта моделей — можно отправлять из models/)
+from django.dispatch import Signal
+
+# Статус одной или нескольких броней изменён через Booking.transition_to() / BookingQuerySet.transition().
+# kwargs: changes=[(booking_id, listing_id, old_status, new_status), ...], changed_by=User | None
+booking_status_changed = Signal()
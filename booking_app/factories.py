@@ -0,0 +1,85 @@
+"""
+factory_boy factories for seeding (manage.py bench) and shell experiments.
+
+Factories only build field values; bulk seeding is done with
+Factory.build_batch() + bulk_create() (booking_app/benchmarks.py).
+"""
+from datetime import timedelta
+
+import factory
+from factory import fuzzy
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from booking_app.choices import BookingStatus, ListingType, Role
+from booking_app.models import Booking, Listing, Review
+from booking_app.services.geo import grid_cell, postal_code_centroid
+
+# немецкие адреса/имена, как в реальных объявлениях
+LOCALE = "de_DE"
+
+
+def _around_centroid(listing, index):
+    """
+    Centroid of the postal code +-0.05° (~5 km), so listings of a region spread out.
+    bulk_create() skips Listing.save(): coordinates and geo_cell are built here.
+    """
+    point = postal_code_centroid(listing.postal_code)
+    if point is None:
+        return None
+    return round(point[index] + factory.random.randgen.uniform(-0.05, 0.05), 6)
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    first_name = factory.Faker("first_name", locale=LOCALE)
+    last_name = factory.Faker("last_name", locale=LOCALE)
+    role = Role.CUSTOMER
+    password = factory.django.Password("password123")
+
+
+class ListingFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Listing
+
+    owner = factory.SubFactory(UserFactory, role=Role.OWNER)
+    title = factory.Faker("sentence", nb_words=4, locale=LOCALE)
+    description = factory.Faker("paragraph", nb_sentences=4, locale=LOCALE)
+    region = factory.Faker("state", locale=LOCALE)
+    city = factory.Faker("city", locale=LOCALE)
+    postal_code = factory.Faker("postcode", locale=LOCALE)
+    street = factory.Faker("street_name", locale=LOCALE)
+    # номер дома из последовательности: unique_property_by_address не нарушается
+    house_number = factory.Sequence(lambda n: str(n + 1))
+    latitude = factory.LazyAttribute(lambda o: _around_centroid(o, 0))
+    longitude = factory.LazyAttribute(lambda o: _around_centroid(o, 1))
+    geo_cell = factory.LazyAttribute(lambda o: grid_cell(o.latitude, o.longitude))
+    price_per_night = fuzzy.FuzzyDecimal(30, 400)
+    max_guests = fuzzy.FuzzyInteger(1, 8)
+    listing_type = fuzzy.FuzzyChoice(ListingType.values)
+    rooms = fuzzy.FuzzyInteger(1, 6)
+
+
+class BookingFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Booking
+
+    listing = factory.SubFactory(ListingFactory)
+    guest = factory.SubFactory(UserFactory)
+    check_in = factory.LazyFunction(lambda: timezone.localdate() + timedelta(days=30))
+    check_out = factory.LazyAttribute(lambda o: o.check_in + timedelta(days=3))
+    guests_count = 1
+    status = BookingStatus.PENDING
+
+
+class ReviewFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Review
+
+    listing = factory.SubFactory(ListingFactory)
+    author = factory.SubFactory(UserFactory)
+    rating = fuzzy.FuzzyInteger(1, 5)
+    comment = factory.Faker("paragraph", nb_sentences=2, locale=LOCALE)
@@ -0,0 +1,162 @@
+from django.db.models import Exists, FloatField, OuterRef, Value
+from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from booking_app.choices import BookingStatus
+from booking_app.models import Listing, Booking
+from booking_app.services.geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, distance_km, near_q, parse_point
+from booking_app.services.search import fulltext_q, fulltext_rank, supports_fields
+
+
+class ListingFilter(filters.FilterSet):
+    """
+    Filters for the public listing search.
+
+    Besides the plain field filters, supports an availability search:
+    ?check_in=2025-07-01&check_out=2025-07-05&guests=2
+    and a proximity search (km, sortable with ?ordering=distance):
+    ?near=52.52,13.40&radius_km=5
+    """
+
+    check_in = filters.DateFilter(method="filter_noop", label=_("Available from (check-in)"))
+    check_out = filters.DateFilter(method="filter_noop", label=_("Available until (check-out)"))
+    guests = filters.NumberFilter(field_name="max_guests", lookup_expr="gte", label=_("Guests"))
+    near = filters.CharFilter(method="filter_noop", label=_("Near point (lat,lon)"))
+    radius_km = filters.NumberFilter(
+        method="filter_noop", label=_("Radius around near, km"),
+    )
+
+    distance_field = "distance"
+
+    class Meta:
+        model = Listing
+        fields = {
+            "price_per_night": ["gte", "lte"],  # Price range (min/max)
+            "city": ["exact", "in"],
+            "region": ["exact"],  # district (Nordrhein-Westfalen, Bayern...)
+            "rooms": ["gte", "lte"],  # Rooms range
+            "listing_type": ["exact"],  # Property type
+            "is_active": ["exact"],  # Active status
+        }
+
+    def filter_noop(self, queryset, name, value):
+        """
+        check_in/check_out and near/radius_km are applied together in filter_queryset().
+        """
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        queryset = self.filter_available(queryset)
+        return self.filter_near(queryset)
+
+    def filter_available(self, queryset):
+        check_in = self.form.cleaned_data.get("check_in")
+        check_out = self.form.cleaned_data.get("check_out")
+        if not check_in and not check_out:
+            return queryset
+
+        if not (check_in and check_out):
+            raise ValidationError(
+                {"detail": _("Both check_in and check_out are required for availability search.")}
+            )
+        if check_out <= check_in:
+            raise ValidationError({"check_out": _("Check-out date must be after check-in date.")})
+
+        # anti-join: тот же предикат пересечения, что и в Booking.clean()
+        busy = Booking.objects.filter(
+            listing=OuterRef("pk"),
+        ).active().overlapping(check_in, check_out)
+
+        return queryset.filter(~Exists(busy))
+
+    def wants_distance(self) -> bool:
+        request = self.request
+        return request is not None and self.distance_field in request.query_params.get(
+            api_settings.ORDERING_PARAM, ""
+        )
+
+    def filter_near(self, queryset):
+        near = self.form.cleaned_data.get("near")
+        radius = self.form.cleaned_data.get("radius_km")
+        if not near:
+            if radius is not None:
+                raise ValidationError({"near": _("radius_km requires near=lat,lon.")})
+            if self.wants_distance():
+                # ?ordering=distance без ?near= — сортировка ни на что не влияет
+                queryset = queryset.annotate(**{self.distance_field: Value(0.0, output_field=FloatField())})
+            return queryset
+
+        try:
+            latitude, longitude = parse_point(near)
+        except ValueError:
+            raise ValidationError({"near": _("Expected near=lat,lon, e.g. near=52.52,13.40.")})
+        radius = float(radius) if radius is not None else DEFAULT_RADIUS_KM
+        if not 0 < radius <= MAX_RADIUS_KM:
+            raise ValidationError(
+                {"radius_km": _("Radius must be in (0, %(max)s] km.") % {"max": MAX_RADIUS_KM}}
+            )
+
+        # индекс по ячейкам сетки + bounding box, точная дистанция — только для оставшихся строк
+        return queryset.filter(near_q(latitude, longitude, radius)).annotate(
+            **{self.distance_field: distance_km(latitude, longitude)}
+        ).filter(**{f"{self.distance_field}__lte": radius})
+
+
+class BookingFilter(filters.FilterSet):
+    """
+    Filters for booking lists and the owner export:
+    ?check_in_after=2025-01-01&check_in_before=2025-12-31 (check-in date range, inclusive)
+    ?status=confirmed&status=cancelled (any of the given statuses)
+    ?listing=ID
+    """
+
+    check_in = filters.DateFromToRangeFilter(label=_("Check-in date range"))
+    status = filters.MultipleChoiceFilter(choices=BookingStatus.choices, label=_("Status"))
+    # по id, без запроса на проверку существования объявления
+    listing = filters.NumberFilter(field_name="listing_id", label=_("Listing"))
+
+    class Meta:
+        model = Booking
+        fields = []
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ?search= backed by the full-text index (SQLite FTS5 / MySQL FULLTEXT)
+    when it covers the view's search_fields; otherwise the regular
+    icontains SearchFilter.
+
+    ?ordering=-relevance sorts by match rank (0 for all rows without ?search=).
+    """
+
+    relevance_field = "relevance"
+
+    def wants_relevance(self, request) -> bool:
+        return self.relevance_field in request.query_params.get(api_settings.ORDERING_PARAM, "")
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_text = " ".join(self.get_search_terms(request))
+
+        fts = None
+        if search_fields and search_text and supports_fields(queryset.model, search_fields):
+            fts = fulltext_q(queryset.model, search_text, queryset.db)
+
+        if fts is None:
+            queryset = super().filter_queryset(request, queryset, view)
+            if self.wants_relevance(request):
+                queryset = queryset.annotate(
+                    **{self.relevance_field: Value(0.0, output_field=FloatField())}
+                )
+            return queryset
+
+        queryset = queryset.filter(fts)
+        if self.wants_relevance(request):
+            queryset = queryset.annotate(
+                **{self.relevance_field: fulltext_rank(queryset.model, search_text, queryset.db)}
+            )
+        return queryset
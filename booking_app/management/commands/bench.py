@@ -0,0 +1,152 @@
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from booking_app.benchmarks import compare_reports, run_benchmark, run_throughput, seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Seed a throwaway test database and measure the API endpoints.
+
+    python manage.py bench
+    python manage.py bench --listings 20000 --bookings 100000 --output bench.json
+    python manage.py bench --only listings. --compare bench.json
+    python manage.py bench --throughput --wsgi-threads 4 --concurrency 50 --db-latency-ms 20
+
+    The dataset depends only on the volumes and --seed, so reports of two runs
+    (e.g. before/after a change) are comparable; --compare exits with an error
+    when an endpoint got slower or issues more queries than in the baseline.
+
+    --throughput instead compares requests per second of one process on the
+    read endpoints: the sync API with N WSGI threads vs the async read path
+    (/api/v1/async/) with many requests in flight.
+    """
+
+    help = "Benchmark API endpoints on a seeded test database (JSON report)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--listings", type=int, default=1000)
+        parser.add_argument("--bookings", type=int, default=5000)
+        parser.add_argument("--reviews", type=int, default=3000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset.")
+        parser.add_argument("--iterations", type=int, default=50, help="Measured requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint.")
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Run only scenarios whose name starts with this prefix (can be repeated).",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+        parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative p95 growth for --compare (default 0.25 = +25%%).",
+        )
+        parser.add_argument(
+            "--throughput",
+            action="store_true",
+            help="Compare WSGI and ASGI throughput of the read endpoints instead of per-endpoint latency.",
+        )
+        parser.add_argument("--requests", type=int, default=300, help="Requests per --throughput run.")
+        parser.add_argument("--wsgi-threads", type=int, default=4, help="Threads of the WSGI worker.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight on the ASGI path.")
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=20,
+            help="Delay added to every SQL statement in --throughput (a slow query or a remote database).",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        if options["throughput"]:
+            if options["compare"]:
+                raise CommandError("--compare can't be combined with --throughput.")
+            if min(options["requests"], options["wsgi_threads"], options["concurrency"]) < 1:
+                raise CommandError("--requests, --wsgi-threads and --concurrency must be at least 1.")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Can't read baseline report: {exc}")
+
+        log = self.stderr.write
+
+        # отдельная тестовая БД: рабочие данные не трогаем, каждый прогон с нуля
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            log("Seeding...")
+            dataset = seed_dataset(
+                users=options["users"],
+                listings=options["listings"],
+                bookings=options["bookings"],
+                reviews=options["reviews"],
+                seed=options["seed"],
+                log=log,
+            )
+            if options["throughput"]:
+                log("Measuring throughput...")
+                results = {"throughput": run_throughput(
+                    dataset,
+                    requests=options["requests"],
+                    concurrency=options["concurrency"],
+                    threads=options["wsgi_threads"],
+                    latency_ms=options["db_latency_ms"],
+                    log=log,
+                )}
+            else:
+                log("Running scenarios...")
+                results = {"endpoints": run_benchmark(
+                    dataset,
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                    only=options["only"],
+                    log=log,
+                )}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "seed": options["seed"],
+                "dataset": dataset.counts,
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+            },
+            **results,
+        }
+
+        regressions = []
+        if baseline is not None:
+            if baseline.get("meta", {}).get("dataset") != dataset.counts:
+                log(self.style.WARNING("Baseline was recorded on a different dataset."))
+            report["comparison"], regressions = compare_reports(
+                baseline, report, threshold=options["threshold"],
+            )
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+            log(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if regressions:
+            raise CommandError(f"Regressions against baseline: {', '.join(regressions)}")
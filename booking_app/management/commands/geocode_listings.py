@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from booking_app.models import Listing
+from booking_app.services.geo import grid_cell, postal_code_centroid
+from booking_app.services.listing_cache import invalidate_listing_search
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Fill listing coordinates (and geo_cell) from the postal code centroid table
+    (booking_app/data/postal_code_centroids.csv), e.g. after replacing it with
+    a more detailed dataset.
+
+    python manage.py geocode_listings            # only listings without coordinates
+    python manage.py geocode_listings --all      # also overwrite existing coordinates
+    """
+
+    help = "Fill listing coordinates from the local postal code centroid table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="overwrite",
+            help="Recompute coordinates of all listings, not only the missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        qs = Listing.objects.only("pk", "postal_code", "latitude", "longitude")
+        if not options["overwrite"]:
+            qs = qs.filter(latitude__isnull=True)
+
+        updated = missing = 0
+        batch = []
+        now = timezone.now()
+        with transaction.atomic():
+            for listing in qs.iterator(chunk_size=BATCH_SIZE):
+                point = postal_code_centroid(listing.postal_code)
+                if point is None:
+                    missing += 1
+                    continue
+                listing.latitude, listing.longitude = point
+                listing.geo_cell = grid_cell(*point)
+                listing.updated_at = now  # ETag детальной страницы
+                batch.append(listing)
+                if len(batch) >= BATCH_SIZE:
+                    updated += Listing.objects.bulk_update(batch, ["latitude", "longitude", "geo_cell", "updated_at"])
+                    batch = []
+            if batch:
+                updated += Listing.objects.bulk_update(batch, ["latitude", "longitude", "geo_cell", "updated_at"])
+            # bulk_update без сигналов — сбрасываем кэш поиска явно
+            invalidate_listing_search()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Geocoded {updated} listing(s); {missing} postal code(s) not in the centroid table."
+        ))
@@ -0,0 +1,126 @@
+import csv
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from booking_app.choices import Role
+from booking_app.models import User
+from booking_app.services.listing_import import ListingImporter, read_csv, read_jsonl
+
+FORMATS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+class RejectReport:
+    """
+    CSV report of rejected rows, opened on the first rejection:
+    line, reason, errors (JSON), row (JSON).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def __call__(self, rejected):
+        if self.writer is None:
+            self.file = open(self.path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["line", "reason", "errors", "row"])
+        self.writer.writerow([
+            rejected.line,
+            rejected.reason,
+            json.dumps(rejected.errors, ensure_ascii=False),
+            json.dumps(rejected.data, ensure_ascii=False, default=str),
+        ])
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class Command(BaseCommand):
+    """
+    Create listings of one owner from a CSV (header row) or JSON Lines file,
+    e.g. when onboarding a property manager.
+
+    Columns/keys are the writable fields of POST /listings/ (title, city,
+    postal_code, street, house_number, price_per_night, max_guests, ...),
+    validated with the same rules. Existing addresses (unique_property_by_address)
+    are rejected; rejected rows go to the report, the rest is inserted
+    batch by batch (a failed run keeps the batches already inserted).
+
+    python manage.py import_listings listings.csv --owner manager@example.com
+    python manage.py import_listings listings.jsonl --owner 42 --batch-size 1000 --report rejects.csv
+    python manage.py import_listings listings.csv --owner manager@example.com --dry-run
+    """
+
+    help = "Bulk import listings of one owner from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file.")
+        parser.add_argument("--owner", required=True, help="Email or id of the owner (role=owner).")
+        parser.add_argument(
+            "--format",
+            choices=sorted(FORMATS),
+            help="File format. Default: from the extension (.jsonl/.ndjson = jsonl, otherwise csv).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Listings per INSERT (default 500).")
+        parser.add_argument(
+            "--report",
+            help="CSV file for rejected rows. Default: <path>.rejected.csv",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and check addresses, then roll everything back.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"File not found: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        file_format = options["format"] or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+        owner = self.get_owner(options["owner"])
+
+        report = RejectReport(options["report"] or f"{path}.rejected.csv")
+        importer = ListingImporter(
+            owner,
+            batch_size=options["batch_size"],
+            on_reject=report,
+            csv_rows=file_format == "csv",
+        )
+        try:
+            with transaction.atomic() if options["dry_run"] else nullcontext():
+                for line, row in FORMATS[file_format](path):
+                    importer.feed(line, row)
+                result = importer.finish()
+                if options["dry_run"]:
+                    transaction.set_rollback(True)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+        finally:
+            report.close()
+
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.created} listing(s) from {result.read} row(s) in {result.batches} batch(es); "
+            f"rejected {result.rejected}."
+        ))
+        if result.rejected:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(result.reasons.items()))
+            self.stdout.write(self.style.WARNING(f"Rejected rows ({reasons}) written to {report.path}"))
+
+    def get_owner(self, value):
+        lookup = {"pk": int(value)} if value.isdigit() else {"email__iexact": value}
+        owner = User.objects.filter(**lookup).first()
+        if owner is None:
+            raise CommandError(f"User not found: {value}")
+        if owner.role != Role.OWNER:
+            raise CommandError(f"User {owner.email} is not an owner (role={owner.role}).")
+        return owner
+
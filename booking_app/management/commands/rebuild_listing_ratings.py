@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from booking_app.models import Listing
+from booking_app.services.listing_cache import invalidate_listing_search
+
+
+class Command(BaseCommand):
+    """
+    Recompute stored rating aggregates (rating_sum, review_count, average_rating)
+    of listings from the reviews table.
+
+    python manage.py rebuild_listing_ratings
+    python manage.py rebuild_listing_ratings --listing 1 --listing 2
+    """
+
+    help = "Rebuild stored rating aggregates of listings from reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--listing",
+            action="append",
+            type=int,
+            dest="listing_ids",
+            help="Listing id to rebuild (can be repeated). Default: all listings.",
+        )
+
+    def handle(self, *args, **options):
+        qs = Listing.objects.all()
+        if options["listing_ids"]:
+            qs = qs.filter(pk__in=options["listing_ids"])
+
+        with transaction.atomic():
+            updated = qs.rebuild_ratings()
+            # UPDATE без сигналов — сбрасываем кэш поиска явно
+            invalidate_listing_search()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {updated} listing(s)."))
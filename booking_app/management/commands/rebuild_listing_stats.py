@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from booking_app.services.owner_stats import rebuild_listing_stats
+
+
+class Command(BaseCommand):
+    """
+    Recompute the owner dashboard rollup (ListingMonthlyStats) from bookings
+    and reviews, e.g. after raw SQL or bulk updates that bypass signals.
+
+    python manage.py rebuild_listing_stats
+    python manage.py rebuild_listing_stats --listing 1 --listing 2
+    """
+
+    help = "Rebuild the per listing and month owner stats from bookings and reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--listing",
+            action="append",
+            type=int,
+            dest="listing_ids",
+            help="Listing id to rebuild (can be repeated). Default: all listings.",
+        )
+
+    def handle(self, *args, **options):
+        rows = rebuild_listing_stats(options["listing_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} monthly stats row(s)."))
@@ -0,0 +1,89 @@
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from booking_app.services.jobs import Worker
+
+# как часто удалять старые выполненные задачи
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    """
+    Run background jobs (booking_app/services/jobs.py) until stopped:
+    claim a batch of due jobs, run them one by one, sleep when there are none.
+    Several workers (processes or hosts) can run side by side.
+
+    SIGTERM / Ctrl+C: the current job is finished, then the worker exits.
+
+    python manage.py run_worker
+    python manage.py run_worker --batch-size 50 --sleep 0.5
+    python manage.py run_worker --once      # run what is due now, then exit (cron)
+    """
+
+    help = "Run background jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs claimed at once (default 10).")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no job is due (default 1).",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit when no job is due.")
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            help="Exit after this many jobs (e.g. to let a supervisor restart the process).",
+        )
+        parser.add_argument(
+            "--keep-done",
+            type=float,
+            default=7,
+            help="Delete successful jobs older than this many days (default 7, 0 = keep).",
+        )
+        parser.add_argument("--name", help="Worker name in Job.locked_by. Default: host:pid.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        if options["max_jobs"] is not None and options["max_jobs"] < 1:
+            raise CommandError("--max-jobs must be positive.")
+        worker = Worker(name=options["name"], batch_size=options["batch_size"])
+        keep_done = timedelta(days=options["keep_done"]) if options["keep_done"] > 0 else None
+
+        self.stopping = False
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+
+        self.stdout.write(f"Worker {worker.name} started.")
+        processed = 0
+        purged_at = 0.0
+        while not self.stopping:
+            # как в конце запроса: соединение старше CONN_MAX_AGE / сломанное закрывается (или уходит в пул)
+            close_old_connections()
+            if keep_done is not None and time.monotonic() - purged_at > PURGE_INTERVAL:
+                worker.purge(keep_done)
+                purged_at = time.monotonic()
+
+            limit = options["max_jobs"]
+            if limit is not None:
+                worker.batch_size = min(options["batch_size"], limit - processed)
+            taken = worker.run_batch()
+            processed += taken
+            if limit is not None and processed >= limit:
+                break
+            if not taken:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+
+        close_old_connections()
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker.name} stopped after {processed} job(s)."))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    """
+    Simulate an asynchronously replicated SQLite replica for local testing
+    of read replica routing (SQLITE_REPLICA=True in .env): copy db.sqlite3
+    into the replica file every --interval seconds, so the replica lags
+    behind the primary by up to that long.
+
+    python manage.py sync_sqlite_replica --interval 3
+    python manage.py sync_sqlite_replica --once
+    """
+
+    help = "Copy the primary SQLite database into the replica file periodically (simulated lag)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between copies (the lag).")
+        parser.add_argument("--once", action="store_true", help="Copy once and exit.")
+        parser.add_argument("--replica", default="replica", help="Replica alias in DATABASES.")
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        replica = settings.DATABASES.get(options["replica"])
+        if replica is None:
+            raise CommandError(f"No database alias '{options['replica']}' (set SQLITE_REPLICA=True).")
+        if not all(db["ENGINE"] == "django.db.backends.sqlite3" for db in (primary, replica)):
+            raise CommandError("Both the primary and the replica must be SQLite databases.")
+
+        while True:
+            self.copy(primary["NAME"], replica["NAME"])
+            self.stdout.write(f"{time.strftime('%H:%M:%S')} replica refreshed")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    @staticmethod
+    def copy(source_name, target_name):
+        # online backup API: консистентный снимок без остановки записи в primary
+        source = sqlite3.connect(source_name, timeout=20)
+        target = sqlite3.connect(target_name, timeout=20)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
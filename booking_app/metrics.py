@@ -0,0 +1,261 @@
+"""
+In-process request metrics (histograms per view action, plus a few counters
+and gauges, e.g. of the database connection pool), rendered in Prometheus text format at /api/v1/_metrics.
+
+Collected by booking_app.middleware.MetricsMiddleware when METRICS_ENABLED.
+Every worker process keeps its own numbers: scrape each worker directly,
+not through the load balancer, and let Prometheus sum them.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+PREFIX = "booking_"
+
+# name -> (help, buckets[, label name, default "view"])
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Wall time of a request.", DURATION_BUCKETS),
+    "http_request_sql_queries": ("SQL queries per request.", QUERY_COUNT_BUCKETS),
+    "http_request_sql_duration_seconds": ("Time spent in SQL per request.", DURATION_BUCKETS),
+    "http_request_serializer_duration_seconds": (
+        "Time spent in DRF serializers per request (validation and rendering, SQL excluded).",
+        DURATION_BUCKETS,
+    ),
+    "http_response_size_bytes": ("Response body size (non-streaming responses).", SIZE_BUCKETS),
+    "db_pool_wait_seconds": (
+        "Time to check a connection out of the pool (including opening and health check).",
+        WAIT_BUCKETS,
+        "database",
+    ),
+}
+
+# name -> (help, label name)
+COUNTERS = {
+    "listing_search_cache_requests_total": (
+        "Anonymous listing search requests by response cache result (hit/miss).",
+        "result",
+    ),
+    "db_pool_connections_created_total": ("Connections opened by the pool.", "database"),
+    "db_pool_connections_closed_total": (
+        "Connections closed by the pool (broken, expired or idle above the minimum).",
+        "database",
+    ),
+    "db_pool_timeouts_total": ("Checkouts that gave up waiting for a free connection.", "database"),
+}
+
+# name -> (help, label name); values come from the gauge sources at render time
+GAUGES = {
+    "db_pool_connections_in_use": ("Connections checked out of the pool.", "database"),
+    "db_pool_connections_idle": ("Open connections waiting in the pool.", "database"),
+}
+
+
+def metrics_enabled() -> bool:
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (non-cumulative counts, cumulated on render).
+    Not thread-safe by itself: the registry holds the lock.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последний — +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self, histograms, counters=None, gauges=None):
+        self.definitions = histograms
+        self.counter_definitions = counters or {}
+        self.gauge_definitions = gauges or {}
+        self._gauge_sources = []  # callables -> {(name, label value): value}
+        self._histograms = {}  # (name, view) -> Histogram
+        self._counters = {}  # (name, label value) -> int
+        self._lock = threading.Lock()
+
+    def observe(self, view, values):
+        """
+        Record one request: values = {metric name: value}. One lock per request.
+        """
+        with self._lock:
+            for name, value in values.items():
+                key = (name, view)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.definitions[name][1])
+                histogram.observe(value)
+
+    def increment(self, name, label, amount=1):
+        with self._lock:
+            key = (name, label)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add_gauge_source(self, source):
+        """
+        Register a callable returning current gauge values {(name, label value): value}.
+        """
+        if source not in self._gauge_sources:
+            self._gauge_sources.append(source)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            snapshot = {
+                key: (list(histogram.counts), histogram.sum, histogram.count)
+                for key, histogram in self._histograms.items()
+            }
+            counters = dict(self._counters)
+        gauges = {}
+        for source in self._gauge_sources:
+            gauges.update(source())
+
+        lines = []
+        for name, (help_text, buckets, *label_name) in self.definitions.items():
+            label_name = label_name[0] if label_name else "view"
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} histogram")
+            for (metric, view), (counts, total, count) in sorted(snapshot.items()):
+                if metric != name:
+                    continue
+                label = f'{label_name}="{escape_label(view)}"'
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{full_name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f"{full_name}_sum{{{label}}} {total!r}")
+                lines.append(f"{full_name}_count{{{label}}} {count}")
+        for name, (help_text, label_name) in self.counter_definitions.items():
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} counter")
+            for (metric, label), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{full_name}{{{label_name}="{escape_label(label)}"}} {value}')
+        for name, (help_text, label_name) in self.gauge_definitions.items():
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} gauge")
+            for (metric, label), value in sorted(gauges.items()):
+                if metric == name:
+                    lines.append(f'{full_name}{{{label_name}="{escape_label(label)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry(HISTOGRAMS, COUNTERS, GAUGES)
+
+
+@dataclass
+class RequestStats:
+    """
+    Counters of the request being processed (see current_stats).
+    """
+
+    queries: int = 0
+    sql_time: float = 0.0
+    serializer_time: float = 0.0
+    serializer_depth: int = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # вызывается из record_query(): считает запросы и время SQL
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+
+current_stats = ContextVar("booking_request_stats", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper on every connection: counts into the current request's
+    RequestStats. Context variables follow sync_to_async(), so the queries
+    of async ORM calls (run in worker threads) are counted too.
+    """
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_recording(sender=None, connection=None, **kwargs):
+    """
+    connection_created receiver (connected in AppConfig.ready() when metrics are enabled).
+    """
+    if record_query not in connection.execute_wrappers:
+        # в начало: execute_wrapper() других (бюджет запросов, bench) снимает последний элемент
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def _timed(method):
+    """
+    Wrap a serializer method to add its run time (minus SQL run inside,
+    e.g. a lazy queryset evaluated by .data) to the current request.
+    Nested calls are counted once.
+    """
+    def wrapper(self, *args, **kwargs):
+        stats = current_stats.get()
+        if stats is None or stats.serializer_depth:
+            return method(self, *args, **kwargs)
+
+        stats.serializer_depth += 1
+        sql_before = stats.sql_time
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started - (stats.sql_time - sql_before)
+            stats.serializer_time += max(elapsed, 0.0)
+            stats.serializer_depth -= 1
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def install_serializer_timing():
+    """
+    Time BaseSerializer.is_valid() and .data for all serializers.
+    Called once from AppConfig.ready() when metrics are enabled.
+    """
+    from rest_framework.serializers import BaseSerializer, ListSerializer
+
+    if hasattr(BaseSerializer.is_valid, "__wrapped__"):
+        return
+    # Serializer.data / ListSerializer.data вызывают super().data -> BaseSerializer.data
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+    BaseSerializer.is_valid = _timed(BaseSerializer.is_valid)
+    ListSerializer.is_valid = _timed(ListSerializer.is_valid)
@@ -0,0 +1,123 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+
+from booking_app.db.replicas import choose_replica, pin_to_primary, read_routing, replica_aliases
+from booking_app.metrics import RequestStats, current_stats, metrics_enabled, registry
+
+UNMATCHED_VIEW = "<unmatched>"
+
+
+def view_label(view_func, method) -> str:
+    """
+    ListingViewSet.list, BookingViewSet.set_status, TokenLoginView.post, ...
+    Non-DRF views (admin, schema) are labelled by module to keep cardinality low.
+    """
+    cls = getattr(view_func, "cls", None)
+    if cls is None:
+        cls = getattr(view_func, "view_class", None)
+        if cls is not None and getattr(cls, "__module__", "").startswith("booking_app."):
+            # async-вьюхи (booking_app/views/async_read.py): AsyncListingListView.get
+            return f"{cls.__name__}.{method}"
+        return getattr(view_func, "__module__", "") or "unknown"
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        return f"{cls.__name__}.{actions.get(method, method)}"
+    return f"{cls.__name__}.{method}"
+
+
+class MetricsMiddleware:
+    """
+    Per-request wall time, SQL count/time, serializer time and response size,
+    aggregated into histograms labelled by view action (booking_app/metrics.py).
+
+    Keep it first in MIDDLEWARE so the wall time covers the other middleware.
+    Disabled (removed from the chain at startup) unless METRICS_ENABLED.
+    Sync and async capable: under ASGI it doesn't force a thread per request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        # SQL считает record_query() на соединениях (install_query_recording)
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, stats, elapsed):
+        # resolver_match вместо process_view(): sync-хук в async-цепочке стоил бы переход в поток
+        match = getattr(request, "resolver_match", None)
+        view = view_label(match.func, request.method.lower()) if match is not None else UNMATCHED_VIEW
+        values = {
+            "http_request_duration_seconds": elapsed,
+            "http_request_sql_queries": stats.queries,
+            "http_request_sql_duration_seconds": stats.sql_time,
+            "http_request_serializer_duration_seconds": stats.serializer_time,
+        }
+        if not response.streaming:
+            values["http_response_size_bytes"] = len(response.content)
+        registry.observe(view, values)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Safe-method requests read from a replica unless their client wrote
+    recently; a request that wrote pins its client to the primary
+    (booking_app/db/replicas.py). Not used without DATABASE_REPLICAS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with read_routing(choose_replica(request)) as state:
+            response = self.get_response(request)
+        if state.wrote:
+            pin_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        with read_routing(choose_replica(request)) as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            pin_to_primary(request)
+        return response
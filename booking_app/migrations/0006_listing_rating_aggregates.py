@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 10:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Listing = apps.get_model("booking_app", "Listing")
+    Review = apps.get_model("booking_app", "Review")
+
+    reviews = Review.objects.filter(listing=OuterRef("pk")).order_by().values("listing")
+    Listing.objects.update(
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0),
+        review_count=Coalesce(Subquery(reviews.annotate(total=Count("pk")).values("total")), 0),
+    )
+    for listing in Listing.objects.filter(review_count__gt=0).only("pk", "rating_sum", "review_count"):
+        Listing.objects.filter(pk=listing.pk).update(
+            average_rating=listing.rating_sum / listing.review_count,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0005_booking_listing_avail_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='average_rating',
+            field=models.FloatField(default=0.0, editable=False, verbose_name='Average rating'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Rating sum'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Review count'),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['is_active', '-average_rating', 'review_count'], name='listing_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 6.0 on 2026-10-18 11:30
+
+from django.db import migrations
+
+# Снимок booking_app.services.search на момент миграции
+FULLTEXT_INDEXES = [
+    # (table, columns, mysql index name)
+    ('booking_app_listing', ('title', 'description'), 'listing_fulltext_idx'),
+    ('booking_app_review', ('comment',), 'review_fulltext_idx'),
+]
+
+
+# FTS5-таблицы и триггеры синхронизации (SQL booking_app.services.search.sqlite_install_sql
+# на момент миграции) + 'rebuild' для уже существующих строк
+SQLITE_FULLTEXT_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS booking_app_listing_fts USING fts5("
+    "title, description, content='booking_app_listing', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_listing_fts_ai AFTER INSERT ON booking_app_listing BEGIN "
+    "INSERT INTO booking_app_listing_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_listing_fts_ad AFTER DELETE ON booking_app_listing BEGIN "
+    "INSERT INTO booking_app_listing_fts(booking_app_listing_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_listing_fts_au AFTER UPDATE OF title, description "
+    "ON booking_app_listing BEGIN "
+    "INSERT INTO booking_app_listing_fts(booking_app_listing_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO booking_app_listing_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO booking_app_listing_fts(booking_app_listing_fts) VALUES ('rebuild')",
+
+    "CREATE VIRTUAL TABLE IF NOT EXISTS booking_app_review_fts USING fts5("
+    "comment, content='booking_app_review', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_review_fts_ai AFTER INSERT ON booking_app_review BEGIN "
+    "INSERT INTO booking_app_review_fts(rowid, comment) VALUES (new.id, new.comment); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_review_fts_ad AFTER DELETE ON booking_app_review BEGIN "
+    "INSERT INTO booking_app_review_fts(booking_app_review_fts, rowid, comment) "
+    "VALUES ('delete', old.id, old.comment); END",
+    "CREATE TRIGGER IF NOT EXISTS booking_app_review_fts_au AFTER UPDATE OF comment "
+    "ON booking_app_review BEGIN "
+    "INSERT INTO booking_app_review_fts(booking_app_review_fts, rowid, comment) "
+    "VALUES ('delete', old.id, old.comment); "
+    "INSERT INTO booking_app_review_fts(rowid, comment) VALUES (new.id, new.comment); END",
+    "INSERT INTO booking_app_review_fts(booking_app_review_fts) VALUES ('rebuild')",
+]
+
+
+def sqlite_has_fts5(cursor):
+    cursor.execute("PRAGMA compile_options")
+    return "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        for table, columns, index_name in FULLTEXT_INDEXES:
+            schema_editor.execute(
+                f"ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({', '.join(columns)})"
+            )
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if not sqlite_has_fts5(cursor):
+                return  # fallback: обычный SearchFilter (icontains)
+        for statement in SQLITE_FULLTEXT_SQL:
+            schema_editor.execute(statement)
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        for table, columns, index_name in FULLTEXT_INDEXES:
+            schema_editor.execute(f"ALTER TABLE {table} DROP INDEX {index_name}")
+    elif connection.vendor == 'sqlite':
+        for table, columns, index_name in FULLTEXT_INDEXES:
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
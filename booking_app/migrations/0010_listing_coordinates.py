@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-18 13:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fill_coordinates(apps, schema_editor):
+    from booking_app.services.geo import grid_cell, postal_code_centroid
+
+    Listing = apps.get_model('booking_app', 'Listing')
+    batch = []
+    for listing in Listing.objects.only('pk', 'postal_code').iterator(chunk_size=1000):
+        point = postal_code_centroid(listing.postal_code)
+        if point is None:
+            continue
+        listing.latitude, listing.longitude = point
+        listing.geo_cell = grid_cell(*point)
+        batch.append(listing)
+        if len(batch) >= 1000:
+            Listing.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+            batch = []
+    if batch:
+        Listing.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0009_bookingstatushistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)], verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)], verbose_name='Longitude'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='geo_cell',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Geo cell'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['geo_cell'], name='listing_geo_cell_idx'),
+        ),
+        migrations.RunPython(fill_coordinates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_stats(apps, schema_editor):
+    from booking_app.services.owner_stats import collect_counters
+
+    Booking = apps.get_model('booking_app', 'Booking')
+    Review = apps.get_model('booking_app', 'Review')
+    ListingMonthlyStats = apps.get_model('booking_app', 'ListingMonthlyStats')
+    totals = collect_counters(
+        Booking.objects.order_by().values_list('listing_id', 'check_in', 'check_out', 'status').iterator(chunk_size=1000),
+        Review.objects.order_by().values_list('listing_id', 'created_at', 'rating').iterator(chunk_size=1000),
+    )
+    ListingMonthlyStats.objects.bulk_create(
+        [
+            ListingMonthlyStats(listing_id=listing_id, month=month, **values)
+            for (listing_id, month), values in sorted(totals.items())
+            if any(values.values())
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0010_listing_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month.', verbose_name='Month')),
+                ('confirmed_nights', models.IntegerField(default=0, verbose_name='Confirmed nights')),
+                ('bookings', models.IntegerField(default=0, verbose_name='Bookings')),
+                ('cancellations', models.IntegerField(default=0, verbose_name='Cancellations')),
+                ('rating_sum', models.IntegerField(default=0, verbose_name='Rating sum')),
+                ('review_count', models.IntegerField(default=0, verbose_name='Review count')),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_stats', to='booking_app.listing', verbose_name='Listing')),
+            ],
+            options={
+                'verbose_name': 'Listing monthly stats',
+                'verbose_name_plural': 'Listing monthly stats',
+                'ordering': ['listing', 'month'],
+                'constraints': [models.UniqueConstraint(fields=('listing', 'month'), name='unique_listing_month_stats')],
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
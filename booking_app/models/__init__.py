@@ -1,5 +1,7 @@
 # models
 from .user import User
 from .listing import Listing
-from .booking import Booking, BookingStatus
+from .booking import Booking, BookingStatus, BookingStatusHistory
 from .review import Review
+from .stats import ListingMonthlyStats
+from .job import Job
@@ -5,12 +5,75 @@ from decimal import Decimal
 from django.db.models import Q
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from .base import AbstractBaseModel
 from .listing import Listing
-from booking_app.choices import BookingStatus
+from booking_app.choices import BookingStatus, BOOKING_STATUS_TRANSITIONS
+from booking_app.events import booking_status_changed
+
+
+class BookingQuerySet(models.QuerySet):
+    """
+    Reusable filters for booking availability checks.
+    """
+
+    def active(self):
+        """
+        Bookings that occupy the listing (PENDING or CONFIRMED).
+        """
+        return self.filter(status__in=Booking.ACTIVE_STATUSES)
+
+    def overlapping(self, check_in, check_out):
+        """
+        Bookings whose stay intersects [check_in, check_out).
+        Check-out day is free for the next check-in.
+        """
+        return self.filter(
+            Q(check_in__lt=check_out) & Q(check_out__gt=check_in)
+        )
+
+    def transition(self, new_status, changed_by=None):
+        """
+        Move every booking of this queryset that may go to `new_status`
+        (see BOOKING_STATUS_TRANSITIONS). Bookings in other statuses are skipped.
+
+        One UPDATE per current status, history written with one bulk INSERT.
+        No overlap check: callers moving bookings into PENDING/CONFIRMED from
+        an inactive status must check overlaps first (Booking.needs_overlap_check()).
+        Returns ids of moved bookings.
+        """
+        allowed_from = Booking.allowed_sources(new_status)
+
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.filter(status__in=allowed_from)
+                .select_for_update()
+                .order_by("pk")
+                .values_list("pk", "listing_id", "status")
+            )
+            if not rows:
+                return []
+
+            now = timezone.now()
+            by_status = {}
+            for pk, listing_id, status in rows:
+                by_status.setdefault(status, []).append(pk)
+            for status, pks in by_status.items():
+                Booking.objects.filter(pk__in=pks, status=status).update(status=new_status, updated_at=now)
+
+            changes = [(pk, listing_id, status, new_status) for pk, listing_id, status in rows]
+            BookingStatusHistory.objects.bulk_create([
+                BookingStatusHistory(
+                    booking_id=pk, from_status=status, to_status=new_status,
+                    changed_by=changed_by, created_at=now,
+                )
+                for pk, listing_id, status, _new in changes
+            ])
+            booking_status_changed.send(sender=Booking, changes=changes, changed_by=changed_by)
+
+        return [pk for pk, _listing_id, _status in rows]
 
 
 class Booking(AbstractBaseModel):
@@ -21,6 +84,11 @@ class Booking(AbstractBaseModel):
     CHECK_IN_TIME = time(14, 0)
     CHECK_OUT_TIME = time(12, 0)
 
+    # статусы, которые занимают даты объявления
+    ACTIVE_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+    # save(update_fields=...) только с этими полями — смена статуса, без full_clean()
+    STATUS_ONLY_FIELDS = {"status", "updated_at"}
+
     guest = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -50,6 +118,8 @@ class Booking(AbstractBaseModel):
         default=1,
     )
 
+    objects = BookingQuerySet.as_manager()
+
     @property
     def check_in_datetime(self):
         """
@@ -87,6 +157,34 @@ class Booking(AbstractBaseModel):
             return Decimal("0.00")
         return Decimal(self.nights) * self.listing.price_per_night
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember stored listing/status/dates (cache invalidation, status transitions, stats rollup).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_stored()
+        return instance
+
+    def _remember_stored(self):
+        self._stored_listing_id = self.__dict__.get("listing_id")
+        self._stored_status = self.__dict__.get("status")
+        self._stored_check_in = self.__dict__.get("check_in")
+        self._stored_check_out = self.__dict__.get("check_out")
+
+    def stored_state(self):
+        """
+        (listing_id, check_in, check_out, status) as last read from / written to
+        the DB, or None if unknown (e.g. a deferred field).
+        """
+        state = (
+            getattr(self, "_stored_listing_id", None),
+            getattr(self, "_stored_check_in", None),
+            getattr(self, "_stored_check_out", None),
+            getattr(self, "_stored_status", None),
+        )
+        return None if None in state else state
+
     def clean(self):
         """
         Validate booking business rules (min 1 night, dates order, etc.).
@@ -123,10 +221,7 @@ class Booking(AbstractBaseModel):
         if self.listing and self.check_in and self.check_out:
             overlapping = Booking.objects.filter(
                 listing=self.listing,
-                status__in = [BookingStatus.PENDING, BookingStatus.CONFIRMED],
-            ).filter(
-                Q(check_in__lt=self.check_out) & Q(check_out__gt=self.check_in)
-            )
+            ).active().overlapping(self.check_in, self.check_out)
             # self.pk есть только у объектов, которые уже существуют в базе (обновление),
             # при создании (.create()) он ещё None.
             if self.pk:
@@ -140,14 +235,172 @@ class Booking(AbstractBaseModel):
     def save(self, *args, **kwargs):
         """
         Ensure model is validated before saving.
+
+        Bookings that occupy dates (PENDING/CONFIRMED) are validated and written
+        while holding a row lock on their listing, so two concurrent requests
+        for the same listing can't both pass the overlap check.
+        Bookings of other listings are not blocked.
+
+        Status-only updates (update_fields ⊆ {"status", "updated_at"}) skip
+        full_clean(): status changes are validated by transition_to().
         """
-        self.full_clean()
-        return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) <= self.STATUS_ONLY_FIELDS:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            if self.status in self.ACTIVE_STATUSES and self.listing_id:
+                self.lock_listing()
+            self.full_clean(exclude=self.loaded_relations())
+            return super().save(*args, **kwargs)
+
+    def loaded_relations(self):
+        """
+        FK fields whose related object is already loaded from the DB
+        (listing from the serializer, guest = request.user): full_clean()
+        would only re-check that the row exists, one query per field.
+        """
+        names = []
+        for field in self._meta.concrete_fields:
+            if not field.is_relation or not field.is_cached(self):
+                continue
+            related = field.get_cached_value(self)
+            if related is not None and not related._state.adding and related.pk == getattr(self, field.attname):
+                names.append(field.name)
+        return names
+
+    def lock_listing(self):
+        """
+        SELECT ... FOR UPDATE on the listing row (MySQL/InnoDB).
+        On SQLite FOR UPDATE is a no-op: writers are serialized by
+        BEGIN IMMEDIATE (transaction_mode in settings.DATABASES).
+        """
+        Listing.objects.select_for_update().filter(pk=self.listing_id).values_list("pk", flat=True).first()
+
+    @staticmethod
+    def allowed_sources(new_status):
+        """
+        Statuses from which a booking may move to `new_status`.
+        """
+        return [old for old, targets in BOOKING_STATUS_TRANSITIONS.items() if new_status in targets]
+
+    @staticmethod
+    def can_transition(old_status, new_status) -> bool:
+        return new_status in BOOKING_STATUS_TRANSITIONS.get(old_status, ())
+
+    @classmethod
+    def needs_overlap_check(cls, old_status, new_status) -> bool:
+        """
+        Only a booking that starts occupying dates again needs the overlap query.
+        """
+        return new_status in cls.ACTIVE_STATUSES and old_status not in cls.ACTIVE_STATUSES
+
+    def transition_to(self, new_status, changed_by=None):
+        """
+        Change status according to BOOKING_STATUS_TRANSITIONS.
+
+        Validates only what the transition needs (no "check-in in the past",
+        no max_guests lookup), so e.g. a past booking can still be cancelled.
+        The UPDATE is guarded by the current status: a concurrent change
+        makes it fail instead of silently overwriting.
+        """
+        old_status = getattr(self, "_stored_status", None) or self.status
+        if not self.can_transition(old_status, new_status):
+            raise ValidationError({
+                "status": _("Cannot change booking status from '%(old)s' to '%(new)s'.") % {
+                    "old": old_status, "new": new_status,
+                }
+            })
+
+        with transaction.atomic():
+            if self.needs_overlap_check(old_status, new_status):
+                self.lock_listing()
+                overlapping = Booking.objects.filter(
+                    listing_id=self.listing_id,
+                ).active().overlapping(self.check_in, self.check_out).exclude(pk=self.pk)
+                if overlapping.exists():
+                    raise ValidationError(_("These dates are already booked for this listing."))
+
+            now = timezone.now()
+            updated = Booking.objects.filter(pk=self.pk, status=old_status).update(
+                status=new_status, updated_at=now,
+            )
+            if not updated:
+                raise ValidationError({"status": _("Booking status was changed by another request.")})
+
+            BookingStatusHistory.objects.create(
+                booking=self, from_status=old_status, to_status=new_status,
+                changed_by=changed_by, created_at=now,
+            )
+            self.status = self._stored_status = new_status
+            self.updated_at = now
+            booking_status_changed.send(
+                sender=Booking,
+                changes=[(self.pk, self.listing_id, old_status, new_status)],
+                changed_by=changed_by,
+            )
 
     class Meta:
         verbose_name = _("Booking")
         verbose_name_plural = _("Bookings")
         ordering = ["-created_at"]
+        indexes = [
+            # availability search: anti-join by listing + active status + date range
+            models.Index(
+                fields=["listing", "status", "check_in", "check_out"],
+                name="booking_listing_avail_idx",
+            ),
+            # keyset-пагинация по (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="booking_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.listing} | {self.guest} | {self.check_in} - {self.check_out}"
+
+
+class BookingStatusHistory(models.Model):
+    """
+    Append-only log of booking status transitions.
+    """
+
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        related_name="status_history",
+        verbose_name=_("Booking"),
+    )
+    from_status = models.CharField(
+        _("From status"),
+        max_length=20,
+        choices=BookingStatus.choices,
+    )
+    to_status = models.CharField(
+        _("To status"),
+        max_length=20,
+        choices=BookingStatus.choices,
+    )
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Changed by"),
+    )
+    created_at = models.DateTimeField(_("Created At"), default=timezone.now)
+
+    def save(self, *args, **kwargs):
+        """
+        History rows are never updated.
+        """
+        if not self._state.adding:
+            raise ValidationError(_("Booking status history is append-only."))
+        return super().save(*args, **kwargs)
+
+    class Meta:
+        verbose_name = _("Booking status change")
+        verbose_name_plural = _("Booking status history")
+        ordering = ["booking", "created_at", "id"]
+
+    def __str__(self) -> str:
+        return f"#{self.booking_id}: {self.from_status} → {self.to_status}"
@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from booking_app.choices import JobStatus
+
+
+class Job(models.Model):
+    """
+    Background job stored in the main database, run by `manage.py run_worker`
+    (booking_app/services/jobs.py).
+
+    - name: key of JOB_HANDLERS, payload: keyword arguments of the handler
+    - run_at: not before this time (retries are pushed back with a backoff)
+    - locked_by / locked_at: worker running the job; a RUNNING job locked
+      longer than JOBS_LOCK_TIMEOUT ago is claimed again (worker died)
+    """
+
+    name = models.CharField(_("Name"), max_length=100)
+    payload = models.JSONField(_("Payload"), default=dict, blank=True)
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(_("Attempts"), default=0)
+    max_attempts = models.PositiveIntegerField(_("Max attempts"), default=5)
+    run_at = models.DateTimeField(_("Run at"), default=timezone.now)
+    locked_by = models.CharField(_("Locked by"), max_length=100, blank=True)
+    locked_at = models.DateTimeField(_("Locked at"), null=True, blank=True)
+    last_error = models.TextField(_("Last error"), blank=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    finished_at = models.DateTimeField(_("Finished at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Job")
+        verbose_name_plural = _("Jobs")
+        ordering = ["run_at", "id"]
+        indexes = [
+            # выборка воркера: status + run_at (и locked_at зависших RUNNING)
+            models.Index(fields=["status", "run_at"], name="job_claim_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"#{self.pk} {self.name} ({self.status})"
@@ -1,9 +1,56 @@
 from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Case, Count, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .base import AbstractBaseModel
 from booking_app.choices import ListingType
+from booking_app.services.geo import grid_cell, postal_code_centroid
+
+
+class ListingQuerySet(models.QuerySet):
+    """
+    Maintenance of the stored rating aggregates.
+    """
+
+    def _refresh_average_rating(self):
+        # отдельным UPDATE: MySQL вычисляет SET слева направо по новым значениям, SQLite — по старым
+        return self.update(
+            average_rating=Case(
+                When(review_count=0, then=Value(0.0)),
+                default=Cast(F("rating_sum"), FloatField()) / F("review_count"),
+                output_field=FloatField(),
+            ),
+            # update() не трогает auto_now; ETag/Last-Modified детальной страницы зависят от него
+            updated_at=timezone.now(),
+        )
+
+    def apply_rating_delta(self, rating_delta: int, count_delta: int):
+        """
+        Shift rating_sum/review_count by the given deltas and recompute the average.
+        Call inside the transaction that writes the review.
+        """
+        self.update(
+            rating_sum=F("rating_sum") + rating_delta,
+            review_count=F("review_count") + count_delta,
+        )
+        return self._refresh_average_rating()
+
+    def rebuild_ratings(self):
+        """
+        Recompute rating aggregates from the reviews table.
+        """
+        from .review import Review
+
+        reviews = Review.objects.filter(listing=OuterRef("pk")).order_by().values("listing")
+        self.update(
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0),
+            review_count=Coalesce(Subquery(reviews.annotate(total=Count("pk")).values("total")), 0),
+        )
+        return self._refresh_average_rating()
 
 
 class Listing(AbstractBaseModel):
@@ -39,6 +86,22 @@ class Listing(AbstractBaseModel):
         help_text=_("Addition to the house number (e.g. A, B, courtyard apartment, app 12, etc.)."),
     )
 
+    # координаты: по умолчанию центроид почтового индекса (booking_app/services/geo.py)
+    latitude = models.FloatField(
+        _("Latitude"),
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        _("Longitude"),
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    # ячейка сетки 0.1° для поиска ?near= (индекс), вычисляется в save()
+    geo_cell = models.PositiveIntegerField(_("Geo cell"), blank=True, null=True, editable=False)
+
     price_per_night = models.DecimalField(
         _("Price per night"),
         max_digits=10,
@@ -61,6 +124,16 @@ class Listing(AbstractBaseModel):
         default=True,
     )
 
+    # Хранимые агрегаты отзывов: обновляются при записи Review (booking_app/signals.py),
+    # пересчёт — manage.py rebuild_listing_ratings
+    rating_sum = models.PositiveIntegerField(_("Rating sum"), default=0, editable=False)
+    review_count = models.PositiveIntegerField(_("Review count"), default=0, editable=False)
+    average_rating = models.FloatField(_("Average rating"), default=0.0, editable=False)
+
+    RATING_FIELDS = ("rating_sum", "review_count", "average_rating")
+
+    objects = ListingQuerySet.as_manager()
+
     @property
     def full_address(self) -> str:
         """
@@ -72,6 +145,26 @@ class Listing(AbstractBaseModel):
         parts.extend([self.postal_code, self.city])
         return " ".join(str(p) for p in parts if p)
 
+    def fill_coordinates(self):
+        """
+        Missing coordinates from the postal code centroid table; geo_cell from the coordinates.
+        """
+        if self.latitude is None or self.longitude is None:
+            self.latitude, self.longitude = postal_code_centroid(self.postal_code) or (None, None)
+        self.geo_cell = grid_cell(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        """
+        Never overwrite rating aggregates with stale in-memory values on update.
+        """
+        self.fill_coordinates()
+        if not self._state.adding and self.pk and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.RATING_FIELDS
+            ]
+        return super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Listing")
         verbose_name_plural = _("Listings")
@@ -89,6 +182,18 @@ class Listing(AbstractBaseModel):
                 name="unique_property_by_address",
             ),
         ]
+        indexes = [
+            # сортировка по умолчанию в ListingViewSet: -average_rating, review_count
+            models.Index(
+                fields=["is_active", "-average_rating", "review_count"],
+                name="listing_rating_idx",
+            ),
+            # keyset-пагинация по (created_at, id)
+            models.Index(fields=["is_active", "-created_at", "-id"], name="listing_created_idx"),
+            # поиск ?near=: диапазоны ячеек по строкам сетки (MULTI-INDEX OR / range scans);
+            # без is_active впереди — фильтр по bool не даёт равенства для составного индекса
+            models.Index(fields=["geo_cell"], name="listing_geo_cell_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.city})"
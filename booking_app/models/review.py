@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from .base import AbstractBaseModel
@@ -33,6 +33,27 @@ class Review(AbstractBaseModel):
         blank=True, null=True,
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the stored listing/rating to compute aggregate deltas on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_rating()
+        return instance
+
+    def _remember_rating(self):
+        self._stored_listing_id = self.__dict__.get("listing_id")
+        self._stored_rating = self.__dict__.get("rating")
+
+    def save(self, *args, **kwargs):
+        """
+        Save review and listing rating aggregates in one transaction
+        (aggregates are updated by post_save in booking_app/signals.py).
+        """
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Review")
         verbose_name_plural = _("Reviews")
@@ -43,6 +64,10 @@ class Review(AbstractBaseModel):
                 name="unique_review_per_listing_author",
             ),
         ]
+        indexes = [
+            # keyset-пагинация по (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="review_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.author} → {self.listing} ({self.rating}/5)"
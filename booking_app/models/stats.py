@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .listing import Listing
+
+
+class ListingMonthlyStats(models.Model):
+    """
+    Owner dashboard rollup: one row per listing and calendar month.
+
+    Maintained incrementally from booking/review writes and status
+    transitions (booking_app/services/owner_stats.py, signals.py);
+    rebuilt from scratch with `manage.py rebuild_listing_stats`.
+
+    - confirmed_nights: nights of CONFIRMED bookings falling into the month
+      (a stay over the month end is split between both months)
+    - bookings / cancellations: bookings by check-in month, all statuses /
+      cancelled by the guest or the owner
+    - rating_sum / review_count: reviews by creation month
+    """
+
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        related_name="monthly_stats",
+        verbose_name=_("Listing"),
+    )
+    month = models.DateField(_("Month"), help_text=_("First day of the month."))
+    confirmed_nights = models.IntegerField(_("Confirmed nights"), default=0)
+    bookings = models.IntegerField(_("Bookings"), default=0)
+    cancellations = models.IntegerField(_("Cancellations"), default=0)
+    rating_sum = models.IntegerField(_("Rating sum"), default=0)
+    review_count = models.IntegerField(_("Review count"), default=0)
+
+    # счётчики, которые меняются дельтами (services/owner_stats.py)
+    COUNTERS = ("confirmed_nights", "bookings", "cancellations", "rating_sum", "review_count")
+
+    class Meta:
+        verbose_name = _("Listing monthly stats")
+        verbose_name_plural = _("Listing monthly stats")
+        ordering = ["listing", "month"]
+        constraints = [
+            models.UniqueConstraint(fields=["listing", "month"], name="unique_listing_month_stats"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.listing_id} {self.month:%Y-%m}"
@@ -0,0 +1,286 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (seek) pagination on a composite key.
+
+    The key is the queryset ordering (OrderingFilter or model Meta.ordering)
+    plus the primary key as a tie-breaker, e.g. (created_at, id) or
+    (average_rating, review_count, id). The cursor stores the key values of
+    the last/first row, so every page is a "WHERE key > cursor LIMIT n"
+    query: no COUNT(*), no OFFSET.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, queryset):
+        """
+        Return [(field, descending), ...] with pk tie-breaker,
+        or None if ordering can't be used as a keyset (expressions, relations, NULLs).
+        """
+        query = queryset.query
+        ordering = list(query.order_by)
+        if not ordering and query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+
+        opts = queryset.model._meta
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str):
+                return None
+            descending = item.startswith("-")
+            name = item.lstrip("-")
+            if name == "pk":
+                name = opts.pk.name
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation or field.null:
+                return None
+            if field.name not in [key[0].name for key in keys]:
+                keys.append((field, descending))
+
+        if opts.pk.name not in [key[0].name for key in keys]:
+            keys.append((opts.pk, keys[0][1] if keys else False))
+        return keys
+
+    def supports(self, queryset) -> bool:
+        return self.get_ordering(queryset) is not None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_query = self.get_page_query(queryset, request)
+        if page_query is None:
+            return None
+        return self.finish_page(list(page_query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for async views (async ORM).
+        """
+        page_query = self.get_page_query(queryset, request)
+        if page_query is None:
+            return None
+        return self.finish_page([row async for row in page_query])
+
+    def get_page_query(self, queryset, request):
+        """
+        Sliced queryset of the requested page (+1 row), or None if keyset pagination doesn't apply.
+        """
+        self.request = request
+        self.keys = self.get_ordering(queryset)
+        if self.keys is None or not self.page_size:
+            return None
+
+        position, reverse = self.decode_cursor(request)
+        self.position, self.reverse = position, reverse
+
+        order_by = [
+            ("-" if descending != reverse else "") + field.name
+            for field, descending in self.keys
+        ]
+        queryset = queryset.order_by(*order_by)
+        if position is not None:
+            queryset = queryset.filter(self.build_position_filter(position, reverse))
+
+        # +1 запись, чтобы узнать, есть ли следующая страница (без COUNT)
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, results):
+        position, reverse = self.position, self.reverse
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_key = self.row_key(results[0]) if results else None
+        self.last_key = self.row_key(results[-1]) if results else None
+        return results
+
+    def build_position_filter(self, position, reverse):
+        """
+        Lexicographic "row after position":
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... for the composite key.
+        """
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.keys, position):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{field.name}__{lookup}": value})
+            equal &= Q(**{field.name: value})
+        return condition
+
+    def row_key(self, row):
+        if isinstance(row, dict):
+            return [row[field.attname] for field, _ in self.keys]
+        return [getattr(row, field.attname) for field, _ in self.keys]
+
+    def encode_cursor(self, key, reverse=False):
+        values = []
+        for value in key:
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            values.append(value)
+        payload = {"k": values}
+        if reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            raw_values = payload["k"]
+            if len(raw_values) != len(self.keys):
+                raise ValueError
+            # приводим значения из JSON к типам полей (datetime, Decimal, ...)
+            position = [field.to_python(value) for (field, _), value in zip(self.keys, raw_values)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get("r"))
+
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        return self.encode_cursor(self.last_key)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_key is None:
+            return None
+        return self.encode_cursor(self.first_key, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination with apaginate_queryset() for async views:
+    COUNT and the page rows are read with the async ORM.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count — cached_property: заполняем заранее, чтобы page() не делал sync COUNT
+        paginator.__dict__["count"] = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class HybridPagination(BasePagination):
+    """
+    Page numbers by default (?page=2, with count),
+    keyset cursor mode on ?pagination=cursor or ?cursor=... (no COUNT, no OFFSET).
+    """
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    def __init__(self):
+        self.page_number = AsyncPageNumberPagination()
+        self.keyset = KeysetCursorPagination()
+        self.active = self.page_number
+
+    def is_cursor_requested(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.keyset.cursor_query_param in request.query_params
+        )
+
+    def select(self, queryset, request):
+        if self.is_cursor_requested(request) and self.keyset.supports(queryset):
+            self.active = self.keyset
+        else:
+            self.active = self.page_number
+        return self.active
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.select(queryset, request).paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await self.select(queryset, request).apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.page_number.get_schema_operation_parameters(view),
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'cursor' for keyset pagination (no total count).",
+                "schema": {"type": "string", "enum": [self.cursor_mode]},
+            },
+            *self.keyset.get_schema_operation_parameters(view),
+        ]
@@ -0,0 +1,111 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger("booking_app.query_budget")
+
+# сколько запросов сохранять сверх бюджета для сообщения об ошибке
+SQL_LOG_EXTRA = 20
+
+# atomic() внутри внешней транзакции (TestCase, ATOMIC_REQUESTS) — не запросы view
+SAVEPOINT_SQL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+_unbudgeted = ContextVar("booking_query_budget_exempt", default=False)
+
+
+@contextmanager
+def unbudgeted():
+    """
+    Queries inside are not counted: one-off per-process work
+    (e.g. introspection cached for the process lifetime).
+    """
+    token = _unbudgeted.set(True)
+    try:
+        yield
+    finally:
+        _unbudgeted.reset(token)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    A view action ran more SQL queries than its declared budget
+    (raised only in strict mode: DEBUG / test runs).
+    """
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper(): counts queries and keeps the first SQL statements.
+    Savepoint statements are not counted.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if _unbudgeted.get() or sql.startswith(SAVEPOINT_SQL):
+            return execute(sql, params, many, context)
+        self.count += 1
+        if len(self.statements) < self.keep:
+            self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    """
+    Per-action SQL query budgets for API views.
+
+        query_budget = {"list": 2, "retrieve": 1, "set_status": 8}
+
+    Counted are the queries of the handler (after authentication and
+    permission checks, which are cached or query-free). Actions without an
+    entry are not checked. Over budget: QueryBudgetExceeded in strict mode
+    (QUERY_BUDGET_STRICT, on with DEBUG and in test runs), otherwise a
+    warning with the executed SQL in the "booking_app.query_budget" logger.
+    Unsafe methods only log: their writes are already committed when the
+    budget is checked, a 500 would hide a successful change.
+    """
+
+    query_budget = {}
+
+    def get_query_budget(self):
+        name = getattr(self, "action", None) or self.request.method.lower()
+        return self.query_budget.get(name)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        budget = self.get_query_budget()
+        if budget is None:
+            return
+        self._query_budget_stack = ExitStack()
+        self._query_recorder = QueryRecorder(keep=budget + SQL_LOG_EXTRA)
+        for connection in connections.all():
+            self._query_budget_stack.enter_context(connection.execute_wrapper(self._query_recorder))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        stack = self.__dict__.pop("_query_budget_stack", None)
+        if stack is not None:
+            stack.close()
+            self.check_query_budget(self._query_recorder)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def check_query_budget(self, recorder):
+        budget = self.get_query_budget()
+        if recorder.count <= budget:
+            return
+
+        view = f"{type(self).__name__}.{getattr(self, 'action', None) or self.request.method.lower()}"
+        message = f"{view}: {recorder.count} SQL queries, budget {budget}"
+        strict = getattr(settings, "QUERY_BUDGET_STRICT", settings.DEBUG)
+        if strict and self.request.method in SAFE_METHODS:
+            raise QueryBudgetExceeded(message + "\n" + "\n".join(recorder.statements))
+        logger.warning(
+            "%s (%s)\n%s",
+            message, self.request.get_full_path(), "\n".join(recorder.statements),
+        )
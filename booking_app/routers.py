@@ -1,10 +1,16 @@
 from django.urls import path, include
 
+from booking_app.views.metrics import MetricsView
+
 urlpatterns = [
     path("listings/", include("booking_app.urls.listing")),
     path("bookings/", include("booking_app.urls.booking")),
     path("reviews/", include("booking_app.urls.review")),
     path("users/", include("booking_app.urls.user")),
     path("auth/", include("booking_app.urls.auth")),
+    # async read path для ASGI: /api/v1/async/listings/...
+    path("async/", include("booking_app.urls.async_read")),
+    # метрики для Prometheus, только staff (METRICS_ENABLED)
+    path("_metrics", MetricsView.as_view(), name="metrics"),
 
 ]
\ No newline at end of file
@@ -1,14 +1,28 @@
 from rest_framework import serializers
-from booking_app.models import Booking, Listing
+from booking_app.models import Booking, BookingStatus, Listing
+from booking_app.serializers.fieldsets import Expansion, FieldsetSerializerMixin
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for booking creation and listing."""
 
     listing = serializers.PrimaryKeyRelatedField(
         queryset=Listing.objects.filter(is_active=True)
     )
 
+    expandable = {
+        "listing": Expansion(
+            "booking_app.serializers.listing.ListingListSerializer", source="listing", select_related="listing",
+        ),
+        "guest": Expansion(
+            "booking_app.serializers.user.UserPublicSerializer", source="guest", select_related="guest",
+        ),
+    }
+    # колонки свойств для ?fields= (only() в serializers/fieldsets.py)
+    field_columns = {
+        "total_price": ("check_in", "check_out", "listing__price_per_night"),
+    }
+
     class Meta:
         model = Booking
         fields = [
@@ -18,3 +32,41 @@ class BookingSerializer(serializers.ModelSerializer):
         read_only_fields = ['guest', 'status', 'total_price']
 
 
+class BookingBulkStatusSerializer(serializers.Serializer):
+    """Input for owner bulk status change: list of booking ids and target status."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
+    status = serializers.ChoiceField(choices=[
+        BookingStatus.CONFIRMED,
+        BookingStatus.REJECTED,
+        BookingStatus.CANCELLED_BY_OWNER,
+    ])
+
+
+class BookingQuoteItemSerializer(serializers.Serializer):
+    """One stay to quote: same input fields as a booking."""
+
+    listing = serializers.IntegerField(min_value=1)
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    guests_count = serializers.IntegerField(min_value=1, default=1)
+
+
+class BookingQuoteSerializer(serializers.Serializer):
+    """Input for the batch quote: up to 200 stays."""
+
+    items = BookingQuoteItemSerializer(many=True, allow_empty=False, max_length=200)
+
+
+class BookingQuoteResultSerializer(BookingQuoteItemSerializer):
+    """Quote of one stay (services/quote.py): price and availability or the rejection reason."""
+
+    available = serializers.BooleanField()
+    nights = serializers.IntegerField()
+    price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    total_price = serializers.DecimalField(max_digits=14, decimal_places=2, allow_null=True)
+    reason = serializers.CharField(allow_null=True)
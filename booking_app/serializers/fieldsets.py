@@ -0,0 +1,241 @@
+"""
+Sparse fieldsets and relation expansion for read endpoints:
+
+    ?fields=id,title,price_per_night   only these keys in the output, only their columns in SQL
+    ?expand=owner,reviews              embed related objects declared in the serializer's `expandable`
+
+The view (views/mixins.FieldsetMixin) parses both into a Fieldset, passes it
+to the serializer (context["fieldset"], FieldsetSerializerMixin trims/adds
+fields) and plans the queryset with Fieldset.plan():
+
+- only() with the columns of the selected fields (plus pk and ordering
+  columns), when every selected field maps to columns; properties declare
+  theirs in `field_columns`, e.g. {"full_address": ("street", "city", ...)}
+- select_related() only for the relations those columns and FK expansions need
+- prefetch_related() for expanded reverse relations: one extra query per
+  expansion, whatever the page size
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from booking_app.serializers.values import ordering_columns
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+@dataclass(frozen=True)
+class Expansion:
+    """
+    A relation embedded with ?expand=<name>.
+
+    - serializer: dotted path of the nested serializer (lazy: no import cycles)
+    - source: attribute holding the related object(s) (FK name or Prefetch to_attr)
+    - select_related: FK to join; prefetch: callable returning a Prefetch (many=True)
+    """
+
+    serializer: str
+    source: str
+    many: bool = False
+    select_related: str = None
+    prefetch: object = None
+
+    def build_field(self, name):
+        kwargs = {"source": self.source} if self.source != name else {}  # DRF запрещает source == имя поля
+        return import_string(self.serializer)(many=self.many, read_only=True, **kwargs)
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    fields: tuple = None  # None = все поля сериализатора
+    expand: tuple = ()
+
+    @property
+    def cache_key(self) -> str:
+        return f"{','.join(self.fields or ('*',))};{','.join(self.expand)}"
+
+    def params(self):
+        """
+        Normalized query parameters (response cache keys).
+        """
+        params = []
+        if self.fields is not None:
+            params.append((FIELDS_PARAM, ",".join(self.fields)))
+        if self.expand:
+            params.append((EXPAND_PARAM, ",".join(self.expand)))
+        return params
+
+    def extra_queries(self, serializer_class) -> int:
+        """
+        Queries added by the expansions (one per prefetched relation).
+        """
+        expandable = getattr(serializer_class, "expandable", {})
+        return sum(1 for name in self.expand if expandable[name].prefetch is not None)
+
+    def plan(self, queryset, serializer_class):
+        """
+        The queryset with only() / select_related() / prefetch_related() for this fieldset.
+        """
+        expandable = getattr(serializer_class, "expandable", {})
+        expansions = [expandable[name] for name in self.expand]
+
+        columns = self.columns(serializer_class, queryset)
+        if columns is not None:
+            expanded = {expansion.select_related for expansion in expansions if expansion.select_related}
+            # развёрнутая связь загружается целиком ("owner" в only(), без "owner__email")
+            columns = {column for column in columns if column.split("__", 1)[0] not in expanded} | expanded
+            # связь, из которой нужны отдельные колонки, тоже присоединяется
+            joins = expanded | {column.rsplit("__", 1)[0] for column in columns if "__" in column}
+            queryset = queryset.select_related(None)
+            if joins:
+                queryset = queryset.select_related(*sorted(joins))
+            queryset = queryset.only(*sorted(columns))
+        else:
+            joins = [expansion.select_related for expansion in expansions if expansion.select_related]
+            if joins:
+                queryset = queryset.select_related(*joins)
+
+        prefetches = [expansion.prefetch() for expansion in expansions if expansion.prefetch is not None]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def columns(self, serializer_class, queryset):
+        """
+        Model columns/lookups the selected fields read, or None if some field
+        can't be mapped (then all columns are loaded).
+        """
+        if self.fields is None:
+            return None
+        fields = serializer_fields(serializer_class)
+        expanded = set(self.expand)
+        model = queryset.model
+        columns = {model._meta.pk.name, *ordering_columns(queryset)}
+        for name in self.fields:
+            if name in expanded:
+                continue  # значение даст развёрнутая связь
+            lookups = field_columns(serializer_class, model, name, fields[name])
+            if lookups is None:
+                return None
+            columns.update(lookups)
+        return columns
+
+
+def field_columns(serializer_class, model, name, field):
+    """
+    Lookups one serializer field reads: `field_columns`, `values_fields`
+    or its source resolved on the model; None if unknown.
+    """
+    declared = getattr(serializer_class, "field_columns", {})
+    if name in declared:
+        return tuple(declared[name])
+    values_fields = getattr(serializer_class, "values_fields", {})
+    if name in values_fields:
+        return tuple(values_fields[name][0])
+
+    if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField,
+                          serializers.SerializerMethodField)) or field.source == "*":
+        return None
+
+    opts = model._meta
+    attrs = field.source_attrs
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = opts.get_field(attr)
+        except FieldDoesNotExist:
+            return None  # property / method
+        if not model_field.concrete:
+            return None
+        last = index == len(attrs) - 1
+        if model_field.is_relation and not last:
+            opts = model_field.related_model._meta
+        elif model_field.is_relation and index:
+            return None  # FK связанной модели
+    return ("__".join(attrs),)
+
+
+@lru_cache(maxsize=None)
+def serializer_fields(serializer_class):
+    """
+    Readable fields of a serializer class (without the fieldset applied).
+    """
+    return {
+        name: field for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+
+
+def _split(value):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def parse_fieldset(query_params, serializer_class):
+    """
+    Fieldset from ?fields= / ?expand=, or None if neither is given.
+    Unknown names -> ValidationError (400) listing the allowed ones.
+    """
+    raw_fields = query_params.get(FIELDS_PARAM)
+    raw_expand = query_params.get(EXPAND_PARAM)
+    if not raw_fields and not raw_expand:
+        return None
+
+    available = serializer_fields(serializer_class)
+    expandable = getattr(serializer_class, "expandable", {})
+    errors = {}
+
+    fields = None
+    if raw_fields:
+        requested = _split(raw_fields)
+        unknown = [name for name in requested if name not in available and name not in expandable]
+        if unknown:
+            errors[FIELDS_PARAM] = [
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."
+            ]
+        # порядок ключей — как в сериализаторе
+        fields = tuple(name for name in available if name in requested)
+
+    expand = ()
+    if raw_expand:
+        requested = _split(raw_expand)
+        unknown = [name for name in requested if name not in expandable]
+        if unknown:
+            errors[EXPAND_PARAM] = [
+                f"Unknown expansion(s): {', '.join(unknown)}. "
+                f"Available: {', '.join(expandable) or 'none'}."
+            ]
+        expand = tuple(name for name in expandable if name in requested)
+
+    if errors:
+        raise ValidationError(errors)
+    return Fieldset(fields=fields, expand=expand)
+
+
+class FieldsetSerializerMixin:
+    """
+    Applies context["fieldset"] to the top-level serializer: drops fields not in
+    ?fields= and adds/replaces the ?expand= relations with nested serializers.
+    """
+
+    expandable = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get("fieldset")
+        if fieldset is None or not self._is_top_level():
+            return fields
+
+        if fieldset.fields is not None:
+            fields = {name: field for name, field in fields.items() if name in fieldset.fields}
+        for name in fieldset.expand:
+            fields[name] = self.expandable[name].build_field(name)
+        return fields
+
+    def _is_top_level(self):
+        # вложенные сериализаторы (в т.ч. развёрнутые связи) fieldset не применяют
+        serializer = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        return serializer.parent is None
@@ -1,11 +1,36 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
-from booking_app.models import Listing
+from booking_app.models import Listing, Review
+from booking_app.serializers.fieldsets import Expansion, FieldsetSerializerMixin
 
+# ?expand=reviews: сколько последних отзывов встраивать
+EXPANDED_REVIEWS = 5
 
-class ListingListSerializer(serializers.ModelSerializer):
+
+def recent_reviews_prefetch():
+    # один запрос на страницу: последние EXPANDED_REVIEWS отзывов каждого объявления
+    return Prefetch(
+        "reviews",
+        queryset=Review.objects.select_related("author").order_by("-created_at", "-id")[:EXPANDED_REVIEWS],
+        to_attr="recent_reviews",
+    )
+
+
+LISTING_EXPANSIONS = {
+    "owner": Expansion(
+        "booking_app.serializers.user.UserPublicSerializer", source="owner", select_related="owner",
+    ),
+    "reviews": Expansion(
+        "booking_app.serializers.review.ListingReviewSerializer", source="recent_reviews",
+        many=True, prefetch=recent_reviews_prefetch,
+    ),
+}
+
+
+class ListingListSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Short listing data for list endpoints."""
-    #  брать поле average_rating с объекта (Имя поля = имя аннотации)
+    # хранимые агрегаты Listing (только чтение)
     average_rating = serializers.ReadOnlyField()
     review_count = serializers.ReadOnlyField()
 
@@ -22,7 +47,10 @@ class ListingListSerializer(serializers.ModelSerializer):
             "review_count",
         ]
 
-class ListingDetailSerializer(serializers.ModelSerializer):
+    expandable = LISTING_EXPANSIONS
+
+
+class ListingDetailSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Full listing data for detail endpoints."""
     #  брать поле email с объекта (Имя поля ≠ имя атрибута)
     owner = serializers.ReadOnlyField(source="owner.email")
@@ -30,9 +58,15 @@ class ListingDetailSerializer(serializers.ModelSerializer):
     average_rating = serializers.ReadOnlyField()
     review_count = serializers.ReadOnlyField()
 
+    expandable = LISTING_EXPANSIONS
+    # колонки свойств для ?fields= (only() в serializers/fieldsets.py)
+    field_columns = {
+        "full_address": ("street", "house_number", "house_suffix", "postal_code", "city"),
+    }
+
     class Meta:
         model = Listing
-        fields = "__all__"
+        exclude = ["rating_sum", "geo_cell"]
         read_only_fields = [
             "id",
             "owner",
@@ -40,3 +74,55 @@ class ListingDetailSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+
+    def validate(self, attrs):
+        """
+        Coordinates go together; without them the postal code centroid is used
+        (also after a postal code change).
+        """
+        has_lat, has_lon = "latitude" in attrs, "longitude" in attrs
+        if has_lat != has_lon or (attrs.get("latitude") is None) != (attrs.get("longitude") is None):
+            raise serializers.ValidationError(
+                {"latitude": "Latitude and longitude must be provided together."}
+            )
+        postal_code_changed = (
+            self.instance is not None
+            and "postal_code" in attrs
+            and attrs["postal_code"] != self.instance.postal_code
+        )
+        if postal_code_changed and not has_lat:
+            # Listing.save() подставит центроид нового индекса
+            attrs["latitude"] = attrs["longitude"] = None
+        return attrs
+
+
+class ListingImportSerializer(ListingDetailSerializer):
+    """
+    Rules of ListingDetailSerializer for `manage.py import_listings`, without the
+    per-row unique address query (the import checks addresses batch by batch).
+    """
+
+    class Meta(ListingDetailSerializer.Meta):
+        validators = []
+
+
+class ListingMonthStatsSerializer(serializers.Serializer):
+    """One month of the owner dashboard (services/owner_stats.py)."""
+
+    month = serializers.CharField()
+    confirmed_nights = serializers.IntegerField()
+    occupancy_rate = serializers.FloatField()
+    confirmed_revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    bookings = serializers.IntegerField()
+    cancellations = serializers.IntegerField()
+    cancellation_rate = serializers.FloatField(allow_null=True)
+    review_count = serializers.IntegerField()
+    average_rating = serializers.FloatField(allow_null=True)
+
+
+class ListingStatsSerializer(serializers.Serializer):
+    """Owner dashboard of one listing: months that have bookings or reviews."""
+
+    listing = serializers.IntegerField()
+    title = serializers.CharField()
+    months = ListingMonthStatsSerializer(many=True)
@@ -3,6 +3,7 @@ from datetime import date
 from rest_framework import serializers
 
 from booking_app.models import Review, Booking, BookingStatus
+from booking_app.serializers.fieldsets import Expansion, FieldsetSerializerMixin
 
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
@@ -32,14 +33,41 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class ReviewListSerializer(serializers.ModelSerializer):
+def full_name(first_name, last_name):
+    """Same as AbstractUser.get_full_name(), from values() columns."""
+    return f"{first_name} {last_name}".strip()
+
+
+class ReviewListSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Reviews for listing detail page."""
     #author_name = serializers.ReadOnlyField(source='author.first_name')
     # get_full_name() возвращает "First Name Last Name", а если оба пустые — возвращает username.
     author_name = serializers.ReadOnlyField(source='author.get_full_name')
     listing_title = serializers.ReadOnlyField(source='listing.title')
 
+    # быстрый путь списков (serializers/values.py): author_name из колонок автора
+    values_fields = {
+        "author_name": (("author__first_name", "author__last_name"), full_name),
+    }
+
+    expandable = {
+        "listing": Expansion(
+            "booking_app.serializers.listing.ListingListSerializer", source="listing", select_related="listing",
+        ),
+        "author": Expansion(
+            "booking_app.serializers.user.UserPublicSerializer", source="author", select_related="author",
+        ),
+    }
+
     class Meta:
         model = Review
         fields = ['id', 'author_name', 'rating', 'comment', 'created_at', 'updated_at', 'listing_title']
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+
+class ListingReviewSerializer(ReviewListSerializer):
+    """Reviews embedded in a listing (?expand=reviews): without the listing title."""
+
+    class Meta(ReviewListSerializer.Meta):
+        fields = ['id', 'author_name', 'rating', 'comment', 'created_at', 'updated_at']
+        read_only_fields = fields
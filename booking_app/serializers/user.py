@@ -30,4 +30,12 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'role']
-        read_only_fields = ['id', 'email', 'role']
\ No newline at end of file
+        read_only_fields = ['id', 'email', 'role']
+
+class UserPublicSerializer(serializers.ModelSerializer):
+    """Public user data embedded in other resources (?expand=owner/guest/author)."""
+
+    class Meta:
+        model = User
+        fields = ['id', 'first_name', 'last_name']
+        read_only_fields = fields
@@ -0,0 +1,134 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class UnsupportedField(Exception):
+    """
+    A serializer field values() rows can't produce (the view falls back to serializer.data).
+    """
+
+
+class ValuesPlan:
+    """
+    Renders a list serializer's output straight from queryset.values() rows.
+
+    Only the output columns are fetched (no model instances, no wide columns
+    like description) and every value goes through the serializer field's own
+    to_representation(), so the JSON is the same as serializer.data.
+
+    Supported fields: model fields, also across non-null FKs ("listing.title"),
+    plus computed fields declared on the serializer:
+
+        values_fields = {"author_name": (("author__first_name", "author__last_name"), full_name)}
+
+    `fields` limits the plan to these output fields (?fields=, serializers/fieldsets.py).
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        overrides = getattr(serializer_class, "values_fields", {})
+
+        self.model = model
+        self.columns = []  # (field_name, field, lookups, compute)
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if name in overrides:
+                lookups, compute = overrides[name]
+                self.columns.append((name, field, tuple(lookups), compute))
+            else:
+                self.columns.append((name, field, (self.resolve_lookup(model, field),), None))
+
+        self.lookups = list(dict.fromkeys(
+            lookup for _name, _field, lookups, _compute in self.columns for lookup in lookups
+        ))
+
+    @staticmethod
+    def resolve_lookup(model, field) -> str:
+        """
+        "listing.title" -> "listing__title"; UnsupportedField if values() can't produce it.
+        """
+        if isinstance(field, (serializers.BaseSerializer, serializers.RelatedField,
+                              serializers.ManyRelatedField, serializers.SerializerMethodField)):
+            raise UnsupportedField(field)
+        if field.source == "*":
+            raise UnsupportedField(field)
+
+        opts = model._meta
+        attrs = field.source_attrs
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = opts.get_field(attr)
+            except FieldDoesNotExist:
+                raise UnsupportedField(field)  # property / method
+            last = index == len(attrs) - 1
+            if not model_field.concrete:
+                raise UnsupportedField(field)
+            if model_field.is_relation:
+                # null FK: DRF отдал бы None/SkipField — оставляем обычный путь
+                if last or model_field.null:
+                    raise UnsupportedField(field)
+                opts = model_field.related_model._meta
+        return "__".join(attrs)
+
+    def values(self, queryset):
+        """
+        queryset.values() with the output columns + ordering columns
+        (keyset pagination reads its key from the rows).
+        """
+        extra = [self.model._meta.pk.attname, *ordering_columns(queryset)]
+        return queryset.values(*dict.fromkeys([*self.lookups, *extra]))
+
+    def render(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, field, lookups, compute in self.columns:
+                if compute is None:
+                    value = row[lookups[0]]
+                else:
+                    value = compute(*(row[lookup] for lookup in lookups))
+                # как Serializer.to_representation(): None не проходит через поле
+                item[name] = None if value is None else field.to_representation(value)
+            data.append(item)
+        return data
+
+
+def ordering_columns(queryset):
+    """
+    Concrete columns of the queryset ordering (keyset pagination reads its key from the rows).
+    """
+    query = queryset.query
+    ordering = list(query.order_by)
+    if not ordering and query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+
+    opts = queryset.model._meta
+    columns = []
+    for item in ordering:
+        if not isinstance(item, str):
+            continue
+        name = item.lstrip("-")
+        name = opts.pk.attname if name == "pk" else name
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue  # аннотация (relevance) и т.п.
+        if model_field.concrete and not model_field.is_relation:
+            columns.append(model_field.attname)
+    return columns
+
+
+@lru_cache(maxsize=None)
+def values_plan(serializer_class, fields=None):
+    """
+    Cached ValuesPlan for a serializer class (and a ?fields= tuple), or None
+    if some field isn't supported.
+    """
+    try:
+        return ValuesPlan(serializer_class, fields)
+    except UnsupportedField:
+        return None
@@ -0,0 +1,118 @@
+"""
+Streaming export of owner bookings: GET /bookings/owner/?format=csv|ndjson.
+
+The body is produced chunk by chunk while the response is sent
+(StreamingHttpResponse): every chunk is one keyset query
+"WHERE (check_in, id) < last row ORDER BY check_in DESC, id DESC LIMIT n"
+over values() joined with the listing and the guest. No OFFSET, no model
+instances, no long-lived server-side cursor: memory stays flat and each
+query is short whatever the size of the export (mysqlclient buffers the
+whole result of a single query, so one big iterator() would not be).
+"""
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+# колонка -> поле values() (None = вычисляется в export_row)
+COLUMNS = {
+    "id": "id",
+    "listing_id": "listing_id",
+    "listing_title": "listing__title",
+    "listing_city": "listing__city",
+    "guest_id": "guest_id",
+    "guest_email": "guest__email",
+    "guest_first_name": "guest__first_name",
+    "guest_last_name": "guest__last_name",
+    "check_in": "check_in",
+    "check_out": "check_out",
+    "nights": None,
+    "guests_count": "guests_count",
+    "status": "status",
+    "price_per_night": "listing__price_per_night",
+    "total_price": None,
+    "created_at": "created_at",
+}
+
+# ячейки, которые Excel/LibreOffice исполняют как формулу (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_row(values):
+    """
+    One export row from a values() dict; nights/total_price as Booking.nights/total_price.
+    """
+    nights = max((values["check_out"] - values["check_in"]).days, 0)
+    price = values["listing__price_per_night"]
+    row = {column: values[source] for column, source in COLUMNS.items() if source is not None}
+    row["nights"] = nights
+    row["total_price"] = Decimal(nights) * price if price is not None else Decimal("0.00")
+    row["created_at"] = timezone.localtime(row["created_at"]) if row["created_at"] else None
+    return {column: row[column] for column in COLUMNS}
+
+
+def iter_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Export rows of the (filtered) booking queryset, newest check-in first,
+    as lists of up to chunk_size rows — one query per list.
+    """
+    queryset = queryset.order_by("-check_in", "-id").values(
+        *(source for source in COLUMNS.values() if source is not None)
+    )
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None:
+            check_in, pk = last
+            chunk = chunk.filter(Q(check_in__lt=check_in) | Q(check_in=check_in, id__lt=pk))
+        rows = list(chunk[:chunk_size])
+        if rows:
+            yield [export_row(values) for values in rows]
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]["check_in"], rows[-1]["id"]
+
+
+def csv_cell(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset, chunk_size=CHUNK_SIZE):
+    """
+    CSV with a header row, one string per chunk.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    yield buffer.getvalue()
+    for rows in iter_chunks(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([csv_cell(value) for value in row.values()] for row in rows)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Newline-delimited JSON: one object per booking, one string per chunk.
+    """
+    for rows in iter_chunks(queryset, chunk_size):
+        yield "".join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in rows)
+
+
+EXPORT_FORMATS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
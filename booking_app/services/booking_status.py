@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.utils import timezone
+
+from booking_app.choices import BookingStatus
+from booking_app.models import Booking, Listing, User
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"
+INVALID_TRANSITION = "invalid_transition"
+
+# брони за одну транзакцию в reject_pending_bookings()
+REJECT_BATCH_SIZE = 200
+
+
+def bulk_set_status(owner, booking_ids, new_status):
+    """
+    Move many bookings of `owner`'s listings to `new_status`.
+
+    - ownership: one query for all ids
+    - transitions not allowed by BOOKING_STATUS_TRANSITIONS are reported, not applied
+      (none of them reactivates a booking, so no overlap check is needed)
+    - BookingQuerySet.transition(): one UPDATE per current status + batch history insert
+
+    Returns {booking_id: result} with result in
+    UPDATED/UNCHANGED/NOT_FOUND/CONFLICT/INVALID_TRANSITION.
+    """
+    booking_ids = list(dict.fromkeys(booking_ids))
+    results = {booking_id: NOT_FOUND for booking_id in booking_ids}
+
+    with transaction.atomic():
+        rows = list(
+            Booking.objects.filter(pk__in=booking_ids, listing__owner=owner)
+            .values("id", "status")
+        )
+
+        to_move = []
+        for row in rows:
+            if row["status"] == new_status:
+                results[row["id"]] = UNCHANGED
+            elif not Booking.can_transition(row["status"], new_status):
+                results[row["id"]] = INVALID_TRANSITION
+            else:
+                to_move.append(row["id"])
+
+        if to_move:
+            moved = set(Booking.objects.filter(pk__in=to_move).transition(new_status, changed_by=owner))
+            for booking_id in to_move:
+                # не перешла — статус успели поменять параллельно
+                results[booking_id] = UPDATED if booking_id in moved else CONFLICT
+
+    return results
+
+
+def reject_pending_bookings(listing_id, changed_by_id=None, batch_size=REJECT_BATCH_SIZE):
+    """
+    Job of POST /listings/{id}/toggle-active/ (deactivation): reject the
+    pending future bookings of the listing, batch_size per transaction, so
+    no single UPDATE holds locks on all of them. Stops if the listing is
+    active again. Idempotent: a rerun finds only what is still pending.
+
+    Returns the number of rejected bookings.
+    """
+    changed_by = User.objects.filter(pk=changed_by_id).first() if changed_by_id else None
+    pending = Booking.objects.filter(
+        listing_id=listing_id,
+        status=BookingStatus.PENDING,
+        check_in__gt=timezone.now().date(),  # только будущие заезды
+    ).order_by("pk")
+
+    rejected = 0
+    while not Listing.objects.filter(pk=listing_id, is_active=True).exists():
+        pks = list(pending.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        # пакетный переход pending -> rejected + история статусов
+        rejected += len(Booking.objects.filter(pk__in=pks).transition(BookingStatus.REJECTED, changed_by=changed_by))
+    return rejected
@@ -0,0 +1,111 @@
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+
+from booking_app.db.replicas import use_primary
+from booking_app.models import Booking
+
+CALENDAR_MAX_NIGHTS = 366
+CALENDAR_DEFAULT_NIGHTS = 90
+CALENDAR_CACHE_TIMEOUT = 60 * 60  # 1h, invalidation is explicit anyway
+
+FREE = "free"
+BOOKED = "booked"
+
+
+def _version_key(listing_id) -> str:
+    return f"listing-calendar:{listing_id}:version"
+
+
+def get_calendar_version(listing_id) -> int:
+    """
+    Current cache version of a listing calendar.
+    A new version makes all cached ranges of this listing unreachable.
+    """
+    version = cache.get(_version_key(listing_id))
+    if version is None:
+        version = time.time_ns()
+        cache.add(_version_key(listing_id), version, None)
+        version = cache.get(_version_key(listing_id), version)
+    return version
+
+
+def invalidate_listing_calendar(*listing_ids):
+    """
+    Drop cached calendars of the given listings after the current transaction
+    commits (so a concurrent reader can't re-cache uncommitted state).
+    """
+    def bump():
+        for listing_id in set(listing_ids):
+            if listing_id is not None:
+                # time_ns, а не incr: после вытеснения ключа версия не повторится
+                cache.set(_version_key(listing_id), time.time_ns(), None)
+
+    transaction.on_commit(bump)
+
+
+def encode_runs(nights):
+    """
+    Run-length encode a list of booleans (True = booked):
+    [F, F, T, T, T, F] -> [["free", 2], ["booked", 3], ["free", 1]]
+    """
+    runs = []
+    for booked in nights:
+        state = BOOKED if booked else FREE
+        if runs and runs[-1][0] == state:
+            runs[-1][1] += 1
+        else:
+            runs.append([state, 1])
+    return runs
+
+
+def build_calendar(listing_id, date_from, date_to) -> dict:
+    """
+    Booked/free nights of a listing for [date_from, date_to).
+    Night D is booked if an active booking has check_in <= D < check_out.
+    """
+    total = (date_to - date_from).days
+    nights = [False] * total
+
+    stays = Booking.objects.filter(
+        listing_id=listing_id,
+    ).active().overlapping(date_from, date_to).values_list("check_in", "check_out")
+
+    for check_in, check_out in stays:
+        start = max((check_in - date_from).days, 0)
+        end = min((check_out - date_from).days, total)
+        for index in range(start, end):
+            nights[index] = True
+
+    return {
+        "listing": listing_id,
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "nights": total,
+        "booked_nights": sum(nights),
+        "encoding": "rle",
+        "runs": encode_runs(nights),
+    }
+
+
+def get_listing_calendar(listing_id, date_from, date_to) -> dict:
+    """
+    Cached build_calendar(), keyed by listing version and date range.
+    """
+    key = (
+        f"listing-calendar:{listing_id}:{get_calendar_version(listing_id)}:"
+        f"{date_from.isoformat()}:{date_to.isoformat()}"
+    )
+    data = cache.get(key)
+    if data is None:
+        # кэшируется под текущей версией — не с отстающей реплики
+        with use_primary():
+            data = build_calendar(listing_id, date_from, date_to)
+        cache.set(key, data, CALENDAR_CACHE_TIMEOUT)
+    return data
+
+
+def default_range(today):
+    return today, today + timedelta(days=CALENDAR_DEFAULT_NIGHTS)
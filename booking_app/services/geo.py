@@ -0,0 +1,139 @@
+"""
+Proximity search for listings.
+
+Coordinates come from a local postal-code centroid table
+(booking_app/data/postal_code_centroids.csv, no network): exact 5-digit
+codes where known, otherwise the 2-digit postal region. The file can be
+replaced by a full dataset in the same format (postal_code,latitude,longitude,place).
+
+Every listing also stores geo_cell, a 0.1° x 0.1° grid cell number
+(row * GRID_COLUMNS + column). Cells of one grid row are consecutive
+integers, so a bounding box is a handful of indexed range scans:
+
+    geo_cell BETWEEN row*3600 + col_min AND row*3600 + col_max   (per row)
+
+followed by the exact bounding box and the haversine distance in SQL.
+"""
+import csv
+import math
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+CENTROIDS_FILE = Path(__file__).resolve().parent.parent / "data" / "postal_code_centroids.csv"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32  # длина градуса широты (и долготы на экваторе)
+
+CELL_DEGREES = 0.1
+GRID_ROWS = round(180 / CELL_DEGREES)
+GRID_COLUMNS = round(360 / CELL_DEGREES)
+
+MAX_RADIUS_KM = 200
+DEFAULT_RADIUS_KM = 10
+
+
+@lru_cache(maxsize=1)
+def load_centroids() -> dict:
+    """
+    postal code (or prefix) -> (latitude, longitude), read once per process.
+    """
+    with open(CENTROIDS_FILE, newline="", encoding="utf-8") as fh:
+        return {
+            row["postal_code"].strip(): (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(fh)
+        }
+
+
+def postal_code_centroid(postal_code):
+    """
+    (latitude, longitude) of the longest matching code in the centroid table, or None.
+    """
+    code = (postal_code or "").strip()
+    centroids = load_centroids()
+    for length in range(len(code), 1, -1):
+        point = centroids.get(code[:length])
+        if point is not None:
+            return point
+    return None
+
+
+def _row(latitude) -> int:
+    return min(max(math.floor((latitude + 90) / CELL_DEGREES), 0), GRID_ROWS - 1)
+
+
+def _column(longitude) -> int:
+    return math.floor((longitude + 180) / CELL_DEGREES) % GRID_COLUMNS
+
+
+def grid_cell(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return _row(latitude) * GRID_COLUMNS + _column(longitude)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (lat_min, lat_max, lon_min, lon_max) around the point; lon bounds are None
+    when the box reaches a pole or crosses the antimeridian (no longitude pruning).
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = latitude - delta_lat, latitude + delta_lat
+    if lat_min <= -90 or lat_max >= 90:
+        return max(lat_min, -90), min(lat_max, 90), None, None
+
+    # самая «узкая» широта бокса даёт самый широкий по долготе охват
+    widest = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    delta_lon = radius_km / (KM_PER_DEGREE * widest)
+    lon_min, lon_max = longitude - delta_lon, longitude + delta_lon
+    if lon_min < -180 or lon_max >= 180:
+        return lat_min, lat_max, None, None
+    return lat_min, lat_max, lon_min, lon_max
+
+
+def near_q(latitude, longitude, radius_km) -> Q:
+    """
+    Indexed pre-filter: grid cell ranges per row + the exact bounding box.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(latitude, longitude, radius_km)
+
+    if lon_min is None:
+        col_min, col_max = 0, GRID_COLUMNS - 1
+    else:
+        col_min, col_max = _column(lon_min), _column(lon_max)
+
+    cells = Q()
+    for row in range(_row(lat_min), _row(lat_max) + 1):
+        base = row * GRID_COLUMNS
+        cells |= Q(geo_cell__range=(base + col_min, base + col_max))
+
+    box = Q(latitude__range=(lat_min, lat_max))
+    if lon_min is not None:
+        box &= Q(longitude__range=(lon_min, lon_max))
+    return cells & box
+
+
+def distance_km(latitude, longitude):
+    """
+    Haversine distance (km) from the point to each row, as an ORM expression.
+    The trigonometric functions are native on MySQL and registered by Django on SQLite.
+    """
+    lat1 = math.radians(latitude)
+    lat2 = Radians(F("latitude"))
+    half_dlat = (lat2 - Value(lat1)) / 2
+    half_dlon = (Radians(F("longitude")) - Value(math.radians(longitude))) / 2
+    a = Power(Sin(half_dlat), 2) + Value(math.cos(lat1)) * Cos(lat2) * Power(Sin(half_dlon), 2)
+    return ExpressionWrapper(2 * EARTH_RADIUS_KM * ASin(Sqrt(a)), output_field=FloatField())
+
+
+def parse_point(value):
+    """
+    "52.52,13.40" -> (52.52, 13.40); ValueError if malformed or out of range.
+    """
+    lat_text, lon_text = value.split(",")
+    latitude, longitude = float(lat_text), float(lon_text)
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(value)
+    return latitude, longitude
@@ -0,0 +1,192 @@
+"""
+Background jobs stored in the main database (Job model), run by
+`manage.py run_worker`.
+
+enqueue() inserts the job in the caller's transaction: a worker sees it only
+after the request commits, and a rolled back request leaves no job behind.
+The view returns without waiting for the work.
+
+Workers claim due jobs in batches: the candidates are selected with
+SELECT ... FOR UPDATE SKIP LOCKED where the backend supports it (MySQL 8,
+PostgreSQL), so parallel workers don't wait on each other's rows, and taken
+with a conditional UPDATE (only while still due). On SQLite, which has no
+row locks, that UPDATE alone decides which worker gets a job.
+
+A failed job is retried with exponential backoff (JOBS_RETRY_BACKOFF *
+2**(attempt-1) seconds, capped by JOBS_RETRY_BACKOFF_MAX, plus jitter) until
+max_attempts, then stays FAILED with the traceback. A RUNNING job whose
+worker died is claimed again after JOBS_LOCK_TIMEOUT: handlers must be
+idempotent.
+
+JOBS_EAGER runs each job in the request right after the commit (tests,
+development without a worker), outside the view's query budget.
+"""
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from booking_app.choices import JobStatus
+from booking_app.models import Job
+from booking_app.query_budget import unbudgeted
+
+logger = logging.getLogger("booking_app.jobs")
+
+# имена задач
+REJECT_PENDING_BOOKINGS = "reject_pending_bookings"
+
+# имя -> обработчик (dotted path), аргументы — payload задачи
+JOB_HANDLERS = {
+    REJECT_PENDING_BOOKINGS: "booking_app.services.booking_status.reject_pending_bookings",
+}
+
+# сколько символов traceback хранить в Job.last_error
+ERROR_MAX_LENGTH = 10000
+
+
+def default_max_attempts() -> int:
+    return getattr(settings, "JOBS_MAX_ATTEMPTS", 5)
+
+
+def lock_timeout() -> timedelta:
+    return timedelta(seconds=getattr(settings, "JOBS_LOCK_TIMEOUT", 600))
+
+
+def retry_delay(attempt) -> timedelta:
+    """
+    Pause before retry number `attempt` (1-based): exponential, capped, with up to 10% jitter.
+    """
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 10)
+    cap = getattr(settings, "JOBS_RETRY_BACKOFF_MAX", 3600)
+    delay = min(base * 2 ** (attempt - 1), cap)
+    # разброс: задачи, упавшие вместе, не повторяются одновременно
+    return timedelta(seconds=delay * random.uniform(1.0, 1.1))
+
+
+def enqueue(name, *, delay=0, max_attempts=None, **payload):
+    """
+    Create a job `name` with `payload` (JSON-serializable keyword arguments
+    of its handler), due after `delay` seconds. Returns the Job.
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    job = Job.objects.create(
+        name=name,
+        payload=payload,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or default_max_attempts(),
+    )
+    if getattr(settings, "JOBS_EAGER", False):
+        transaction.on_commit(partial(run_eagerly, job.pk), using=job._state.db)
+    return job
+
+
+def run_eagerly(job_id):
+    # работа воркера, не запроса: не в бюджет запросов вьюхи
+    with unbudgeted():
+        Worker(name="eager").run_batch(ids=[job_id])
+
+
+def default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Worker:
+    """
+    Claims and runs due jobs: run_batch() takes up to batch_size of them.
+    """
+
+    def __init__(self, name=None, batch_size=10):
+        self.name = (name or default_worker_name())[:100]
+        self.batch_size = batch_size
+        self.using = router.db_for_write(Job)  # всегда primary
+
+    def due(self, now):
+        return Q(status=JobStatus.PENDING, run_at__lte=now) | Q(
+            status=JobStatus.RUNNING, locked_at__lt=now - lock_timeout(),
+        )
+
+    def claim(self, ids=None):
+        """
+        Take up to batch_size due jobs (oldest run_at first) for this worker.
+        """
+        now = timezone.now()
+        jobs = Job.objects.using(self.using)
+        with transaction.atomic(using=self.using):
+            candidates = jobs.filter(self.due(now))
+            if ids is not None:
+                candidates = candidates.filter(pk__in=ids)
+            if connections[self.using].features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            pks = list(candidates.order_by("run_at", "pk").values_list("pk", flat=True)[:self.batch_size])
+            if not pks:
+                return []
+            # условие due() ещё раз: без блокировок строк (SQLite) задачу получит один воркер
+            jobs.filter(self.due(now), pk__in=pks).update(
+                status=JobStatus.RUNNING,
+                locked_by=self.name,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+            )
+        return list(jobs.filter(pk__in=pks, locked_by=self.name, locked_at=now).order_by("run_at", "pk"))
+
+    def run(self, job):
+        """
+        Run one claimed job; returns True on success.
+        """
+        try:
+            handler = import_string(JOB_HANDLERS[job.name])
+            result = handler(**job.payload)
+        except Exception:
+            self.fail(job, traceback.format_exc())
+            return False
+
+        self.finish(job, status=JobStatus.DONE, finished_at=timezone.now(), last_error="")
+        logger.info("Job #%s %s done (attempt %s): %s", job.pk, job.name, job.attempts, result)
+        return True
+
+    def fail(self, job, error):
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            self.finish(job, status=JobStatus.FAILED, finished_at=now, last_error=error[-ERROR_MAX_LENGTH:])
+            logger.error("Job #%s %s failed after %s attempt(s):\n%s", job.pk, job.name, job.attempts, error)
+            return
+        run_at = now + retry_delay(job.attempts)
+        self.finish(job, status=JobStatus.PENDING, run_at=run_at, last_error=error[-ERROR_MAX_LENGTH:])
+        logger.warning(
+            "Job #%s %s failed (attempt %s of %s), retry at %s:\n%s",
+            job.pk, job.name, job.attempts, job.max_attempts, run_at.isoformat(), error,
+        )
+
+    def finish(self, job, **fields):
+        # только пока задача за этим воркером (не перехвачена после JOBS_LOCK_TIMEOUT)
+        Job.objects.using(self.using).filter(pk=job.pk, locked_by=self.name, locked_at=job.locked_at).update(
+            locked_by="", locked_at=None, **fields,
+        )
+
+    def run_batch(self, ids=None):
+        """
+        Claim and run one batch; returns the number of jobs taken.
+        """
+        jobs = self.claim(ids)
+        for job in jobs:
+            self.run(job)
+        return len(jobs)
+
+    def purge(self, older_than):
+        """
+        Delete jobs that finished successfully before now - older_than.
+        """
+        deleted, _ = Job.objects.using(self.using).filter(
+            status=JobStatus.DONE, finished_at__lt=timezone.now() - older_than,
+        ).delete()
+        return deleted
@@ -0,0 +1,121 @@
+"""
+Response cache of the anonymous listing search (GET /api/v1/listings/).
+
+Keyed by the normalized query (known parameters only, defaults applied) and a
+global "listings version". Every Listing/Review write bumps the version
+(signals.py), so pages cached before a change are never served after it.
+Availability searches (?check_in=&check_out=) depend on bookings and are
+not cached.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.settings import api_settings
+
+from booking_app.metrics import registry
+
+VERSION_KEY = "listing-search:version"
+HITS_COUNTER = "listing_search_cache_requests_total"
+
+# ответ зависит от броней — такие запросы не кэшируются
+UNCACHED_PARAMS = ("check_in", "check_out")
+
+
+def cache_timeout() -> int:
+    """
+    Seconds a page is kept (LISTING_SEARCH_CACHE_TIMEOUT); 0 disables the cache.
+    """
+    return getattr(settings, "LISTING_SEARCH_CACHE_TIMEOUT", 0)
+
+
+def get_listings_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_listing_search():
+    """
+    Make all cached search pages unreachable after the current transaction commits.
+    """
+    # time_ns, а не incr: после вытеснения ключа версия не повторится
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, time.time_ns(), None))
+
+
+def normalized_params(request, view):
+    """
+    Sorted (name, value) pairs the response depends on, or None if the
+    request must not be cached.
+
+    Unknown parameters are dropped (the view ignores them too), empty values
+    count as absent, and the defaults are filled in: ?ordering= with the
+    view's default ordering, ?page=1, ?pagination=page; ?fields=/?expand=
+    are taken as parsed by the view.
+    """
+    params = request.query_params
+    if any(params.get(name) for name in UNCACHED_PARAMS):
+        return None
+
+    paginator = view.paginator
+    page_param = paginator.page_number.page_query_param
+    cursor_param = paginator.keyset.cursor_query_param
+    known = {
+        *view.filterset_class.base_filters,
+        api_settings.SEARCH_PARAM,
+        api_settings.ORDERING_PARAM,
+        page_param,
+        cursor_param,
+    }
+
+    normalized = {}
+    for name in known:
+        # как во вьюхе: QueryDict.get() берёт последнее значение
+        value = params.get(name)
+        if value not in (None, ""):
+            normalized[name] = value
+
+    # ?fields=/?expand= в каноническом виде (порядок и повторы имён не важны)
+    fieldset = view.get_fieldset()
+    if fieldset is not None:
+        normalized.update(fieldset.params())
+
+    normalized.setdefault(api_settings.ORDERING_PARAM, ",".join(view.ordering))
+    normalized.setdefault(page_param, "1")
+    normalized[paginator.mode_query_param] = (
+        paginator.cursor_mode if paginator.is_cursor_requested(request) else "page"
+    )
+    return sorted(normalized.items())
+
+
+def search_cache_key(request, view):
+    """
+    Cache key of an anonymous search request, or None if it isn't cacheable.
+    The version is read before the query runs: a write committed meanwhile
+    leaves the stored page under the old, already unreachable version.
+    """
+    if not cache_timeout() or request.user.is_authenticated:
+        return None
+    params = normalized_params(request, view)
+    if params is None:
+        return None
+    # next/previous — абсолютные ссылки: схема и хост входят в ключ
+    base = request.build_absolute_uri(request.path)
+    digest = hashlib.sha1(f"{base}?{urlencode(params)}".encode()).hexdigest()
+    return f"listing-search:{get_listings_version()}:{digest}"
+
+
+def get_cached_search(key):
+    data = cache.get(key)
+    registry.increment(HITS_COUNTER, "miss" if data is None else "hit")
+    return data
+
+
+def cache_search(key, data):
+    cache.set(key, data, cache_timeout())
@@ -0,0 +1,213 @@
+"""
+Bulk import of listings (manage.py import_listings).
+
+Rows are streamed from a CSV or JSONL file and validated with the rules of
+ListingDetailSerializer (one serializer instance for the whole file). Valid
+rows are collected into batches; each batch costs one query for the
+addresses already taken (unique_property_by_address) and one bulk INSERT,
+in its own transaction. Memory stays bounded by the batch size: a duplicate
+of a row from an earlier batch is found in the database, since that batch
+is already inserted.
+
+bulk_create() skips signals and Listing.save(): coordinates/geo_cell are
+filled here, and the search cache is invalidated once at the end. New
+listings have no reviews or bookings, so ratings and the stats rollup need
+no update; the FTS5 index follows through its triggers.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, connections, router, transaction
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from booking_app.models import Listing
+from booking_app.serializers.listing import ListingImportSerializer
+from booking_app.services.listing_cache import invalidate_listing_search
+
+# причины отказа (колонка "reason" в отчёте)
+INVALID_ROW = "invalid"
+DUPLICATE_ADDRESS = "duplicate_address"
+DUPLICATE_MESSAGE = "A listing with this address and listing type already exists."
+
+# поля unique_property_by_address
+ADDRESS_FIELDS = ("street", "house_number", "house_suffix", "postal_code", "city", "listing_type")
+
+
+@dataclass
+class Rejected:
+    """
+    A row that was not imported: line number in the file, reason, details, raw data.
+    """
+
+    line: int
+    reason: str
+    errors: object
+    data: object
+
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    created: int = 0
+    rejected: int = 0
+    batches: int = 0
+    reasons: dict = field(default_factory=dict)
+
+
+def read_csv(path):
+    """
+    (line number, row) pairs of a CSV file with a header row.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def read_jsonl(path):
+    """
+    (line number, object) pairs of a JSON Lines file; blank lines are skipped,
+    a line that is not valid JSON is yielded as its text (and rejected).
+    """
+    with open(path, encoding="utf-8-sig") as file:
+        for line_num, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except ValueError:
+                yield line_num, line.rstrip("\n")
+
+
+def csv_row_data(row, fields):
+    """
+    CSV has no null: an empty cell counts as a missing value (model default),
+    except for text fields that accept blank values.
+    """
+    data = {}
+    for name, value in row.items():
+        if name is None:
+            continue  # лишние ячейки без заголовка
+        value = value.strip() if isinstance(value, str) else value
+        if value == "":
+            field_ = fields.get(name)
+            if not (isinstance(field_, serializers.CharField) and field_.allow_blank):
+                continue
+        data[name] = value
+    return data
+
+
+def address_key(listing):
+    # по экземпляру, а не по attrs: пропущенные поля уже со значениями по умолчанию
+    return tuple(getattr(listing, name) or "" for name in ADDRESS_FIELDS)
+
+
+def taken_addresses(keys):
+    """
+    The addresses of `keys` that already exist, with one query (split only
+    by the backend's parameter limit, e.g. 999 on SQLite): a superset is
+    selected by postal code and street, compared here.
+    """
+    keys = sorted(set(keys))
+    using = router.db_for_write(Listing)  # сверка с primary, не с репликой
+    max_params = connections[using].features.max_query_params
+    chunk = max(max_params // 2, 1) if max_params else len(keys) or 1
+
+    taken = set()
+    for start in range(0, len(keys), chunk):
+        part = keys[start:start + chunk]
+        rows = Listing.objects.using(using).filter(
+            postal_code__in={key[3] for key in part},
+            street__in={key[0] for key in part},
+        ).values_list(*ADDRESS_FIELDS)
+        taken.update(tuple(value or "" for value in row) for row in rows)
+    return taken & set(keys)
+
+
+class ListingImporter:
+    """
+    Imports rows for one owner: feed() (line, row) pairs, then finish().
+    Rejected rows are passed to `on_reject` as they are found.
+    """
+
+    def __init__(self, owner, batch_size=500, on_reject=None, csv_rows=False):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.on_reject = on_reject
+        self.csv_rows = csv_rows
+        self.serializer = ListingImportSerializer()
+        self.result = ImportResult()
+        self._batch = []  # [(line, data, validated attrs)]
+
+    def feed(self, line, row):
+        self.result.read += 1
+        if not isinstance(row, dict):
+            message = "Invalid JSON." if isinstance(row, str) else "Expected a JSON object."
+            self.reject(line, INVALID_ROW, {"non_field_errors": [message]}, row)
+            return
+        data = csv_row_data(row, self.serializer.fields) if self.csv_rows else row
+        try:
+            attrs = self.serializer.run_validation(data)
+        except ValidationError as exc:
+            self.reject(line, INVALID_ROW, exc.detail, row)
+            return
+        self._batch.append((line, row, attrs))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def finish(self):
+        self.flush()
+        if self.result.created:
+            # bulk_create без сигналов — сбрасываем кэш поиска явно
+            invalidate_listing_search()
+        return self.result
+
+    def reject(self, line, reason, errors, data):
+        self.result.rejected += 1
+        self.result.reasons[reason] = self.result.reasons.get(reason, 0) + 1
+        if self.on_reject is not None:
+            self.on_reject(Rejected(line, reason, errors, data))
+
+    def flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        self.result.batches += 1
+
+        candidates = [(line, row, Listing(owner=self.owner, **attrs)) for line, row, attrs in batch]
+        taken = taken_addresses([address_key(listing) for _line, _row, listing in candidates])
+        listings = []
+        for line, row, listing in candidates:
+            key = address_key(listing)
+            if key in taken:
+                self.reject(line, DUPLICATE_ADDRESS, {"non_field_errors": [DUPLICATE_MESSAGE]}, row)
+                continue
+            taken.add(key)  # повтор внутри пачки
+            listing.fill_coordinates()  # bulk_create не вызывает save()
+            listings.append((line, row, listing))
+
+        try:
+            with transaction.atomic():
+                Listing.objects.bulk_create([listing for _line, _row, listing in listings])
+            self.result.created += len(listings)
+        except IntegrityError:
+            # адрес занят между проверкой и вставкой (или совпал без учёта регистра в MySQL):
+            # по одной, чтобы отклонить только виноватые строки
+            self._insert_one_by_one(listings)
+
+    def _insert_one_by_one(self, listings):
+        for line, row, listing in listings:
+            listing.pk = None
+            listing._state.adding = True
+            try:
+                with transaction.atomic():
+                    Listing.objects.bulk_create([listing])
+            except IntegrityError as exc:
+                if taken_addresses([address_key(listing)]):
+                    self.reject(line, DUPLICATE_ADDRESS, {"non_field_errors": [DUPLICATE_MESSAGE]}, row)
+                else:
+                    self.reject(line, INVALID_ROW, {"non_field_errors": [str(exc)]}, row)
+            else:
+                self.result.created += 1
@@ -0,0 +1,250 @@
+"""
+Owner dashboard: per listing and month occupancy, confirmed revenue,
+cancellation rate and average rating, read from the ListingMonthlyStats rollup.
+
+Every write that changes a rollup counter is turned into deltas
+{(listing_id, month): Counter} — "new contribution minus old contribution"
+of the booking/review — and applied with one upsert statement
+(INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE counter = counter + delta).
+The rollup can always be rebuilt from bookings and reviews
+(manage.py rebuild_listing_stats), e.g. after raw SQL or bulk updates.
+
+Revenue is not stored: it is confirmed nights x the listing's current
+price_per_night, the same price Booking.total_price uses.
+"""
+import calendar
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from booking_app.choices import BookingStatus
+from booking_app.models import Booking, Listing, ListingMonthlyStats, Review
+
+CANCELLED_STATUSES = (BookingStatus.CANCELLED, BookingStatus.CANCELLED_BY_OWNER)
+# статусы, от которых зависят счётчики (кроме bookings — он не зависит от статуса)
+COUNTED_STATUSES = (BookingStatus.CONFIRMED, *CANCELLED_STATUSES)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def booking_counters(listing_id, check_in, check_out, status):
+    """
+    Rollup contribution of one booking: {(listing_id, month): Counter}.
+    """
+    counters = defaultdict(Counter)
+    if listing_id is None or check_in is None or check_out is None:
+        return counters
+
+    first = (listing_id, month_start(check_in))
+    counters[first]["bookings"] += 1
+    if status in CANCELLED_STATUSES:
+        counters[first]["cancellations"] += 1
+
+    if status == BookingStatus.CONFIRMED:
+        # ночи делятся по месяцам: 30.01–02.02 -> 2 ночи в январе, 1 в феврале
+        month = month_start(check_in)
+        while month < check_out:
+            end = next_month(month)
+            nights = (min(end, check_out) - max(month, check_in)).days
+            if nights > 0:
+                counters[(listing_id, month)]["confirmed_nights"] += nights
+            month = end
+    return counters
+
+
+def review_counters(listing_id, created_at, rating):
+    """
+    Rollup contribution of one review (month of its creation, local time).
+    """
+    counters = defaultdict(Counter)
+    if listing_id is None or created_at is None or rating is None:
+        return counters
+    key = (listing_id, month_start(timezone.localdate(created_at)))
+    counters[key]["rating_sum"] += rating
+    counters[key]["review_count"] += 1
+    return counters
+
+
+def add_counters(total, counters, sign=1):
+    """
+    total += sign * counters, in place; returns total.
+    """
+    for key, values in counters.items():
+        for name, value in values.items():
+            total[key][name] += sign * value
+    return total
+
+
+def booking_delta(old, new):
+    """
+    Deltas between two (listing_id, check_in, check_out, status) states; None = no booking.
+    """
+    deltas = defaultdict(Counter)
+    if new is not None:
+        add_counters(deltas, booking_counters(*new))
+    if old is not None:
+        add_counters(deltas, booking_counters(*old), -1)
+    return deltas
+
+
+def apply_deltas(deltas, using="default"):
+    """
+    Add the deltas to the rollup rows (created on first use) with one
+    upsert statement (split only by the backend's parameter limit, e.g. 142
+    rows on SQLite). Call inside the transaction that writes the booking/review.
+    """
+    rows = [
+        (listing_id, month, [values.get(name, 0) for name in ListingMonthlyStats.COUNTERS])
+        for (listing_id, month), values in deltas.items()
+        if any(values.values())
+    ]
+    if not rows:
+        return 0
+
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(ListingMonthlyStats._meta.db_table)
+    columns = ["listing_id", "month", *ListingMonthlyStats.COUNTERS]
+    if connection.vendor == "mysql":
+        conflict = "ON DUPLICATE KEY UPDATE " + ", ".join(
+            f"{quote(name)} = {quote(name)} + VALUES({quote(name)})" for name in ListingMonthlyStats.COUNTERS
+        )
+    else:
+        # SQLite 3.24+, PostgreSQL
+        conflict = f"ON CONFLICT ({quote('listing_id')}, {quote('month')}) DO UPDATE SET " + ", ".join(
+            f"{quote(name)} = {table}.{quote(name)} + excluded.{quote(name)}"
+            for name in ListingMonthlyStats.COUNTERS
+        )
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    batch_size = max(connection.ops.bulk_batch_size(columns, rows), 1)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            params = []
+            for listing_id, month, values in batch:
+                params.extend([listing_id, connection.ops.adapt_datefield_value(month), *values])
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(quote(name) for name in columns)}) "
+                f"VALUES {', '.join([placeholders] * len(batch))} {conflict}",
+                params,
+            )
+    return len(rows)
+
+
+def apply_status_changes(changes):
+    """
+    booking_status_changed: [(booking_id, listing_id, old_status, new_status), ...].
+    One query for the booking dates + one upsert; nothing for transitions
+    that don't touch the counters (e.g. PENDING -> REJECTED).
+    """
+    changes = [
+        change for change in changes
+        if change[2] in COUNTED_STATUSES or change[3] in COUNTED_STATUSES
+    ]
+    if not changes:
+        return 0
+    dates = {
+        pk: (check_in, check_out)
+        for pk, check_in, check_out in Booking.objects.filter(
+            pk__in=[pk for pk, _listing_id, _old, _new in changes],
+        ).values_list("pk", "check_in", "check_out")
+    }
+    deltas = defaultdict(Counter)
+    for pk, listing_id, old_status, new_status in changes:
+        if pk in dates:
+            old = (listing_id, *dates[pk], old_status)
+            new = (listing_id, *dates[pk], new_status)
+            add_counters(deltas, booking_delta(old, new))
+    return apply_deltas(deltas)
+
+
+def collect_counters(bookings, reviews):
+    """
+    Full rollup from (listing_id, check_in, check_out, status) and
+    (listing_id, created_at, rating) rows.
+    """
+    totals = defaultdict(Counter)
+    for row in bookings:
+        add_counters(totals, booking_counters(*row))
+    for row in reviews:
+        add_counters(totals, review_counters(*row))
+    return totals
+
+
+def rebuild_listing_stats(listing_ids=None, batch_size=1000):
+    """
+    Recompute rollup rows of the given listings (default: all) from bookings
+    and reviews. Returns the number of rows written.
+    """
+    bookings = Booking.objects.order_by()
+    reviews = Review.objects.order_by()
+    stats = ListingMonthlyStats.objects.all()
+    if listing_ids is not None:
+        listing_ids = list(Listing.objects.filter(pk__in=listing_ids).values_list("pk", flat=True))
+        bookings = bookings.filter(listing_id__in=listing_ids)
+        reviews = reviews.filter(listing_id__in=listing_ids)
+        stats = stats.filter(listing_id__in=listing_ids)
+
+    with transaction.atomic():
+        totals = collect_counters(
+            bookings.values_list("listing_id", "check_in", "check_out", "status").iterator(chunk_size=batch_size),
+            reviews.values_list("listing_id", "created_at", "rating").iterator(chunk_size=batch_size),
+        )
+        stats.delete()
+        ListingMonthlyStats.objects.bulk_create(
+            [
+                ListingMonthlyStats(listing_id=listing_id, month=month, **values)
+                for (listing_id, month), values in sorted(totals.items())
+                if any(values.values())
+            ],
+            batch_size=batch_size,
+        )
+    return sum(1 for values in totals.values() if any(values.values()))
+
+
+def _rate(part, whole, digits=4):
+    return round(part / whole, digits) if whole else None
+
+
+def owner_monthly_stats(owner, month_from, month_to):
+    """
+    Dashboard rows of the owner's listings for months in [month_from, month_to],
+    read from the rollup (one query, joined with the listing for title/price).
+    Months without any booking or review have no row.
+    """
+    rows = (
+        ListingMonthlyStats.objects
+        .filter(listing__owner=owner, month__gte=month_from, month__lte=month_to)
+        .order_by("listing_id", "month")
+        .values("listing_id", "listing__title", "listing__price_per_night", "month", *ListingMonthlyStats.COUNTERS)
+    )
+
+    listings = {}
+    for row in rows:
+        listing = listings.setdefault(row["listing_id"], {
+            "listing": row["listing_id"],
+            "title": row["listing__title"],
+            "months": [],
+        })
+        days = calendar.monthrange(row["month"].year, row["month"].month)[1]
+        listing["months"].append({
+            "month": row["month"].strftime("%Y-%m"),
+            "confirmed_nights": row["confirmed_nights"],
+            "occupancy_rate": _rate(row["confirmed_nights"], days),
+            "confirmed_revenue": row["confirmed_nights"] * row["listing__price_per_night"],
+            "bookings": row["bookings"],
+            "cancellations": row["cancellations"],
+            "cancellation_rate": _rate(row["cancellations"], row["bookings"]),
+            "review_count": row["review_count"],
+            "average_rating": _rate(row["rating_sum"], row["review_count"], 2),
+        })
+    return list(listings.values())
@@ -0,0 +1,94 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Q
+from django.utils import timezone
+
+from booking_app.models import Booking, Listing
+
+# причины отказа (ключ "reason" в ответе)
+LISTING_NOT_FOUND = "listing_not_found"
+INVALID_DATES = "invalid_dates"
+CHECK_IN_IN_PAST = "check_in_in_past"
+TOO_MANY_GUESTS = "too_many_guests"
+DATES_UNAVAILABLE = "dates_unavailable"
+
+
+def _occupied_ranges(windows):
+    """
+    {listing_id: [(check_in, check_out), ...]} of active bookings inside
+    each listing's requested window. One query for the whole batch:
+    a (listing, date range) condition per listing, served by booking_listing_avail_idx.
+    """
+    condition = Q()
+    for listing_id, (start, end) in windows.items():
+        condition |= Q(listing_id=listing_id, check_in__lt=end, check_out__gt=start)
+
+    occupied = defaultdict(list)
+    rows = Booking.objects.filter(condition).active().values_list("listing_id", "check_in", "check_out")
+    for listing_id, check_in, check_out in rows:
+        occupied[listing_id].append((check_in, check_out))
+    return occupied
+
+
+def quote_stays(items):
+    """
+    Price and availability of many stays at once, without creating bookings.
+
+    `items` are dicts with listing (id), check_in, check_out, guests_count.
+    Applies the rules of Booking.clean() (check-in from tomorrow, at least one
+    night, max_guests, no overlap with PENDING/CONFIRMED bookings) and the price
+    of Booking.total_price, with two queries whatever the batch size:
+    active listings of the batch, then their bookings in the requested dates.
+
+    Returns one dict per item, in order: the item, available, nights,
+    price_per_night, total_price and reason (None or one of the constants above).
+    """
+    listings = {
+        row["id"]: row
+        for row in Listing.objects.filter(
+            pk__in={item["listing"] for item in items}, is_active=True,
+        ).values("id", "price_per_night", "max_guests")
+    }
+
+    # окно дат на объявление: от самого раннего заезда до самого позднего выезда
+    windows = {}
+    for item in items:
+        if item["listing"] in listings and item["check_out"] > item["check_in"]:
+            start, end = windows.get(item["listing"], (item["check_in"], item["check_out"]))
+            windows[item["listing"]] = (min(start, item["check_in"]), max(end, item["check_out"]))
+    occupied = _occupied_ranges(windows) if windows else {}
+
+    min_check_in = timezone.now().date() + timedelta(days=1)
+    results = []
+    for item in items:
+        listing = listings.get(item["listing"])
+        nights = max((item["check_out"] - item["check_in"]).days, 0)
+        price = listing["price_per_night"] if listing else None
+
+        if listing is None:
+            reason = LISTING_NOT_FOUND
+        elif nights < 1:
+            reason = INVALID_DATES
+        elif item["check_in"] < min_check_in:
+            reason = CHECK_IN_IN_PAST
+        elif listing["max_guests"] is not None and item["guests_count"] > listing["max_guests"]:
+            reason = TOO_MANY_GUESTS
+        elif any(
+            check_in < item["check_out"] and check_out > item["check_in"]
+            for check_in, check_out in occupied.get(item["listing"], ())
+        ):
+            reason = DATES_UNAVAILABLE
+        else:
+            reason = None
+
+        results.append({
+            **item,
+            "available": reason is None,
+            "nights": nights,
+            "price_per_night": price,
+            "total_price": Decimal(nights) * price if price is not None and nights else None,
+            "reason": reason,
+        })
+    return results
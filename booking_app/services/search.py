@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from booking_app.query_budget import unbudgeted
+
+
+@dataclass(frozen=True)
+class FullTextIndex:
+    """
+    Full-text index over text columns of one table.
+    SQLite: external-content FTS5 table kept in sync by triggers.
+    MySQL: InnoDB FULLTEXT index (maintained by the engine).
+    """
+
+    table: str
+    columns: tuple
+    mysql_index: str
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+
+# model label -> index; колонки = search_fields соответствующего ViewSet
+FULLTEXT_INDEXES = {
+    "booking_app.listing": FullTextIndex(
+        table="booking_app_listing",
+        columns=("title", "description"),
+        mysql_index="listing_fulltext_idx",
+    ),
+    "booking_app.review": FullTextIndex(
+        table="booking_app_review",
+        columns=("comment",),
+        mysql_index="review_fulltext_idx",
+    ),
+}
+
+_availability = {}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def sqlite_install_sql(index: FullTextIndex):
+    """
+    Statements creating the FTS5 table and sync triggers (idempotent).
+    """
+    cols = ", ".join(index.columns)
+    new_cols = ", ".join(f"new.{c}" for c in index.columns)
+    old_cols = ", ".join(f"old.{c}" for c in index.columns)
+    fts = index.fts_table
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{index.table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {index.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+    ]
+
+
+def sqlite_has_fts5(connection) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        options = {row[0] for row in cursor.fetchall()}
+    return "ENABLE_FTS5" in options
+
+
+def ensure_sqlite_fulltext(connection):
+    """
+    (Re)install FTS5 tables and triggers on SQLite.
+
+    SQLite migrations that rebuild a table (ALTER via copy) drop its triggers,
+    so this runs after every migrate; if a trigger was missing the index is rebuilt.
+    """
+    if connection.vendor != "sqlite" or not sqlite_has_fts5(connection):
+        return
+    with connection.cursor() as cursor:
+        for index in FULLTEXT_INDEXES.values():
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [f"{index.fts_table}_a_"],
+            )
+            complete = cursor.fetchone()[0] == 3
+            for statement in sqlite_install_sql(index):
+                cursor.execute(statement)
+            if not complete:
+                cursor.execute(f"INSERT INTO {index.fts_table}({index.fts_table}) VALUES ('rebuild')")
+    _availability.clear()
+
+
+def fulltext_available(model, using="default") -> bool:
+    """
+    Whether the full-text index for `model` exists on this database (cached per process).
+    """
+    label = model._meta.label_lower
+    index = FULLTEXT_INDEXES.get(label)
+    if index is None:
+        return False
+
+    key = (using, label)
+    if key not in _availability:
+        connection = connections[using]
+        available = False
+        # один раз на процесс — не в счёт бюджета запросов view
+        with unbudgeted():
+            if connection.vendor == "sqlite":
+                available = index.fts_table in connection.introspection.table_names()
+            elif connection.vendor == "mysql":
+                with connection.cursor() as cursor:
+                    constraints = connection.introspection.get_constraints(cursor, index.table)
+                available = index.mysql_index in constraints
+        _availability[key] = available
+    return _availability[key]
+
+
+async def afulltext_available(model, using="default") -> bool:
+    """
+    fulltext_available() for async views: the one-off introspection runs in a thread,
+    afterwards it is a dict lookup.
+    """
+    key = (using, model._meta.label_lower)
+    if key in _availability:
+        return _availability[key]
+    return await sync_to_async(fulltext_available)(model, using)
+
+
+def supports_fields(model, fields) -> bool:
+    """
+    FTS replaces icontains search only if the index covers exactly these fields.
+    """
+    index = FULLTEXT_INDEXES.get(model._meta.label_lower)
+    return index is not None and set(fields) == set(index.columns)
+
+
+def build_match_query(vendor, search_text):
+    """
+    User input -> safe MATCH expression: all words required, prefix match.
+    """
+    words = _WORD_RE.findall(search_text)
+    if not words:
+        return None
+    if vendor == "sqlite":
+        return " ".join(f'"{word}"*' for word in words)
+    return " ".join(f"+{word}*" for word in words)
+
+
+def fulltext_q(model, search_text, using="default"):
+    """
+    Q(pk__in=<full-text subquery>) or None if full-text search can't be used.
+    """
+    if not fulltext_available(model, using):
+        return None
+    index = FULLTEXT_INDEXES[model._meta.label_lower]
+    vendor = connections[using].vendor
+    match = build_match_query(vendor, search_text)
+    if match is None:
+        return None
+
+    if vendor == "sqlite":
+        sql = f"SELECT rowid FROM {index.fts_table} WHERE {index.fts_table} MATCH %s"
+    else:
+        sql = (
+            f"SELECT id FROM {index.table} "
+            f"WHERE MATCH({', '.join(index.columns)}) AGAINST (%s IN BOOLEAN MODE)"
+        )
+    return Q(pk__in=RawSQL(sql, [match]))
+
+
+def fulltext_rank(model, search_text, using="default"):
+    """
+    Relevance expression for annotate(): higher = better match.
+    """
+    index = FULLTEXT_INDEXES[model._meta.label_lower]
+    vendor = connections[using].vendor
+    match = build_match_query(vendor, search_text)
+
+    if vendor == "sqlite":
+        # bm25() < 0, чем меньше — тем релевантнее
+        sql = (
+            f"SELECT -bm25({index.fts_table}) FROM {index.fts_table} "
+            f"WHERE {index.fts_table} MATCH %s AND rowid = {index.table}.id"
+        )
+    else:
+        qualified = ", ".join(f"{index.table}.{column}" for column in index.columns)
+        sql = f"MATCH({qualified}) AGAINST (%s IN BOOLEAN MODE)"
+    return RawSQL(sql, [match], output_field=FloatField())
@@ -0,0 +1,213 @@
+from collections import Counter, defaultdict
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from booking_app.authentication import token_cache
+from booking_app.events import booking_status_changed
+from booking_app.models import Booking, Listing, Review, User
+from booking_app.services.calendar import invalidate_listing_calendar
+from booking_app.services.listing_cache import invalidate_listing_search
+from booking_app.services.owner_stats import (
+    add_counters, apply_deltas, apply_status_changes, booking_delta, rebuild_listing_stats, review_counters,
+)
+from booking_app.services.search import ensure_sqlite_fulltext
+
+
+# Receivers of the owner stats rollup are connected before the rating/calendar
+# receivers below: those reset the remembered (stored) values after a save.
+
+@receiver(post_save, sender=Review)
+def update_stats_on_review_save(sender, instance, created, **kwargs):
+    """
+    Review writes move rating_sum/review_count of the review's creation month.
+    """
+    deltas = review_counters(instance.listing_id, instance.created_at, instance.rating)
+    if not created:
+        old = review_counters(
+            getattr(instance, "_stored_listing_id", None), instance.created_at,
+            getattr(instance, "_stored_rating", None),
+        )
+        if not old:
+            # старые значения неизвестны — пересчитываем объявление целиком
+            rebuild_listing_stats([instance.listing_id])
+            return
+        add_counters(deltas, old, -1)
+    apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Review)
+def update_stats_on_review_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Listing):
+        return  # строки статистики удаляются вместе с объявлением
+    if isinstance(origin, User):
+        origin.__dict__.setdefault("_stats_rebuild_ids", set()).add(instance.listing_id)
+        return
+    listing_id = getattr(instance, "_stored_listing_id", None) or instance.listing_id
+    rating = getattr(instance, "_stored_rating", None) or instance.rating
+    apply_deltas(add_counters(defaultdict(Counter), review_counters(listing_id, instance.created_at, rating), -1))
+
+
+@receiver(post_save, sender=Booking)
+def update_stats_on_booking_save(sender, instance, created, **kwargs):
+    """
+    Bookings written with save() (create, guest edit, admin) move the rollup
+    by "new contribution - stored contribution".
+    """
+    new = (instance.listing_id, instance.check_in, instance.check_out, instance.status)
+    old = None if created else instance.stored_state()
+    if not created and old is None:
+        rebuild_listing_stats({instance.listing_id, getattr(instance, "_stored_listing_id", None)} - {None})
+        return
+    apply_deltas(booking_delta(old, new))
+
+
+@receiver(post_delete, sender=Booking)
+def update_stats_on_booking_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Listing):
+        return
+    if isinstance(origin, User):
+        # удаление пользователя: один пересчёт в rebuild_stats_after_user_delete
+        origin.__dict__.setdefault("_stats_rebuild_ids", set()).add(instance.listing_id)
+        return
+    old = instance.stored_state() or (instance.listing_id, instance.check_in, instance.check_out, instance.status)
+    apply_deltas(booking_delta(old, None))
+
+
+@receiver(post_save, sender=Review)
+def update_listing_rating_on_save(sender, instance, created, **kwargs):
+    """
+    Keep Listing.rating_sum/review_count/average_rating in sync with review writes.
+    """
+    old_listing_id = getattr(instance, "_stored_listing_id", None)
+    old_rating = getattr(instance, "_stored_rating", None)
+
+    if created:
+        Listing.objects.filter(pk=instance.listing_id).apply_rating_delta(instance.rating, 1)
+    elif old_listing_id is None:
+        # экземпляр создан не из БД — старые значения неизвестны, пересчитываем
+        Listing.objects.filter(pk=instance.listing_id).rebuild_ratings()
+    elif old_listing_id != instance.listing_id:
+        # отзыв перенесли на другое объявление
+        Listing.objects.filter(pk=old_listing_id).apply_rating_delta(-old_rating, -1)
+        Listing.objects.filter(pk=instance.listing_id).apply_rating_delta(instance.rating, 1)
+    elif old_rating != instance.rating:
+        Listing.objects.filter(pk=instance.listing_id).apply_rating_delta(instance.rating - old_rating, 0)
+
+    instance._remember_rating()
+
+
+@receiver(post_delete, sender=Review)
+def update_listing_rating_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Remove deleted review from listing aggregates (also fires on cascade deletes).
+    """
+    listing_id = getattr(instance, "_stored_listing_id", None)
+    rating = getattr(instance, "_stored_rating", None)
+
+    if isinstance(origin, Listing):
+        # удаляется само объявление — агрегаты обновлять незачем
+        return
+    if isinstance(origin, User):
+        # каскад от удаления пользователя: один пересчёт в rebuild_ratings_after_user_delete
+        origin.__dict__.setdefault("_rating_rebuild_ids", set()).add(listing_id or instance.listing_id)
+        return
+
+    if listing_id is None or rating is None:
+        Listing.objects.filter(pk=instance.listing_id).rebuild_ratings()
+        return
+    Listing.objects.filter(pk=listing_id).apply_rating_delta(-rating, -1)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_calendar_on_booking_change(sender, instance, **kwargs):
+    """
+    Any booking write (create, set_status, guest cancel, admin save, delete)
+    drops the cached availability calendar of its listing.
+    """
+    invalidate_listing_calendar(instance.listing_id, getattr(instance, "_stored_listing_id", None))
+    instance._remember_stored()
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_listing_search_on_change(sender, **kwargs):
+    """
+    Listing writes (incl. toggle_active) and review writes (rating aggregates)
+    change search results: drop all cached anonymous search pages.
+    """
+    invalidate_listing_search()
+
+
+@receiver(post_delete, sender=User)
+def rebuild_ratings_after_user_delete(sender, instance, **kwargs):
+    """
+    Reviews of a deleted user are removed before the user row (Collector order):
+    rebuild the touched listings once instead of two UPDATEs per review.
+    """
+    listing_ids = instance.__dict__.pop("_rating_rebuild_ids", None)
+    if listing_ids:
+        Listing.objects.filter(pk__in=listing_ids).rebuild_ratings()
+
+
+@receiver(post_delete, sender=User)
+def rebuild_stats_after_user_delete(sender, instance, **kwargs):
+    """
+    Bookings/reviews of a deleted guest: rebuild the touched listings once
+    (listings deleted with an owner are skipped by rebuild_listing_stats()).
+    """
+    listing_ids = instance.__dict__.pop("_stats_rebuild_ids", None)
+    if listing_ids:
+        rebuild_listing_stats(listing_ids)
+
+
+def repair_fulltext_index(sender, using="default", **kwargs):
+    """
+    SQLite table rebuilds in later migrations drop FTS triggers: reinstall them.
+    Connected in BookingAppConfig.ready() for this app only.
+    """
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ("booking_app", "0008_fulltext_search") in applied:
+        ensure_sqlite_fulltext(connection)
+
+
+@receiver(booking_status_changed)
+def invalidate_calendar_on_status_change(sender, changes, **kwargs):
+    """
+    Status transitions are written with UPDATE (no post_save): drop calendars here.
+    """
+    invalidate_listing_calendar(*(listing_id for _pk, listing_id, _old, _new in changes))
+
+
+@receiver(booking_status_changed)
+def update_stats_on_status_change(sender, changes, **kwargs):
+    """
+    Confirmations and cancellations (set_status, bulk_status, guest cancel,
+    toggle_active auto-reject) move confirmed nights / cancellations.
+    """
+    apply_status_changes(changes)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """
+    Logout, password change and user deletion delete tokens -> drop them from the auth cache.
+    """
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Cached users must not outlive profile updates (UserViewSet.me, admin, set_password).
+    """
+    token_cache.invalidate_user(instance.pk)
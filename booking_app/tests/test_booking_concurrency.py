@@ -0,0 +1,59 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from booking_app.factories import ListingFactory, UserFactory
+from booking_app.models import Booking
+
+PARALLEL_REQUESTS = 8
+
+
+class ParallelBookingTests(TransactionTestCase):
+    """
+    Parallel POST /bookings/ for the same listing and dates: the listing lock
+    in Booking.save() lets exactly one of them through, the others get 400.
+    """
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("needs a file-based SQLite test database (DATABASES['default']['TEST']['NAME'])")
+        self.listing = ListingFactory(max_guests=2)
+        self.tokens = [
+            Token.objects.create(user=UserFactory()).key for _ in range(PARALLEL_REQUESTS)
+        ]
+
+    def test_one_booking_wins(self):
+        check_in = timezone.localdate() + timedelta(days=10)
+        payload = {
+            "listing": self.listing.pk,
+            "check_in": str(check_in),
+            "check_out": str(check_in + timedelta(days=3)),
+        }
+        barrier = threading.Barrier(PARALLEL_REQUESTS)
+        results = []
+
+        def book(token):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+            try:
+                barrier.wait()
+                results.append(client.post("/api/v1/bookings/", payload, format="json").status_code)
+            finally:
+                # у каждого потока своё соединение
+                connections.close_all()
+
+        threads = [threading.Thread(target=book, args=(token,)) for token in self.tokens]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(status.HTTP_201_CREATED), 1, results)
+        self.assertEqual(results.count(status.HTTP_400_BAD_REQUEST), PARALLEL_REQUESTS - 1, results)
+        self.assertEqual(Booking.objects.filter(listing=self.listing).count(), 1)
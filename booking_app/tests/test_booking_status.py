@@ -0,0 +1,136 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from booking_app.admin import BookingAdminForm
+from booking_app.choices import BookingStatus, Role
+from booking_app.events import booking_status_changed
+from booking_app.factories import BookingFactory, ListingFactory, UserFactory
+from booking_app.models import Booking, BookingStatusHistory
+
+
+class BookingTransitionTests(TestCase):
+    """
+    Booking.transition_to() / BookingQuerySet.transition(): BOOKING_STATUS_TRANSITIONS,
+    the UPDATE guarded by the current status, history rows and booking_status_changed.
+    """
+
+    def setUp(self):
+        self.owner = UserFactory(role=Role.OWNER)
+        self.listing = ListingFactory(owner=self.owner, max_guests=4)
+        self.booking = BookingFactory(listing=self.listing)
+        self.signals = []
+        booking_status_changed.connect(self.on_status_changed)
+        self.addCleanup(booking_status_changed.disconnect, self.on_status_changed)
+
+    def on_status_changed(self, sender, changes, changed_by, **kwargs):
+        self.signals.append((changes, changed_by))
+
+    def history(self, booking):
+        return list(
+            BookingStatusHistory.objects.filter(booking=booking)
+            .order_by("pk").values_list("from_status", "to_status", "changed_by")
+        )
+
+    def test_valid_transitions(self):
+        self.booking.transition_to(BookingStatus.CONFIRMED, changed_by=self.owner)
+        self.booking.transition_to(BookingStatus.CANCELLED_BY_OWNER, changed_by=self.owner)
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, BookingStatus.CANCELLED_BY_OWNER)
+        self.assertEqual(self.history(self.booking), [
+            (BookingStatus.PENDING, BookingStatus.CONFIRMED, self.owner.pk),
+            (BookingStatus.CONFIRMED, BookingStatus.CANCELLED_BY_OWNER, self.owner.pk),
+        ])
+        self.assertEqual(self.signals, [
+            ([(self.booking.pk, self.listing.pk, BookingStatus.PENDING, BookingStatus.CONFIRMED)], self.owner),
+            ([(self.booking.pk, self.listing.pk, BookingStatus.CONFIRMED, BookingStatus.CANCELLED_BY_OWNER)],
+             self.owner),
+        ])
+
+    def test_invalid_transitions(self):
+        # PENDING -> CANCELLED_BY_OWNER не предусмотрен, REJECTED — конечный статус
+        with self.assertRaises(ValidationError):
+            self.booking.transition_to(BookingStatus.CANCELLED_BY_OWNER)
+        self.booking.transition_to(BookingStatus.REJECTED)
+        for new_status in (BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.CANCELLED):
+            with self.subTest(new_status=new_status), self.assertRaises(ValidationError):
+                self.booking.transition_to(new_status)
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, BookingStatus.REJECTED)
+        self.assertEqual(len(self.history(self.booking)), 1)
+        self.assertEqual(len(self.signals), 1)
+
+    def test_guarded_update_loses_to_concurrent_change(self):
+        stale = Booking.objects.get(pk=self.booking.pk)
+        # параллельный запрос успел отклонить бронь
+        Booking.objects.get(pk=self.booking.pk).transition_to(BookingStatus.REJECTED)
+
+        with self.assertRaisesMessage(ValidationError, "changed by another request"):
+            stale.transition_to(BookingStatus.CONFIRMED)
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, BookingStatus.REJECTED)
+        self.assertEqual(self.history(self.booking), [(BookingStatus.PENDING, BookingStatus.REJECTED, None)])
+        self.assertEqual(len(self.signals), 1)
+
+    def test_queryset_transition(self):
+        confirmed = BookingFactory(listing=self.listing, check_in=self.booking.check_out)
+        confirmed.transition_to(BookingStatus.CONFIRMED)
+        cancelled = BookingFactory(listing=self.listing, check_in=confirmed.check_out)
+        cancelled.transition_to(BookingStatus.CANCELLED)
+        self.signals.clear()
+
+        bookings = Booking.objects.filter(pk__in=[self.booking.pk, confirmed.pk, cancelled.pk])
+        moved = bookings.transition(BookingStatus.CANCELLED, changed_by=self.owner)
+
+        # из CANCELLED перехода нет: строка пропущена
+        self.assertEqual(sorted(moved), sorted([self.booking.pk, confirmed.pk]))
+        self.assertEqual(
+            dict(bookings.values_list("pk", "status")),
+            {booking.pk: BookingStatus.CANCELLED for booking in (self.booking, confirmed, cancelled)},
+        )
+        self.assertEqual(self.history(self.booking), [
+            (BookingStatus.PENDING, BookingStatus.CANCELLED, self.owner.pk),
+        ])
+        self.assertEqual(
+            self.history(confirmed)[-1], (BookingStatus.CONFIRMED, BookingStatus.CANCELLED, self.owner.pk),
+        )
+        self.assertEqual(len(self.history(cancelled)), 1)
+        self.assertEqual(len(self.signals), 1)
+        self.assertEqual(sorted(self.signals[0][0]), sorted([
+            (self.booking.pk, self.listing.pk, BookingStatus.PENDING, BookingStatus.CANCELLED),
+            (confirmed.pk, self.listing.pk, BookingStatus.CONFIRMED, BookingStatus.CANCELLED),
+        ]))
+
+
+class BookingAdminFormTests(TestCase):
+    def setUp(self):
+        self.owner = UserFactory(role=Role.OWNER)
+        self.booking = BookingFactory(listing=ListingFactory(owner=self.owner, max_guests=4))
+
+    def form(self, **changes):
+        data = {
+            "guest": self.booking.guest_id,
+            "listing": self.booking.listing_id,
+            "check_in": self.booking.check_in,
+            "check_out": self.booking.check_out,
+            "status": self.booking.status,
+            "guests_count": self.booking.guests_count,
+            **changes,
+        }
+        return BookingAdminForm(data=data, instance=Booking.objects.get(pk=self.booking.pk))
+
+    def test_allowed_status_change(self):
+        self.assertTrue(self.form(status=BookingStatus.CONFIRMED, guests_count=2).is_valid())
+
+    def test_illegal_status_change(self):
+        self.booking.transition_to(BookingStatus.REJECTED)
+        form = self.form(status=BookingStatus.CONFIRMED)
+        self.assertFalse(form.is_valid())
+        self.assertIn("status", form.errors)
+
+    def test_owner_as_guest(self):
+        form = self.form(guest=self.owner.pk)
+        self.assertFalse(form.is_valid())
+        self.assertIn("Owner cannot book their own listing.", form.non_field_errors())
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from booking_app.choices import BookingStatus, Role
+from booking_app.factories import BookingFactory, ListingFactory, UserFactory
+from booking_app.models import BookingStatusHistory
+from booking_app.services.booking_status import INVALID_TRANSITION, NOT_FOUND, UNCHANGED, UPDATED
+
+URL = "/api/v1/bookings/bulk-status/"
+
+
+class BulkStatusTests(TestCase):
+    """
+    PATCH /bookings/bulk-status/: one result per id, one history row per moved booking.
+    """
+
+    def setUp(self):
+        self.owner = UserFactory(role=Role.OWNER)
+        listing = ListingFactory(owner=self.owner, max_guests=4)
+        check_in = timezone.localdate() + timedelta(days=30)
+        self.pending = [
+            BookingFactory(listing=listing, check_in=check_in + timedelta(days=3 * index))
+            for index in range(2)
+        ]
+        self.confirmed = BookingFactory(listing=listing, check_in=check_in + timedelta(days=6))
+        self.confirmed.transition_to(BookingStatus.CONFIRMED)
+        self.rejected = BookingFactory(listing=listing, check_in=check_in + timedelta(days=9))
+        self.rejected.transition_to(BookingStatus.REJECTED)
+        # бронь на чужое объявление
+        self.foreign = BookingFactory(listing=ListingFactory(owner=UserFactory(role=Role.OWNER)))
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, ids, new_status):
+        response = self.client.patch(URL, {"ids": ids, "status": new_status}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return {item["id"]: item["result"] for item in response.data["results"]}
+
+    def test_results_per_id(self):
+        missing_id = self.foreign.pk + 1000
+        ids = [
+            *(booking.pk for booking in self.pending),
+            self.confirmed.pk, self.rejected.pk, self.foreign.pk, missing_id,
+        ]
+        history_before = BookingStatusHistory.objects.count()
+
+        results = self.bulk(ids, BookingStatus.CONFIRMED)
+
+        self.assertEqual(results, {
+            self.pending[0].pk: UPDATED,
+            self.pending[1].pk: UPDATED,
+            self.confirmed.pk: UNCHANGED,
+            self.rejected.pk: INVALID_TRANSITION,
+            self.foreign.pk: NOT_FOUND,
+            missing_id: NOT_FOUND,
+        })
+        new_history = BookingStatusHistory.objects.order_by("pk")[history_before:]
+        self.assertEqual(
+            sorted(new_history.values_list("booking_id", "from_status", "to_status", "changed_by")),
+            sorted(
+                (booking.pk, BookingStatus.PENDING, BookingStatus.CONFIRMED, self.owner.pk)
+                for booking in self.pending
+            ),
+        )
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, BookingStatus.PENDING)
+
+    def test_duplicate_ids(self):
+        booking = self.pending[0]
+        results = self.bulk([booking.pk, booking.pk], BookingStatus.REJECTED)
+
+        self.assertEqual(results, {booking.pk: UPDATED})
+        self.assertEqual(BookingStatusHistory.objects.filter(booking=booking).count(), 1)
+
+    def test_guest_forbidden(self):
+        self.client.force_authenticate(self.pending[0].guest)
+        response = self.client.patch(
+            URL, {"ids": [self.pending[0].pk], "status": BookingStatus.CONFIRMED}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from booking_app.choices import BookingStatus, Role
+from booking_app.factories import BookingFactory, ListingFactory, UserFactory
+
+
+class WriteActionBudgetTests(TestCase):
+    """
+    Write actions stay within their query budgets inside an outer transaction
+    (TestCase, ATOMIC_REQUESTS): savepoints of nested atomic() are not counted.
+    """
+
+    def setUp(self):
+        self.owner = UserFactory(role=Role.OWNER)
+        self.guest = UserFactory()
+        self.listing = ListingFactory(owner=self.owner, max_guests=4)
+        self.check_in = timezone.localdate() + timedelta(days=30)
+        self.booking = BookingFactory(listing=self.listing, guest=self.guest, check_in=self.check_in)
+
+    def request(self, user, method, url, data=None, expected=status.HTTP_200_OK):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.assertNoLogs("booking_app.query_budget", level="WARNING"):
+            response = getattr(client, method)(url, data, format="json")
+        self.assertEqual(response.status_code, expected, response.data)
+
+    def test_create(self):
+        self.request(self.guest, "post", "/api/v1/bookings/", {
+            "listing": self.listing.pk,
+            "check_in": str(self.booking.check_out),
+            "check_out": str(self.booking.check_out + timedelta(days=2)),
+        }, expected=status.HTTP_201_CREATED)
+
+    def test_set_status(self):
+        self.request(self.owner, "patch", f"/api/v1/bookings/{self.booking.pk}/set-status/",
+                     {"status": BookingStatus.CONFIRMED})
+
+    def test_destroy(self):
+        self.request(self.guest, "delete", f"/api/v1/bookings/{self.booking.pk}/",
+                     expected=status.HTTP_204_NO_CONTENT)
+
+    def test_bulk_status(self):
+        other = BookingFactory(listing=self.listing, check_in=self.booking.check_out)
+        self.request(self.owner, "patch", "/api/v1/bookings/bulk-status/",
+                     {"ids": [self.booking.pk, other.pk], "status": BookingStatus.CONFIRMED})
+
+    def test_toggle_active(self):
+        self.request(self.owner, "post", f"/api/v1/listings/{self.listing.pk}/toggle-active/")
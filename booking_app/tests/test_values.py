@@ -0,0 +1,64 @@
+from django.test import TestCase
+from rest_framework import serializers
+
+from booking_app.factories import ListingFactory, ReviewFactory, UserFactory
+from booking_app.models import BookingStatusHistory, Listing, Review
+from booking_app.serializers.listing import ListingListSerializer
+from booking_app.serializers.review import ReviewListSerializer
+from booking_app.serializers.values import UnsupportedField, ValuesPlan, values_plan
+
+
+class HistorySerializer(serializers.ModelSerializer):
+    # changed_by — nullable FK
+    changed_by_email = serializers.ReadOnlyField(source="changed_by.email")
+
+    class Meta:
+        model = BookingStatusHistory
+        fields = ["id", "to_status", "changed_by_email"]
+
+
+class ValuesPlanParityTests(TestCase):
+    """
+    ValuesPlan.render() must give the same JSON as serializer.data.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.listings = ListingFactory.create_batch(3)
+        # имена автора: полное, только имя, пустое
+        authors = [
+            UserFactory(first_name="Anna", last_name="Schmidt"),
+            UserFactory(first_name="Jonas", last_name=""),
+            UserFactory(first_name="", last_name=""),
+        ]
+        for listing in cls.listings[:2]:
+            for author in authors:
+                ReviewFactory(listing=listing, author=author)
+
+    def assert_parity(self, serializer_class, queryset, fields=None):
+        plan = values_plan(serializer_class, fields)
+        self.assertIsNotNone(plan)
+        expected = serializer_class(queryset, many=True, context={}).data
+        if fields is not None:
+            expected = [{name: item[name] for name in fields} for item in expected]
+        self.assertEqual(plan.render(plan.values(queryset)), expected)
+
+    def test_listing_list(self):
+        self.assert_parity(ListingListSerializer, Listing.objects.order_by("-average_rating", "pk"))
+
+    def test_review_list(self):
+        queryset = Review.objects.select_related("listing", "author").order_by("-created_at", "pk")
+        self.assert_parity(ReviewListSerializer, queryset)
+
+    def test_review_author_name(self):
+        queryset = Review.objects.select_related("author").order_by("pk")
+        self.assert_parity(ReviewListSerializer, queryset, fields=("id", "author_name"))
+        plan = values_plan(ReviewListSerializer)
+        names = {item["author_name"] for item in plan.render(plan.values(queryset))}
+        self.assertEqual(names, {"Anna Schmidt", "Jonas", ""})
+
+    def test_nullable_fk_is_unsupported(self):
+        # DRF отдаёт None для changed_by=None: values() этого не повторит, план не строится
+        with self.assertRaises(UnsupportedField):
+            ValuesPlan(HistorySerializer)
+        self.assertIsNone(values_plan(HistorySerializer))
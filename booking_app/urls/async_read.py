@@ -0,0 +1,12 @@
+from django.urls import path
+
+from booking_app.views.async_read import (
+    AsyncListingDetailView, AsyncListingListView, AsyncListingReviewsView,
+)
+
+# async-версии read-эндпоинтов листингов (ASGI); запись — через обычный API
+urlpatterns = [
+    path("listings/", AsyncListingListView.as_view(), name="async-listing-list"),
+    path("listings/<int:pk>/", AsyncListingDetailView.as_view(), name="async-listing-detail"),
+    path("listings/<int:pk>/reviews/", AsyncListingReviewsView.as_view(), name="async-listing-reviews"),
+]
@@ -0,0 +1,160 @@
+"""
+Async read path for listings: /api/v1/async/listings/...
+
+Same querysets, filters, pagination, serializers and JSON as ListingViewSet
+(a viewset instance builds the lazy queryset and checks permissions, no
+queries), evaluated with Django's async ORM. Served by an ASGI server
+(core.asgi:application) a slow query no longer holds a worker thread for
+the whole request; writes stay on the sync API.
+
+Under WSGI these views still work, Django runs each one in its own event loop.
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from booking_app.authentication import CachedTokenAuthentication
+from booking_app.db.replicas import use_primary
+from booking_app.serializers.review import ReviewListSerializer
+from booking_app.services.listing_cache import cache_search, get_cached_search, search_cache_key
+from booking_app.services.search import afulltext_available
+from booking_app.views.listing import ListingViewSet
+
+
+class AsyncReadView(View):
+    """
+    Base for async GET endpoints backed by a DRF viewset:
+    token auth with the async ORM, DRF-style JSON errors.
+
+    Subclasses set `action` and define `async def read(self, viewset, **url_kwargs)`
+    returning the HttpResponse.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    viewset_class = ListingViewSet
+    action = None
+    renderer = JSONRenderer()
+    authentication = CachedTokenAuthentication()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            viewset = await self.initial(request, **kwargs)
+            return await self.read(viewset, **kwargs)
+        except Http404 as exc:
+            return self.error_response(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+
+    async def initial(self, request, **kwargs):
+        """
+        Authenticate, build the viewset for self.action and check permissions.
+        """
+        drf_request = Request(request)
+        result = await self.authentication.aauthenticate(request)
+        drf_request.user, drf_request.auth = result if result is not None else (AnonymousUser(), None)
+        drf_request.accepted_renderer = self.renderer
+        drf_request.accepted_media_type = self.renderer.media_type
+
+        viewset = self.viewset_class(
+            request=drf_request, args=(), kwargs=kwargs, format_kwarg=None,
+            action=self.action, action_map={"get": self.action},
+        )
+        viewset.headers = {}
+        viewset.check_permissions(drf_request)
+
+        if drf_request.query_params.get(api_settings.SEARCH_PARAM):
+            # разовая интроспекция FTS-индекса — в потоке, дальше из кэша
+            queryset = viewset.get_queryset()
+            await afulltext_available(queryset.model, queryset.db)
+        return viewset
+
+    @staticmethod
+    def not_found(queryset):
+        # то же сообщение, что у get_object_or_404() в sync-версии
+        return Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), content_type=self.renderer.media_type, status=status)
+
+    def error_response(self, exc):
+        # как rest_framework.views.exception_handler
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.headers["WWW-Authenticate"] = self.authentication.authenticate_header(None)
+        return response
+
+
+class AsyncListingListView(AsyncReadView):
+    """
+    GET /api/v1/async/listings/ — ListingViewSet.list (filters, search,
+    ordering, page/cursor pagination, anonymous response cache).
+    """
+
+    action = "list"
+
+    async def read(self, viewset, **kwargs):
+        key = search_cache_key(viewset.request, viewset)
+        if key is not None:
+            data = get_cached_search(key)
+            if data is not None:
+                return self.render(data)
+
+        if key is None:
+            return self.render(await viewset.alist_data(viewset.filter_queryset(viewset.get_queryset())))
+
+        with use_primary():  # как ListingViewSet.list: в кэш — только данные primary
+            data = await viewset.alist_data(viewset.filter_queryset(viewset.get_queryset()))
+        cache_search(key, data)
+        return self.render(data)
+
+
+class AsyncListingDetailView(AsyncReadView):
+    """
+    GET /api/v1/async/listings/{id}/ — ListingViewSet.retrieve (with conditional GET).
+    """
+
+    action = "retrieve"
+
+    async def read(self, viewset, pk):
+        queryset = viewset.filter_queryset(viewset.get_queryset()).filter(pk=pk)
+        validators = await viewset.detail_validators(queryset).afirst()
+        if validators is None:
+            raise self.not_found(queryset)
+        not_modified = viewset.check_detail_conditional(viewset.request, pk, validators)
+        if not_modified is not None:
+            return viewset.add_conditional_headers(not_modified)
+
+        listing = await queryset.afirst()
+        if listing is None:
+            raise self.not_found(queryset)
+        viewset.check_object_permissions(viewset.request, listing)
+        return viewset.add_conditional_headers(self.render(viewset.get_serializer(listing).data))
+
+
+class AsyncListingReviewsView(AsyncReadView):
+    """
+    GET /api/v1/async/listings/{id}/reviews/ — ListingViewSet.reviews (with conditional GET).
+    """
+
+    action = "reviews"
+
+    async def read(self, viewset, pk):
+        queryset = viewset.filter_queryset(viewset.get_queryset()).filter(pk=pk)
+        listing = await queryset.afirst()
+        if listing is None:
+            raise self.not_found(queryset)
+        viewset.check_object_permissions(viewset.request, listing)
+
+        stats = await viewset.reviews_queryset(listing).aaggregate(**viewset.REVIEWS_VALIDATORS)
+        not_modified = viewset.check_reviews_conditional(viewset.request, listing, stats)
+        if not_modified is not None:
+            return viewset.add_conditional_headers(not_modified)
+
+        queryset = viewset.reviews_queryset(listing).select_related("listing", "author").order_by("-created_at")
+        data = await viewset.alist_data(queryset, ReviewListSerializer, paginate=False)
+        return viewset.add_conditional_headers(self.render(data))
@@ -6,6 +6,7 @@ from rest_framework import generics
 from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 
+from booking_app.query_budget import QueryBudgetMixin
 from booking_app.serializers.user import RegisterSerializer
 from booking_app.serializers.auth_token import TokenLoginSerializer
 from booking_app.serializers.change_password import ChangePasswordSerializer
@@ -13,20 +14,22 @@ from booking_app.serializers.change_password import ChangePasswordSerializer
 User = get_user_model()
 
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(QueryBudgetMixin, generics.CreateAPIView):
     """
     Simple API endpoint to create a new user account.
     """
+    query_budget = {"post": 2}
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = []  # Anyone can call this endpoint (no login required)
 
 
-class TokenLoginView(APIView):
+class TokenLoginView(QueryBudgetMixin, APIView):
     """
     Login with email and password and return auth token.
     """
     permission_classes = []  # open for anyone
+    query_budget = {"post": 4}
 
     def post(self, request):
         serializer = TokenLoginSerializer(data=request.data)
@@ -38,18 +41,20 @@ class TokenLoginView(APIView):
 
         return Response({"token": token.key}, status=status.HTTP_200_OK)
 
-class LogoutView(APIView):
+class LogoutView(QueryBudgetMixin, APIView):
      """Logout user by deleting auth token."""
      permission_classes = [permissions.IsAuthenticated]
+     query_budget = {"post": 3}
 
      def post(self, request):
          Token.objects.filter(user=request.user).delete()
          return Response({"message": "Logged out"}, status=status.HTTP_200_OK)
 
-class ChangePasswordView(APIView):
+class ChangePasswordView(QueryBudgetMixin, APIView):
     """Allow authenticated user to change own password."""
 
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"post": 7}
 
     def post(self, request):
         """Validate old/new password and update user password."""
@@ -1,3 +1,5 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 
@@ -7,19 +9,56 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from booking_app.choices import Role
 from booking_app.choices import BookingStatus
+from booking_app.filters import BookingFilter
 from booking_app.models import Booking
-from booking_app.serializers.booking import BookingSerializer
+from booking_app.pagination import HybridPagination
+from booking_app.query_budget import QueryBudgetMixin
+from booking_app.renderers import CSVExportRenderer, ExportRenderer, NDJSONExportRenderer
+from booking_app.serializers.booking import (
+    BookingSerializer,
+    BookingBulkStatusSerializer,
+    BookingQuoteResultSerializer,
+    BookingQuoteSerializer,
+)
+from booking_app.services.booking_export import EXPORT_FORMATS
+from booking_app.services.booking_status import bulk_set_status
+from booking_app.services.quote import quote_stays
+from booking_app.views.mixins import FieldsetMixin
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+def api_validation_error(exc):
+    """Django model ValidationError -> DRF ValidationError (HTTP 400)."""
+    return ValidationError(exc.message_dict if hasattr(exc, "error_dict") else exc.messages)
+
+
+class BookingViewSet(FieldsetMixin, QueryBudgetMixin, viewsets.ModelViewSet):
     """API for guest bookings. Only own bookings visible."""
 
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = BookingFilter  # ?check_in_after=&check_in_before=&status=&listing=
+    pagination_class = HybridPagination  # ?page=N или ?pagination=cursor (keyset)
+    # ?fields= / ?expand=listing,guest (booking_app/serializers/fieldsets.py)
+    fieldset_actions = ("list", "retrieve", "owner_bookings")
+
+    # максимум SQL-запросов на action (booking_app/query_budget.py)
+    query_budget = {
+        "list": 2,
+        "retrieve": 1,
+        "create": 6,  # + статистика хозяина (services/owner_stats.py)
+        "update": 8,
+        "partial_update": 8,
+        "destroy": 6,
+        "owner_bookings": 2,  # ?format=csv|ndjson: 0 здесь, запросы идут при отдаче тела
+        "set_status": 6,
+        "bulk_status": 9,
+        "quote": 2,
+    }
 
     def get_queryset(self):
         """Return bookings visible to the current authenticated user
@@ -28,26 +67,46 @@ class BookingViewSet(viewsets.ModelViewSet):
 
         user = self.request.user
 
+        # listing нужен сериализатору (total_price) — одним JOIN, а не запросом на строку
+        qs = Booking.objects.select_related("listing")
+
         # Владелец жилья видит брони на свои объявления
         if getattr(user, "role", None) == Role.OWNER:
-            return Booking.objects.filter(listing__owner=user)
+            return qs.filter(listing__owner=user)
 
         # Гость видит только свои брони
-        return Booking.objects.filter(guest=user)
+        return qs.filter(guest=user)
 
     def perform_create(self, serializer):
         """Set current user as booking guest."""
-        serializer.save(guest=self.request.user)
+        # Booking.save() проверяет пересечения под блокировкой listing,
+        # проигравший параллельный запрос получает 400, а не 500
+        self._save_booking(serializer, guest=self.request.user)
+
+    @staticmethod
+    def _save_booking(serializer, **kwargs):
+        """Save booking and turn model validation errors into API 400 errors."""
+        try:
+            serializer.save(**kwargs)
+        except DjangoValidationError as exc:
+            raise api_validation_error(exc)
 
     # GET /api/v1/bookings/owner/ — список всех броней на СВОИ объявления (для OWNER)
+    # ?format=csv / ?format=ndjson — потоковая выгрузка всех подходящих броней (без пагинации)
     @action(
         detail=False,
         methods=["get"],
         permission_classes=[permissions.IsAuthenticated],
         url_path="owner",
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, CSVExportRenderer, NDJSONExportRenderer],
     )
     def owner_bookings(self, request):
-        """List bookings for listings owned by current user (owner)."""
+        """List bookings for listings owned by current user (owner).
+
+        With ?format=csv or ?format=ndjson (or Accept: text/csv / application/x-ndjson)
+        all matching bookings are streamed, with the listing and guest joined in;
+        filters: ?check_in_after=&check_in_before=&status=&listing=.
+        """
         user = request.user
         if getattr(user, "role", None) != Role.OWNER:
             return Response(
@@ -55,9 +114,25 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        qs = Booking.objects.filter(listing__owner=user).order_by("-check_in")
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        qs = self.filter_queryset(
+            Booking.objects.filter(listing__owner=user).select_related("listing").order_by("-check_in")
+        )
+        if isinstance(request.accepted_renderer, ExportRenderer):
+            return self.export_response(qs, request.accepted_renderer)
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def export_response(queryset, renderer):
+        """Stream the bookings in the renderer's format as a file download."""
+        response = StreamingHttpResponse(
+            EXPORT_FORMATS[renderer.format](queryset),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        filename = f"bookings-{timezone.localdate():%Y-%m-%d}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
     # action для смены статуса, PATCH /api/v1/bookings/{id}/set-status/ (+ Token)
     @action(
@@ -71,8 +146,8 @@ class BookingViewSet(viewsets.ModelViewSet):
         booking = self.get_object()
         user = request.user
 
-        # Только хозяин объявления может менять статус
-        if booking.listing.owner != user:
+        # Только хозяин объявления может менять статус (owner_id: без запроса User)
+        if booking.listing.owner_id != user.pk:
             return Response(
                 {"detail": "Only listing owner can change booking status."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -92,27 +167,74 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        booking.status = allowed_statuses[new_status]
-        booking.save(update_fields=["status"])
+        # переход по таблице BOOKING_STATUS_TRANSITIONS (без полного full_clean)
+        try:
+            booking.transition_to(allowed_statuses[new_status], changed_by=user)
+        except DjangoValidationError as exc:
+            raise api_validation_error(exc)
 
         serializer = self.get_serializer(booking)
         return Response(serializer.data)
 
+    # PATCH /api/v1/bookings/bulk-status/  {"ids": [1, 2, 3], "status": "confirmed"}
+    @action(
+        detail=False,
+        methods=["patch"],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path="bulk-status",
+    )
+    def bulk_status(self, request):
+        """Allow owner to confirm, reject or cancel many bookings at once."""
+        user = request.user
+        if getattr(user, "role", None) != Role.OWNER:
+            return Response(
+                {"detail": "Only owners can change booking status."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = BookingBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data["status"]
+
+        results = bulk_set_status(user, serializer.validated_data["ids"], new_status)
+        return Response({
+            "status": new_status,
+            "results": [
+                {"id": booking_id, "result": result}
+                for booking_id, result in results.items()
+            ],
+        })
+
+    # POST /api/v1/bookings/quote/  {"items": [{"listing": 1, "check_in": ..., "check_out": ..., "guests_count": 2}]}
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[permissions.AllowAny],
+        url_path="quote",
+    )
+    def quote(self, request):
+        """Price and availability of many stays without booking them (2 queries per batch)."""
+        serializer = BookingQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = quote_stays(serializer.validated_data["items"])
+        return Response({"results": BookingQuoteResultSerializer(results, many=True).data})
+
     # ограничения для гостя при PATCH:
     def perform_update(self, serializer):
         """Allow guest to edit only own pending bookings."""
-        instance = self.get_object()
+        instance = serializer.instance  # уже загружен в update()
         user = self.request.user
 
         # Только гость может редактировать свою бронь
-        if instance.guest != user:
+        if instance.guest_id != user.pk:
             raise ValidationError("Only the guest can modify this booking.")
 
         # редактировать только пока бронь в статусе PENDING
         if instance.status != BookingStatus.PENDING:
             raise ValidationError("Only pending bookings can be modified.")
 
-        serializer.save()
+        self._save_booking(serializer)
 
     # ограничения для гостя при DELETE:
     def perform_destroy(self, instance):
@@ -120,7 +242,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         # Разрешаем отмену только гостю
-        if instance.guest != user:
+        if instance.guest_id != user.pk:
             raise ValidationError("Only the guest can cancel this booking.")
 
         # datetime начала заезда: дата check_in + время 14:00 (CHECK_IN_TIME)
@@ -145,6 +267,8 @@ class BookingViewSet(viewsets.ModelViewSet):
         # Вместо физического удаления — помечаем как отменённую
         # видно историю, можно показывать владельцу, что бронь была, но гость её отменил.
         # отмена гостем
-        instance.status = BookingStatus.CANCELLED
-        instance.save(update_fields=["status"])
+        try:
+            instance.transition_to(BookingStatus.CANCELLED, changed_by=user)
+        except DjangoValidationError as exc:
+            raise api_validation_error(exc)
 
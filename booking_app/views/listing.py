@@ -1,24 +1,44 @@
-from django.db import models
-from django.db.models import Q, Avg, Count
-from django.db.models.functions import Coalesce # функция SQL (берёт первый не-NULL аргумент)
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, permissions, decorators, response, status
 from rest_framework.decorators import action, permission_classes
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
 
-from booking_app.choices import Role, BookingStatus
-from booking_app.models import Listing, Booking, Review
-from booking_app.serializers.listing import ListingListSerializer, ListingDetailSerializer
+from booking_app.choices import Role
+from booking_app.db.replicas import use_primary
+from booking_app.filters import ListingFilter, FullTextSearchFilter
+from booking_app.pagination import HybridPagination
+from booking_app.query_budget import QueryBudgetMixin
+from booking_app.views.mixins import ConditionalGetMixin, FieldsetMixin, ValuesListMixin
+from booking_app.models import Listing, Review
+from booking_app.serializers.listing import (
+    ListingListSerializer, ListingDetailSerializer, ListingStatsSerializer,
+)
 from booking_app.permissions import IsOwnerOrReadOnly, IsOwnerUser
 from booking_app.serializers.review import ReviewListSerializer
+from booking_app.services.calendar import (
+    CALENDAR_MAX_NIGHTS, default_range, get_listing_calendar,
+)
+from booking_app.services.jobs import REJECT_PENDING_BOOKINGS, enqueue
+from booking_app.services.listing_cache import cache_search, get_cached_search, search_cache_key
+from booking_app.services.owner_stats import month_start, owner_monthly_stats
+
+STATS_DEFAULT_MONTHS = 12
+STATS_MAX_MONTHS = 60
 
 
-class ListingViewSet(viewsets.ModelViewSet):
+class ListingViewSet(FieldsetMixin, QueryBudgetMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Public listing API:
     - anyone can search and read active listings
     - owners can create and update their own listings
+    - ?fields=id,title / ?expand=owner,reviews on list, retrieve and my
     """
 
     def get_serializer_class(self):
@@ -26,27 +46,43 @@ class ListingViewSet(viewsets.ModelViewSet):
             return ListingListSerializer
         return ListingDetailSerializer
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # FullTextSearchFilter: FTS-индекс для ?search=, иначе обычный SearchFilter (icontains)
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    pagination_class = HybridPagination  # ?page=N или ?pagination=cursor (keyset)
 
     search_fields = ["title", "description"]  # Search in title OR description only
 
-    filterset_fields = {
-        "price_per_night": ["gte", "lte"],  # Price range (min/max)
-        "city": ["exact", "in"],
-        "region": ["exact"],  # district (Nordrhein-Westfalen, Bayern...)
-        "rooms": ["gte", "lte"],  # Rooms range
-        "listing_type": ["exact"],  # Property type
-        "is_active": ["exact"],  # Active status
-    }
+    # price/city/region/rooms/type/is_active + availability (?check_in=&check_out=&guests=)
+    filterset_class = ListingFilter
 
     ordering_fields = [
         "price_per_night", "-price_per_night",
         "created_at", "-created_at",
         "average_rating", "-average_rating",
         "review_count", "-review_count",
+        "relevance", "-relevance",  # ранг полнотекстового поиска (?search=...&ordering=-relevance)
+        "distance", "-distance",  # расстояние до ?near=lat,lon (км)
     ]
     ordering = ["-average_rating", "review_count"]  # по умолчанию
 
+    # ?fields= / ?expand= (booking_app/serializers/fieldsets.py)
+    fieldset_actions = ("list", "retrieve", "my_listings")
+
+    # максимум SQL-запросов на action (booking_app/query_budget.py)
+    query_budget = {
+        "list": 2,
+        "retrieve": 2,
+        "create": 2,
+        "update": 3,  # + проверка уникальности адреса
+        "partial_update": 3,
+        "destroy": 8,
+        "toggle_active": 4,  # pending-брони отклоняет задача (services/jobs.py)
+        "my_listings": 1,
+        "my_stats": 1,
+        "reviews": 3,
+        "calendar": 2,
+    }
+
     def get_queryset(self):
         """
         For list/search: only active listings for everyone.
@@ -54,26 +90,115 @@ class ListingViewSet(viewsets.ModelViewSet):
         - guests/non-owners: only active
         - owner: active + his own listings (even inactive)
         """
-        base_qs = Listing.objects.filter(is_active=True)
+        qs = Listing.objects.all()
+        if self.action != "list":
+            # ListingDetailSerializer.owner и IsOwnerOrReadOnly читают owner
+            qs = qs.select_related("owner")
+        base_qs = qs.filter(is_active=True)
 
         user = self.request.user
         if (
-                self.action in ['retrieve', 'update', 'partial_update', 'destroy', 'toggle_active']
+                self.action in ['retrieve', 'update', 'partial_update', 'destroy', 'toggle_active', 'calendar']
                 and user.is_authenticated
                 and getattr(user, "role", None) == Role.OWNER
         ):
-            return Listing.objects.filter(
+            return qs.filter(
                 Q(is_active=True) | Q(owner=user)
-            ).annotate(
-                # Результат всегда FloatField. Если null — замени на 0.0
-                average_rating=Coalesce(Avg("reviews__rating"), 0.0, output_field=models.FloatField()),
-                review_count=Count("reviews"),
             ).order_by("-created_at")
 
-        return base_qs.annotate(
-            average_rating=Coalesce(Avg("reviews__rating"),0.0, output_field=models.FloatField()),
-            review_count=Count("reviews"),
-        ).order_by("-created_at")
+        # average_rating / review_count — хранимые поля Listing, без GROUP BY по отзывам
+        return base_qs.order_by("-created_at")
+
+    def list(self, request, *args, **kwargs):
+        """
+        Anonymous searches are served from the versioned response cache
+        (booking_app/services/listing_cache.py).
+        """
+        key = search_cache_key(request, self)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        data = get_cached_search(key)
+        if data is not None:
+            return response.Response(data)
+
+        # страница попадёт в кэш под текущей версией — читаем с primary, не с отстающей реплики
+        with use_primary():
+            result = super().list(request, *args, **kwargs)
+        if result.status_code == status.HTTP_200_OK:
+            cache_search(key, result.data)
+        return result
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Conditional GET: ETag/Last-Modified from a validator query
+        (updated_at also moves with the rating aggregates), 304 before
+        the listing itself is loaded.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        validators = get_object_or_404(
+            self.detail_validators(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        not_modified = self.check_detail_conditional(request, self.kwargs[lookup_url_kwarg], validators)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+    # поля validator-запроса детальной страницы (retrieve, async retrieve)
+    DETAIL_VALIDATORS = ("updated_at", "owner__email")
+
+    @staticmethod
+    def expand_validators(name):
+        """
+        Extra validator columns for ?expand=<name>: the embedded data changes
+        without touching listing.updated_at.
+        """
+        if name == "owner":
+            return {"owner_first_name": F("owner__first_name"), "owner_last_name": F("owner__last_name")}
+        if name == "reviews":
+            # как REVIEWS_VALIDATORS: последний updated_at + число отзывов; смена имени автора ETag не меняет
+            reviews = Review.objects.filter(listing=OuterRef("pk")).order_by().values("listing")
+            return {
+                "reviews_last_updated": Subquery(reviews.annotate(last=Max("updated_at")).values("last")),
+                "reviews_total": Subquery(reviews.annotate(total=Count("pk")).values("total")),
+            }
+        return {}
+
+    def detail_validators(self, queryset):
+        """
+        The validator query of the detail page (values() of one row per listing).
+        """
+        fieldset = self.get_fieldset()
+        extra = {}
+        for name in fieldset.expand if fieldset else ():
+            extra.update(self.expand_validators(name))
+        return queryset.values(*self.DETAIL_VALIDATORS, **extra)
+
+    def check_detail_conditional(self, request, pk, validators):
+        expanded = [validators[name] for name in sorted(validators) if name not in self.DETAIL_VALIDATORS]
+        last_modified = max(filter(None, (validators["updated_at"], validators.get("reviews_last_updated"))))
+        if "owner_first_name" in validators:
+            last_modified = None  # у имён владельца нет даты изменения: только ETag
+        return self.check_conditional(
+            request, pk, validators["updated_at"].isoformat(), validators["owner__email"], *expanded,
+            last_modified=last_modified,
+        )
+
+    @staticmethod
+    def reviews_queryset(listing):
+        return Review.objects.filter(listing=listing)
+
+    # conditional GET ленты отзывов: последний updated_at + число отзывов (ловит удаления),
+    # listing.updated_at — listing_title; смена имени автора ETag не меняет
+    REVIEWS_VALIDATORS = {"last_updated": Max("updated_at"), "total": Count("pk")}
+
+    def check_reviews_conditional(self, request, listing, stats):
+        last_modified = max(filter(None, (listing.updated_at, stats["last_updated"])))
+        return self.check_conditional(
+            request, listing.pk, listing.updated_at.isoformat(), stats["last_updated"], stats["total"],
+            last_modified=last_modified,
+        )
 
     def get_permissions(self):
         """
@@ -107,39 +232,34 @@ class ListingViewSet(viewsets.ModelViewSet):
         """
         Switch listing availability on or off by toggling the is_active flag.
 
-        When deactivating a listing, automatically reject all pending future
-        bookings for this listing, but keep confirmed bookings unchanged.
+        When deactivating a listing, the pending future bookings are rejected
+        by a background job (booking_app/services/jobs.py), created in the same
+        transaction; confirmed bookings stay unchanged.
         """
         # Получаем конкретное объявление по pk из URL
         listing = self.get_object()
 
         # можно явно перепроверить
-        if listing.owner != request.user:
+        if listing.owner_id != request.user.pk:
             return response.Response(
                 {"detail": "Only listing owner can change availability."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Переключаем статус доступности (true → false или false → true)
-        listing.is_active = not listing.is_active
-        # Сохраняем только изменённое поле (эффективно)
-        listing.save(update_fields=["is_active"])
-
-        # автоотклоненные брони
-        auto_rejected = 0
+        job = None
+        with transaction.atomic():
+            # Переключаем статус доступности (true → false или false → true)
+            listing.is_active = not listing.is_active
+            # Сохраняем только изменённое поле (эффективно)
+            listing.save(update_fields=["is_active"])
 
-        # Если объявление выключили — обработать pending-брони
-        if not listing.is_active:
-            today = timezone.now().date()
+            # Если объявление выключили — pending-брони отклонит воркер, ответ не ждёт
+            if not listing.is_active:
+                job = enqueue(REJECT_PENDING_BOOKINGS, listing_id=listing.pk, changed_by_id=request.user.pk)
 
-            pending_qs = Booking.objects.filter(
-                listing=listing,
-                status=BookingStatus.PENDING,
-                check_in__gt=today,  # только будущие заезды
-            )
-            auto_rejected = pending_qs.update(status=BookingStatus.REJECTED)
+        if job is not None:
             message = (
-                "Listing deactivated. All pending future bookings were rejected. "
+                "Listing deactivated. All pending future bookings will be rejected shortly. "
                 "Confirmed future bookings must be cancelled manually by the owner "
                 "or honoured."
             )
@@ -150,7 +270,7 @@ class ListingViewSet(viewsets.ModelViewSet):
             {
                 "id": listing.id,
                 "is_active": listing.is_active,
-                "auto_rejected_bookings": auto_rejected,    # кол-во
+                "rejection_job": job.pk if job is not None else None,  # id задачи отклонения броней
                 "detail": message,
             },
             status=status.HTTP_200_OK,
@@ -169,15 +289,67 @@ class ListingViewSet(viewsets.ModelViewSet):
         """
         Return all listings owned by the current user (active and inactive).
         """
-        qs = Listing.objects.filter(owner=request.user).annotate(
-            # Coalesce (null -> 0)
-            average_rating=Coalesce(Avg("reviews__rating"), 0.0, output_field=models.FloatField()),
-            review_count=Count("reviews"),
-        ).order_by("-created_at")
+        qs = Listing.objects.filter(owner=request.user).select_related("owner").order_by("-created_at")
+        qs = self.apply_fieldset(qs)
 
         serializer = self.get_serializer(qs, many=True)
         return response.Response(serializer.data, status=status.HTTP_200_OK)
 
+    # GET /api/v1/listings/my/stats/?from=2025-01&to=2025-12
+    @decorators.action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.IsAuthenticated, IsOwnerUser],
+        url_path="my/stats",
+    )
+    def my_stats(self, request):
+        """
+        Owner dashboard per listing and month: occupancy, confirmed revenue,
+        cancellation rate, average rating. Read from the ListingMonthlyStats
+        rollup only. Default: the last 12 months, at most 60 months.
+        """
+        def parse_month(name):
+            raw = request.query_params.get(name)
+            if not raw:
+                return None
+            # parse_date: None для неверного формата, ValueError для несуществующей даты
+            month = parse_date(f"{raw}-01")
+            if month is None:
+                raise ValueError(raw)
+            return month
+
+        try:
+            month_to = parse_month("to") or month_start(timezone.localdate())
+            month_from = parse_month("from")
+        except ValueError:
+            return response.Response(
+                {"detail": "Months must be in YYYY-MM format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if month_from is None:
+            month_from = month_to
+            for _ in range(STATS_DEFAULT_MONTHS - 1):
+                month_from = month_start(month_from - timedelta(days=1))
+
+        months = (month_to.year - month_from.year) * 12 + month_to.month - month_from.month + 1
+        if months < 1:
+            return response.Response(
+                {"detail": "'to' must not be before 'from'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if months > STATS_MAX_MONTHS:
+            return response.Response(
+                {"detail": f"Stats range is limited to {STATS_MAX_MONTHS} months."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        data = owner_monthly_stats(request.user, month_from, month_to)
+        return response.Response({
+            "from": month_from.strftime("%Y-%m"),
+            "to": month_to.strftime("%Y-%m"),
+            "listings": ListingStatsSerializer(data, many=True).data,
+        })
+
 
     @decorators.action(
         detail=True,  # true = /listings/{pk}/reviews/
@@ -190,11 +362,59 @@ class ListingViewSet(viewsets.ModelViewSet):
         Only for authenticated users.
         Return all reviews for this listing(id).
         Only for active listings (or owner's own inactive listings).
+        Supports conditional GET (ETag / Last-Modified, 304 Not Modified).
         """
         listing = self.get_object()  # Получаем listing (применяется логика get_queryset) с проверкой прав/активности
+
+        stats = self.reviews_queryset(listing).aggregate(**self.REVIEWS_VALIDATORS)
+        not_modified = self.check_reviews_conditional(request, listing, stats)
+        if not_modified is not None:
+            return not_modified
+
         # авторизованные увидят активные + свои неактивные
-        qs = Review.objects.filter(listing=listing) \
-            .select_related('author') \
+        qs = self.reviews_queryset(listing) \
+            .select_related('listing', 'author') \
             .order_by("-created_at")
-        serializer = ReviewListSerializer(qs, many=True)
-        return response.Response(serializer.data)
\ No newline at end of file
+        return self.list_response(qs, ReviewListSerializer, paginate=False)
+
+    # GET /api/v1/listings/{id}/calendar/?from=2025-07-01&to=2025-09-01
+    @decorators.action(
+        detail=True,
+        methods=["get"],
+        url_path="calendar",
+    )
+    def calendar(self, request, pk=None):
+        """
+        Availability calendar of a listing: booked/free nights in [from, to)
+        as run-length encoded runs, e.g. [["free", 12], ["booked", 4], ...].
+        Default range: 90 nights from today, maximum 366 nights.
+        """
+        listing = self.get_object()
+
+        raw_from = request.query_params.get("from")
+        raw_to = request.query_params.get("to")
+        try:
+            date_from = parse_date(raw_from) if raw_from else timezone.now().date()
+            date_to = parse_date(raw_to) if raw_to else None
+            if date_from is not None and not raw_to:
+                date_to = default_range(date_from)[1]
+        except ValueError:
+            date_from = date_to = None
+
+        if date_from is None or date_to is None:
+            return response.Response(
+                {"detail": "Dates must be in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if date_to <= date_from:
+            return response.Response(
+                {"detail": "'to' must be after 'from'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (date_to - date_from).days > CALENDAR_MAX_NIGHTS:
+            return response.Response(
+                {"detail": f"Calendar range is limited to {CALENDAR_MAX_NIGHTS} nights."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return response.Response(get_listing_calendar(listing.id, date_from, date_to))
@@ -0,0 +1,25 @@
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound
+from rest_framework.views import APIView
+
+from booking_app.metrics import metrics_enabled, registry
+
+
+class MetricsView(APIView):
+    """
+    Request metrics of this worker process in Prometheus text format (staff only).
+    Scrape with a staff user's token: Authorization: Token <key>.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        if not metrics_enabled():
+            raise NotFound()
+        return HttpResponse(
+            registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
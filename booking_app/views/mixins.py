@@ -0,0 +1,170 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from booking_app.serializers.fieldsets import parse_fieldset
+from booking_app.serializers.values import values_plan
+
+
+class ValuesListMixin:
+    """
+    List endpoints rendered from values() rows when the serializer allows it
+    (booking_app/serializers/values.py): only the output columns are read and
+    no model instances are built. Same JSON as the serializer.
+
+    Switched off with FAST_LIST_SERIALIZATION = False.
+    """
+
+    def get_values_plan(self, serializer_class):
+        if not getattr(settings, "FAST_LIST_SERIALIZATION", True):
+            return None
+        return values_plan(serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset, serializer_class=None, paginate=True):
+        """
+        Serialize a list (paginated unless paginate=False) via the fast path if possible.
+        """
+        serializer_class = serializer_class or self.get_serializer_class()
+        plan = self.get_values_plan(serializer_class)
+        if plan is not None:
+            queryset = plan.values(queryset)
+
+        page = self.paginate_queryset(queryset) if paginate else None
+        rows = page if page is not None else queryset
+
+        if plan is not None:
+            data = plan.render(rows)
+        else:
+            data = serializer_class(rows, many=True, context=self.get_serializer_context()).data
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def alist_data(self, queryset, serializer_class=None, paginate=True):
+        """
+        list_response() for async views (booking_app/views/async_read.py):
+        rows are read with the async ORM, returns the response data.
+        """
+        serializer_class = serializer_class or self.get_serializer_class()
+        plan = self.get_values_plan(serializer_class)
+        if plan is not None:
+            queryset = plan.values(queryset)
+
+        page = None
+        if paginate and self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        rows = page if page is not None else [row async for row in queryset]
+
+        if plan is not None:
+            data = plan.render(rows)
+        else:
+            # связи уже в select_related — сериализатор запросов не делает
+            data = serializer_class(rows, many=True, context=self.get_serializer_context()).data
+
+        if page is not None:
+            return self.get_paginated_response(data).data
+        return data
+
+
+class FieldsetMixin:
+    """
+    ?fields= / ?expand= on the read actions listed in `fieldset_actions`
+    (booking_app/serializers/fieldsets.py): the serializer output is trimmed
+    or extended, the queryset loads only the needed columns and relations
+    (applied in filter_queryset(), i.e. to list pages and get_object()).
+    Actions that serialize their own queryset call apply_fieldset() on it.
+
+    Unknown names -> 400. The query budget grows by one per prefetched
+    expansion; list pages with ?fields= (no ?expand=) keep the values() path.
+    """
+
+    fieldset_actions = ("list", "retrieve")
+
+    def get_fieldset(self):
+        """
+        The Fieldset of this request, or None (no parameters / other action).
+        """
+        if "_fieldset" not in self.__dict__:
+            fieldset = None
+            if self.action in self.fieldset_actions and self.request.method in SAFE_METHODS:
+                fieldset = parse_fieldset(self.request.query_params, self.get_serializer_class())
+            self._fieldset = fieldset
+        return self._fieldset
+
+    def apply_fieldset(self, queryset):
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        return fieldset.plan(queryset, self.get_serializer_class())
+
+    def filter_queryset(self, queryset):
+        return self.apply_fieldset(super().filter_queryset(queryset))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
+
+    def get_query_budget(self):
+        budget = super().get_query_budget()
+        fieldset = self.get_fieldset()
+        if budget is not None and fieldset is not None:
+            budget += fieldset.extra_queries(self.get_serializer_class())
+        return budget
+
+    def get_values_plan(self, serializer_class):
+        fieldset = self.get_fieldset()
+        if fieldset is None or serializer_class is not self.get_serializer_class():
+            return super().get_values_plan(serializer_class)
+        if fieldset.expand or not getattr(settings, "FAST_LIST_SERIALIZATION", True):
+            return None  # вложенные объекты — через сериализатор
+        return values_plan(serializer_class, fieldset.fields)
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag / Last-Modified for read endpoints, from cheap validator
+    queries run before the full queryset:
+
+        not_modified = self.check_conditional(request, listing.updated_at, count,
+                                              last_modified=listing.updated_at)
+        if not_modified is not None:
+            return not_modified  # 304 / 412, no serializer built
+
+    The ETag hashes the validator values, the response format and the
+    ?fields=/?expand= selection; the headers are added to 200 and 304
+    responses of the same request.
+    """
+
+    def check_conditional(self, request, *parts, last_modified=None):
+        renderer = getattr(request, "accepted_renderer", None)
+        parts = (*parts, getattr(renderer, "format", ""))
+        fieldset = self.get_fieldset() if hasattr(self, "get_fieldset") else None
+        if fieldset is not None:
+            parts = (*parts, fieldset.cache_key)
+        key = "|".join(str(part) for part in parts)
+        etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self._conditional_validators = (etag, timestamp)
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return self.add_conditional_headers(response)
+
+    def add_conditional_headers(self, response):
+        validators = self.__dict__.pop("_conditional_validators", None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, timestamp = validators
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+        return response
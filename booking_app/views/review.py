@@ -1,16 +1,39 @@
-from rest_framework import viewsets, permissions, response
+from rest_framework import viewsets, permissions
 from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from django.shortcuts import get_object_or_404
 
+from booking_app.filters import FullTextSearchFilter
 from booking_app.models import Review, Listing
+from booking_app.pagination import HybridPagination
+from booking_app.query_budget import QueryBudgetMixin
+from booking_app.views.mixins import FieldsetMixin, ValuesListMixin
 from booking_app.serializers.review import ReviewCreateSerializer, ReviewListSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(FieldsetMixin, QueryBudgetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ Allow authenticated users to create reviews for listings
     they have stayed at. One review per listing per author. """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HybridPagination  # ?page=N или ?pagination=cursor (keyset)
+    filter_backends = [FullTextSearchFilter, OrderingFilter]
+    search_fields = ["comment"]
+    ordering_fields = ["created_at", "rating", "relevance"]
+    # ?fields= / ?expand=listing,author (booking_app/serializers/fieldsets.py)
+    fieldset_actions = ("list", "retrieve", "my", "owner")
+
+    # максимум SQL-запросов на action (booking_app/query_budget.py)
+    query_budget = {
+        "list": 2,
+        "retrieve": 1,
+        "create": 8,  # + статистика хозяина (services/owner_stats.py)
+        "update": 8,
+        "partial_update": 8,
+        "destroy": 6,
+        "my": 1,
+        "owner": 1,
+    }
 
     def get_serializer_class(self):
         """Use list serializer for read, create serializer for write."""
@@ -39,9 +62,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """
         GET /api/v1/reviews/my/ - reviews written by current user.
         """
-        qs = Review.objects.filter(author=request.user).select_related("listing").order_by("-created_at")
-        serializer = self.get_serializer(qs, many=True)
-        return response.Response(serializer.data)
+        qs = Review.objects.filter(author=request.user).select_related("listing", "author").order_by("-created_at")
+        return self.list_response(self.apply_fieldset(qs), paginate=False)
 
     @action(detail=False, methods=["get"])
     def owner(self, request):
@@ -51,8 +73,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         qs = Review.objects.filter(
             listing__owner=request.user
         ).select_related("listing", "author").order_by("-created_at")
-        serializer = self.get_serializer(qs, many=True)
-        return response.Response(serializer.data)
+        return self.list_response(self.apply_fieldset(qs), paginate=False)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -68,10 +89,10 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         """Allow only the author to edit their review."""
-        instance = self.get_object()
+        instance = serializer.instance  # уже загружен в update()
         user = self.request.user
 
-        if instance.author != user:
+        if instance.author_id != user.pk:
             raise ValidationError("Only the author can modify this review.")
 
         serializer.save()
@@ -80,7 +101,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """Allow deleting only by author or admin."""
         user = self.request.user
 
-        if instance.author != user and not user.is_staff:
+        if instance.author_id != user.pk and not user.is_staff:
             raise ValidationError("Only the author or an admin can delete this review.")
 
         instance.delete()
@@ -3,16 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 
+from booking_app.query_budget import QueryBudgetMixin
 from booking_app.serializers.user import UserSerializer
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     """User profile management (current user only)."""
 
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # me: GET без запросов, PATCH — 1 UPDATE, DELETE — каскад по связанным таблицам
+    query_budget = {"me": 16}
 
     def get_object(self):
         """Return current authenticated user."""
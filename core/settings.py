@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import sys
 from pathlib import Path
 from environ import Env
 
@@ -49,6 +50,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # первым: время запроса включает остальные middleware (METRICS_ENABLED)
+    'booking_app.middleware.MetricsMiddleware',
+    # чтение с реплики для GET/HEAD/OPTIONS (без DATABASE_REPLICAS не подключается)
+    'booking_app.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,15 +87,30 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# MySQL connection pool (booking_app/db/backends/mysql_pooled): every request
+# checks a connection out and gives it back, limits are per worker process.
+# MYSQL_POOL=False: stock backend with persistent connections (MYSQL_CONN_MAX_AGE).
 if env.bool('MYSQL', default=False):
+    MYSQL_POOL = env.bool('MYSQL_POOL', default=True)
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.mysql',   # mysql
+            'ENGINE': 'booking_app.db.backends.mysql_pooled',   # mysql + пул соединений
             'NAME': env.str('MYSQL_DATABASE'),
             'USER': env.str('MYSQL_USER'),
             'PASSWORD': env.str('MYSQL_PASSWORD'),
             'HOST': env.str('MYSQL_HOST'),
             'PORT': env.int('MYSQL_PORT'),
+            # с пулом соединение возвращается в пул в конце запроса
+            'CONN_MAX_AGE': 0 if MYSQL_POOL else env.int('MYSQL_CONN_MAX_AGE', default=60),
+            'CONN_HEALTH_CHECKS': True,
+            'POOL': {
+                'MIN_SIZE': env.int('MYSQL_POOL_MIN_SIZE', default=2),
+                'MAX_SIZE': env.int('MYSQL_POOL_MAX_SIZE', default=10),
+                'TIMEOUT': env.float('MYSQL_POOL_TIMEOUT', default=5.0),
+                'MAX_IDLE': env.float('MYSQL_POOL_MAX_IDLE', default=300.0),
+                'MAX_LIFETIME': env.float('MYSQL_POOL_MAX_LIFETIME', default=3600.0),
+                'CHECK_AFTER': env.float('MYSQL_POOL_CHECK_AFTER', default=1.0),
+            } if MYSQL_POOL else None,
         },
     }
 else:
@@ -98,9 +118,36 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3', # sqlite3
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # write lock at BEGIN: booking overlap check + insert run serialized
+                # (SQLite ignores SELECT ... FOR UPDATE)
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+            # тестовая БД — файл, не память: потоки test_booking_concurrency
+            # пишут через свои соединения
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         },
     }
 
+# Read replicas (booking_app/db/replicas.py): GET/HEAD/OPTIONS API reads go to a
+# replica; clients that wrote stay on the primary for DATABASE_PIN_SECONDS.
+# MySQL: same credentials, one alias per host. SQLite: a copy of db.sqlite3,
+# refreshed by `manage.py sync_sqlite_replica` (simulated replication lag).
+if env.bool('MYSQL', default=False):
+    for index, host in enumerate(env.list('MYSQL_REPLICA_HOSTS', default=[]), start=1):
+        DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+elif env.bool('SQLITE_REPLICA', default=False):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['booking_app.db.replicas.PrimaryReplicaRouter'] if DATABASE_REPLICAS else []
+DATABASE_PIN_SECONDS = env.int('DATABASE_PIN_SECONDS', default=5)
+
 
 # Authentication Users
 AUTH_USER_MODEL = "booking_app.User"
@@ -148,7 +195,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        # TokenAuthentication + кэш token -> user (см. AUTH_TOKEN_CACHE)
+        "booking_app.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -159,6 +207,40 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Token auth cache: in-process LRU (MAX_SIZE entries, TTL seconds),
+# optionally backed by a shared cache alias from CACHES (e.g. Redis/Memcached)
+AUTH_TOKEN_CACHE = {
+    "MAX_SIZE": env.int('AUTH_TOKEN_CACHE_MAX_SIZE', default=10000),
+    "TTL": env.int('AUTH_TOKEN_CACHE_TTL', default=60),
+    "SHARED_CACHE": env.str('AUTH_TOKEN_SHARED_CACHE', default=''),
+    "SHARED_TTL": env.int('AUTH_TOKEN_SHARED_CACHE_TTL', default=300),
+}
+
+# Per-action SQL query budgets (ViewSet.query_budget): exceeding one raises
+# QueryBudgetExceeded in debug/test runs (reads only; writes are already
+# committed, so they are logged), otherwise it is logged with the SQL
+TESTING = sys.argv[1:2] == ['test']
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=DEBUG or TESTING)
+
+# List endpoints rendered from values() rows instead of serializer instances
+# (booking_app/serializers/values.py), same JSON output
+FAST_LIST_SERIALIZATION = env.bool('FAST_LIST_SERIALIZATION', default=True)
+
+# Response cache of anonymous GET /listings/ (seconds, 0 = off); invalidated by
+# a global version bumped on every Listing/Review write
+LISTING_SEARCH_CACHE_TIMEOUT = env.int('LISTING_SEARCH_CACHE_TIMEOUT', default=60)
+
+# Background jobs in the database (booking_app/services/jobs.py), run by
+# `manage.py run_worker`; JOBS_EAGER runs them in the request after commit
+JOBS_EAGER = env.bool('JOBS_EAGER', default=TESTING)
+JOBS_MAX_ATTEMPTS = env.int('JOBS_MAX_ATTEMPTS', default=5)
+JOBS_RETRY_BACKOFF = env.int('JOBS_RETRY_BACKOFF', default=10)  # секунды, удваивается с каждой попыткой
+JOBS_RETRY_BACKOFF_MAX = env.int('JOBS_RETRY_BACKOFF_MAX', default=3600)
+JOBS_LOCK_TIMEOUT = env.int('JOBS_LOCK_TIMEOUT', default=600)  # задача зависшего воркера берётся снова
+
+# Per-endpoint request metrics (histograms) at /api/v1/_metrics, staff only
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=False)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Booking API',
     'DESCRIPTION': 'Airbnb-like booking app',